@@ -0,0 +1,342 @@
+"""
+Batched risk assessment for bulk request intake.
+
+Quarter-end imports arrive as hundreds of requests at once. Instead of
+one graph run (and one LLM round-trip) per request, assess_risk_batch:
+
+  1. checks every request with the input guardrails
+     (validate_requests_batch) and leaves failing ones unassessed, as
+     the per-request graph does,
+  2. classifies every unambiguous request with the rule tier,
+  3. packs the remaining requests into a few multi-item prompts that
+     ask for a JSON array of {"id", "risk_level", "reasoning"},
+  4. sends those prompts with llm.batch / llm.abatch under a
+     concurrency limit, and
+  5. retries any item the model dropped or garbled with the single-item
+     prompt before defaulting to "medium".
+
+seed_threads() then writes each result into its thread's ApprovalState
+so the graph resumes right after risk assessment. A row that fails the
+guardrails is recorded as rejected at the graph's rejection node instead,
+so it never reaches review or processing.
+
+This file is GIVEN — students do not modify it.
+"""
+
+import json
+import re
+from typing import Optional
+
+from langchain_core.messages import HumanMessage
+from backend.config import (
+    get_llm,
+    BUDGET_CEILING,
+    HIGH_RISK_THRESHOLD,
+    MEDIUM_RISK_THRESHOLD,
+)
+from backend.guardrails.batch_validation import validate_requests_batch
+from backend.models import FinancialRequest
+from backend.records import RequestRecord
+from backend.agent.risk_engine import (
+    RISK_LEVELS,
+    build_risk_prompt,
+    parse_risk_response,
+    pre_classify,
+)
+
+BATCH_CHUNK_SIZE = 25
+BATCH_MAX_CONCURRENCY = 4
+
+# Rejection node for each post-risk resume node.
+REJECT_NODES = {"assess_risk": "handle_rejection", "demo_assess": "demo_reject"}
+
+BATCH_RISK_PROMPT = """You are a financial risk analyst. Assess the risk of each
+request below as low, medium, high, or critical.
+
+Guidelines: amounts up to ${medium:,} are usually low risk, up to ${high:,}
+medium, above that high; urgent requests above ${high:,} or anything above
+${ceiling:,} are critical. Adjust for unusual or suspicious content.
+
+Requests (JSON):
+{items}
+
+Return ONLY a JSON array with one object per request, in any order:
+[{{"id": <id>, "risk_level": "<low|medium|high|critical>", "reasoning": "<one sentence>"}}]
+"""
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+
+def _as_state(request) -> dict:
+    """Accept a RequestRecord, a FinancialRequest or a plain dict of request fields."""
+    if isinstance(request, RequestRecord):
+        return request.to_dict()
+    if isinstance(request, FinancialRequest):
+        return request.model_dump()
+    return dict(request)
+
+
+def build_batch_prompt(items: list[tuple[int, dict]]) -> str:
+    """Format BATCH_RISK_PROMPT for (id, state) pairs."""
+    payload = [
+        {
+            "id": idx,
+            "title": state.get("title", ""),
+            "description": state.get("description", ""),
+            "amount": state.get("amount", 0),
+            "department": state.get("department", ""),
+            "priority": state.get("priority", "normal"),
+            "justification": state.get("justification", ""),
+        }
+        for idx, state in items
+    ]
+    return BATCH_RISK_PROMPT.format(
+        items=json.dumps(payload, indent=1),
+        medium=MEDIUM_RISK_THRESHOLD,
+        high=HIGH_RISK_THRESHOLD,
+        ceiling=int(BUDGET_CEILING),
+    )
+
+
+def parse_batch_response(text: str, expected_ids: set[int]) -> dict[int, tuple[str, str]]:
+    """
+    Parse a multi-item reply into {id: (risk_level, reasoning)}.
+
+    Tolerates markdown fences, prose around the array, and malformed
+    entries; anything unusable is simply left out so the caller can retry.
+    """
+    text = _FENCE_RE.sub("", text.strip())
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        entries = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            idx = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        level = str(entry.get("risk_level", "")).strip().lower()
+        if idx in expected_ids and level in RISK_LEVELS:
+            parsed[idx] = (level, str(entry.get("reasoning", "")).strip())
+    return parsed
+
+
+def _chunks(items: list, size: int) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), max(size, 1))]
+
+
+def validate_batch(requests: list) -> tuple[list[bool], list[str]]:
+    """Input guardrails for many requests: (valid per row, validation message per row)."""
+    states = [_as_state(r) for r in requests]
+    if not states:
+        return [], []
+
+    def column(field: str) -> list:
+        return [str(state.get(field) or "") for state in states]
+
+    amounts = []
+    for state in states:
+        try:
+            amounts.append(float(state.get("amount")))
+        except (TypeError, ValueError):
+            amounts.append(float("nan"))  # fails "Amount must be positive"
+    valid, messages = validate_requests_batch(
+        amounts, column("department"), column("title"), column("description"), column("justification"),
+    )
+    return valid.tolist(), messages
+
+
+def rejected_result(message: str) -> dict:
+    """Result for a row that failed the input guardrails and was never assessed."""
+    return {
+        "risk_level": None,
+        "risk_reasoning": f"Not assessed: {message}",
+        "risk_tier": "rejected",
+        "validation_message": message,
+    }
+
+
+def _plan(states: list[dict]) -> tuple[list[Optional[dict]], list[tuple[int, dict]]]:
+    """
+    Guardrail and rule-tier pass: results for rejected and decided rows,
+    (index, state) for the rest.
+
+    Rows failing the input guardrails never reach an LLM prompt, where
+    injected text could steer the levels given to the rest of the chunk.
+    """
+    valid, messages = validate_batch(states)
+    results: list[Optional[dict]] = []
+    pending = []
+    for idx, state in enumerate(states):
+        if not valid[idx]:
+            results.append(rejected_result(messages[idx]))
+            continue
+        decided = pre_classify(state)
+        results.append(decided)
+        if decided is None:
+            pending.append((idx, state))
+    return results, pending
+
+
+def _collect(results, replies, chunks) -> list[tuple[int, dict]]:
+    """Merge chunk replies into results; return the items still missing."""
+    missing = []
+    for chunk, reply in zip(chunks, replies):
+        ids = {idx for idx, _ in chunk}
+        parsed = {} if isinstance(reply, Exception) else parse_batch_response(reply.content, ids)
+        for idx, state in chunk:
+            if idx in parsed:
+                level, reasoning = parsed[idx]
+                results[idx] = {"risk_level": level, "risk_reasoning": reasoning, "risk_tier": "llm_batch"}
+            else:
+                missing.append((idx, state))
+    return missing
+
+
+def _finish(results, missing, replies) -> list[dict]:
+    """Apply single-item retry replies and default anything still unresolved."""
+    for (idx, _state), reply in zip(missing, replies):
+        if isinstance(reply, Exception):
+            results[idx] = {
+                "risk_level": "medium",
+                "risk_reasoning": f"Batch assessment failed ({type(reply).__name__}); defaulting to medium.",
+                "risk_tier": "llm_batch",
+            }
+        else:
+            level, reasoning = parse_risk_response(reply.content)
+            results[idx] = {"risk_level": level, "risk_reasoning": reasoning, "risk_tier": "llm"}
+    return results
+
+
+def assess_risk_batch(
+    requests: list,
+    llm=None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+) -> list[dict]:
+    """
+    Assess many requests with a handful of LLM calls.
+
+    Args:
+        requests: list[RequestRecord], list[FinancialRequest] or dicts
+                  with the same fields
+        llm: LangChain chat model; defaults to get_llm()
+        chunk_size: requests packed into each LLM prompt
+        max_concurrency: simultaneous LLM calls
+
+    Returns:
+        list[dict] aligned with ``requests``, each with risk_level,
+        risk_reasoning and risk_tier ("rules", "llm_batch" or "llm");
+        rows failing the input guardrails get rejected_result() (tier
+        "rejected", risk_level None) and are never sent to the LLM
+    """
+    states = [_as_state(r) for r in requests]
+    results, pending = _plan(states)
+    if not pending:
+        return results
+
+    llm = llm or get_llm()
+    config = {"max_concurrency": max_concurrency}
+    chunks = _chunks(pending, chunk_size)
+    replies = llm.batch(
+        [[HumanMessage(content=build_batch_prompt(chunk))] for chunk in chunks],
+        config=config,
+        return_exceptions=True,
+    )
+    missing = _collect(results, replies, chunks)
+    retries = llm.batch(
+        [[HumanMessage(content=build_risk_prompt(state))] for _, state in missing],
+        config=config,
+        return_exceptions=True,
+    ) if missing else []
+    return _finish(results, missing, retries)
+
+
+async def aassess_risk_batch(
+    requests: list,
+    llm=None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+) -> list[dict]:
+    """Async counterpart of assess_risk_batch using llm.abatch."""
+    states = [_as_state(r) for r in requests]
+    results, pending = _plan(states)
+    if not pending:
+        return results
+
+    llm = llm or get_llm()
+    config = {"max_concurrency": max_concurrency}
+    chunks = _chunks(pending, chunk_size)
+    replies = await llm.abatch(
+        [[HumanMessage(content=build_batch_prompt(chunk))] for chunk in chunks],
+        config=config,
+        return_exceptions=True,
+    )
+    missing = _collect(results, replies, chunks)
+    retries = await llm.abatch(
+        [[HumanMessage(content=build_risk_prompt(state))] for _, state in missing],
+        config=config,
+        return_exceptions=True,
+    ) if missing else []
+    return _finish(results, missing, retries)
+
+
+def seed_threads(
+    graph,
+    requests: list,
+    results: list[dict],
+    as_node: str = "assess_risk",
+    reject_node: Optional[str] = None,
+) -> list[dict]:
+    """
+    Write batch results into each request's thread (thread_id = request_id).
+
+    Valid requests are recorded as if ``as_node`` had just run, so
+    graph.invoke(None, config) continues with the post-risk routing.
+    Requests failing the input guardrails are recorded as rejected at
+    ``reject_node`` (default: REJECT_NODES[as_node]), with the guardrail
+    message in validation_message; their threads are already finished.
+    Pass as_node="demo_assess" for the demo graph.
+
+    Returns:
+        list of the config dicts, one per thread, for resuming
+    """
+    reject_node = reject_node or REJECT_NODES.get(as_node, "handle_rejection")
+    valid, messages = validate_batch(requests)
+    configs = []
+    for request, result, ok, message in zip(requests, results, valid, messages):
+        state = _as_state(request)
+        config = {"configurable": {"thread_id": state["request_id"]}}
+        if not ok:
+            values = {
+                **state,
+                "is_valid": False,
+                "validation_message": message,
+                "status": "rejected",
+                "current_stage": "complete",
+                "decisions": [],
+            }
+            graph.update_state(config, values, as_node=reject_node)
+            configs.append(config)
+            continue
+        values = {
+            **state,
+            "is_valid": True,
+            "validation_message": message,
+            "status": "pending",
+            "current_stage": "risk_assessed",
+            "risk_level": result["risk_level"],
+            "risk_reasoning": result["risk_reasoning"],
+            "risk_tier": result.get("risk_tier", "llm_batch"),
+            "decisions": [],
+        }
+        graph.update_state(config, values, as_node=as_node)
+        configs.append(config)
+    return configs
@@ -3,22 +3,302 @@ Checkpointer factory for the Financial Approval workflow.
 
 Provides SQLite-based persistence so that interrupted workflows
 can be resumed after human review decisions.
+
+Both factories tune SQLite for many concurrent approval threads:
+WAL journaling (readers never block the writer), relaxed fsync
+(synchronous=NORMAL is durable in WAL mode), a larger page cache and
+memory-mapped reads. The sync saver additionally spreads reads over a
+small pool of connections while all writes go through one writer.
+
+With ``delta=True`` (CHECKPOINT_DELTA) the factories return savers that
+store each checkpoint as a delta against its parent, with a full
+snapshot every CHECKPOINT_SNAPSHOT_EVERY checkpoints (see
+delta_checkpoint.py).
 """
 
+import json
+import queue
 import sqlite3
+from contextlib import closing, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+import aiosqlite
+from langgraph.checkpoint.base import CheckpointTuple
 from langgraph.checkpoint.sqlite import SqliteSaver
-from backend.config import CHECKPOINT_DB
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.checkpoint.sqlite.utils import load_pending_writes, pending_writes_sql, search_where
+from backend.agent.delta_checkpoint import (
+    DELTA_KEY,
+    ValueCache,
+    checkpoint_key,
+    delta_fields,
+    encode_checkpoint,
+    is_delta,
+    resolve_checkpoint,
+)
+from backend.config import (
+    CHECKPOINT_DB,
+    CHECKPOINT_READERS,
+    CHECKPOINT_READER_TIMEOUT,
+    CHECKPOINT_DELTA,
+    CHECKPOINT_SNAPSHOT_EVERY,
+)
+
+# Applied to every checkpoint connection, in order.
+SQLITE_PRAGMAS = [
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", "-65536"),     # 64 MiB page cache (negative = KiB)
+    ("mmap_size", "268435456"),   # 256 MiB memory-mapped I/O
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", "5000"),     # ms to wait on a locked database
+]
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    for name, value in SQLITE_PRAGMAS:
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+class PooledSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver with one writer connection and a pool of reader connections.
+
+    Writes (put, put_writes, delete_thread) are serialized on ``self.conn``
+    by the base class lock, which acts as the single writer queue. Reads
+    (get_tuple, list) borrow a connection from the reader pool, so state
+    lookups for other threads proceed while a checkpoint is being written.
+    A read waits at most ``reader_timeout`` seconds for a free reader,
+    then raises TimeoutError.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        readers: list[sqlite3.Connection],
+        reader_timeout: float = CHECKPOINT_READER_TIMEOUT,
+        **kwargs,
+    ):
+        super().__init__(conn, **kwargs)
+        self.reader_timeout = reader_timeout
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for reader in readers:
+            self._readers.put(reader)
+        self._pooled = bool(readers)
 
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        if transaction or not self._pooled:
+            with super().cursor(transaction) as cur:
+                yield cur
+            return
 
-def create_checkpointer() -> SqliteSaver:
+        with self._reader() as reader, closing(reader.cursor()) as cur:
+            yield cur
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        if not self.is_setup:
+            with self.lock:
+                self.setup()
+        try:
+            reader = self._readers.get(timeout=self.reader_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No checkpoint reader free after {self.reader_timeout:g}s; "
+                "all connections are held (CHECKPOINT_READERS too small?)"
+            ) from None
+        try:
+            yield reader
+        finally:
+            self._readers.put(reader)
+
+    def list(self, config, *, filter=None, before=None, limit=None) -> Iterator[CheckpointTuple]:
+        # Rows are materialized before anything is yielded, so a caller
+        # that reads while iterating (get_tuple per item, a nested list)
+        # never waits for the connection or lock this generator holds.
+        if not self._pooled:
+            # The base class holds the writer lock while it iterates.
+            yield from list(super().list(config, filter=filter, before=before, limit=limit))
+            return
+
+        # The base class looks up each row's pending writes on a second
+        # cursor over self.conn, outside the writer lock. Pooled, both
+        # queries run on the same borrowed reader instead.
+        where, params = search_where(config, filter, before)
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata "
+            f"FROM checkpoints {where} ORDER BY checkpoint_id DESC"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (*params, limit)
+        with self._reader() as reader, closing(reader.cursor()) as cur, closing(reader.cursor()) as wcur:
+            rows = cur.execute(query, params).fetchall()
+            writes = []
+            for thread_id, checkpoint_ns, checkpoint_id, *_ in rows:
+                wcur.execute(pending_writes_sql(self._has_task_path), (thread_id, checkpoint_ns, checkpoint_id))
+                writes.append(load_pending_writes(wcur, self.serde))
+        for (thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, checkpoint, metadata), pending in zip(
+            rows, writes
+        ):
+            key = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}
+            yield CheckpointTuple(
+                {"configurable": {**key, "checkpoint_id": checkpoint_id}},
+                self.serde.loads_typed((type_, checkpoint)),
+                json.loads(metadata) if metadata is not None else {},
+                {"configurable": {**key, "checkpoint_id": parent_id}} if parent_id else None,
+                pending,
+            )
+
+    def close(self) -> None:
+        """Close the writer and every reader connection."""
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        self.conn.close()
+
+
+def _key_config(key: tuple) -> dict:
+    thread_id, checkpoint_ns, checkpoint_id = key
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+
+class DeltaSqliteSaver(PooledSqliteSaver):
+    """
+    PooledSqliteSaver that stores channel values as deltas against the parent.
+
+    Reads return fully reconstructed checkpoints, so the graph never sees
+    the encoding. The newest values of each thread stay in a ValueCache,
+    which makes the next put() a pure in-memory diff.
+    """
+
+    def __init__(self, conn, readers, snapshot_every: int = CHECKPOINT_SNAPSHOT_EVERY, **kwargs):
+        super().__init__(conn, readers, **kwargs)
+        self.snapshot_every = max(snapshot_every, 1)
+        self._values = ValueCache()
+
+    def _load(self, key: tuple) -> Optional[dict]:
+        raw = super().get_tuple(_key_config(key))
+        return raw.checkpoint if raw else None
+
+    def _resolve(self, raw: Optional[CheckpointTuple]) -> Optional[CheckpointTuple]:
+        if raw is None:
+            return None
+        checkpoint = resolve_checkpoint(raw.checkpoint, checkpoint_key(raw.config), self._load, self._values)
+        return raw._replace(checkpoint=checkpoint)
+
+    def get_tuple(self, config) -> Optional[CheckpointTuple]:
+        return self._resolve(super().get_tuple(config))
+
+    def list(self, config, **kwargs) -> Iterator[CheckpointTuple]:
+        for raw in super().list(config, **kwargs):
+            yield self._resolve(raw)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        parent_key = checkpoint_key(config)
+        parent = None
+        if parent_key[2] is not None:
+            parent = self._values.get(parent_key)
+            if parent is None and self.get_tuple(_key_config(parent_key)) is not None:
+                parent = self._values.get(parent_key)
+        stored, depth = encode_checkpoint(checkpoint, parent_key[2], parent, self.snapshot_every)
+        saved = super().put(config, stored, metadata, new_versions)
+        self._values.put(checkpoint_key(saved), delta_fields(checkpoint), depth)
+        return saved
+
+
+class AsyncDeltaSqliteSaver(AsyncSqliteSaver):
+    """Async counterpart of DeltaSqliteSaver for graphs run with ainvoke/astream."""
+
+    def __init__(self, conn, snapshot_every: int = CHECKPOINT_SNAPSHOT_EVERY, **kwargs):
+        super().__init__(conn, **kwargs)
+        self.snapshot_every = max(snapshot_every, 1)
+        self._values = ValueCache()
+
+    async def _aresolve(self, raw: Optional[CheckpointTuple]) -> Optional[CheckpointTuple]:
+        if raw is None:
+            return None
+        # Fetch the uncached part of the delta chain, then replay it in memory.
+        bases = {}
+        key, current = checkpoint_key(raw.config), raw.checkpoint
+        while is_delta(current) and self._values.get(key) is None:
+            key = (key[0], key[1], current["channel_values"][DELTA_KEY]["base"])
+            base = await super().aget_tuple(_key_config(key))
+            if base is None:
+                break
+            current = bases[key] = base.checkpoint
+        checkpoint = resolve_checkpoint(raw.checkpoint, checkpoint_key(raw.config), bases.get, self._values)
+        return raw._replace(checkpoint=checkpoint)
+
+    async def aget_tuple(self, config) -> Optional[CheckpointTuple]:
+        return await self._aresolve(await super().aget_tuple(config))
+
+    async def alist(self, config, **kwargs) -> AsyncIterator[CheckpointTuple]:
+        raws = [raw async for raw in super().alist(config, **kwargs)]
+        for raw in raws:
+            yield await self._aresolve(raw)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        parent_key = checkpoint_key(config)
+        parent = None
+        if parent_key[2] is not None:
+            parent = self._values.get(parent_key)
+            if parent is None and await self.aget_tuple(_key_config(parent_key)) is not None:
+                parent = self._values.get(parent_key)
+        stored, depth = encode_checkpoint(checkpoint, parent_key[2], parent, self.snapshot_every)
+        saved = await super().aput(config, stored, metadata, new_versions)
+        self._values.put(checkpoint_key(saved), delta_fields(checkpoint), depth)
+        return saved
+
+
+def create_checkpointer(
+    path: Optional[str] = None,
+    readers: int = CHECKPOINT_READERS,
+    delta: bool = CHECKPOINT_DELTA,
+) -> SqliteSaver:
     """
     Create a SQLite checkpointer for workflow persistence.
 
     The checkpointer stores graph state at each node transition,
     enabling the interrupt/resume pattern for human-in-the-loop.
 
+    Args:
+        path: database file (defaults to CHECKPOINT_DB)
+        readers: size of the reader connection pool (0 disables pooling;
+                 always disabled for ":memory:" databases)
+        delta: store checkpoints as deltas (DeltaSqliteSaver)
+
     Returns:
         SqliteSaver: Configured SQLite checkpointer instance
     """
-    conn = sqlite3.connect(CHECKPOINT_DB, check_same_thread=False)
-    return SqliteSaver(conn)
+    path = path or CHECKPOINT_DB
+    if path == ":memory:":
+        readers = 0
+    saver_cls = DeltaSqliteSaver if delta else PooledSqliteSaver
+    return saver_cls(_connect(path), [_connect(path) for _ in range(readers)])
+
+
+async def create_async_checkpointer(
+    path: Optional[str] = None,
+    delta: bool = CHECKPOINT_DELTA,
+) -> AsyncSqliteSaver:
+    """
+    Create an async SQLite checkpointer for graphs run with ainvoke/astream.
+
+    Must be awaited inside the running event loop (e.g. a FastAPI lifespan
+    handler) because the saver binds to that loop. aiosqlite runs every
+    statement on one dedicated thread, which serves as the writer queue.
+
+    Args:
+        path: database file (defaults to CHECKPOINT_DB)
+        delta: store checkpoints as deltas (AsyncDeltaSqliteSaver)
+
+    Returns:
+        AsyncSqliteSaver: Configured async SQLite checkpointer instance
+    """
+    conn = await aiosqlite.connect(path or CHECKPOINT_DB)
+    for name, value in SQLITE_PRAGMAS:
+        await conn.execute(f"PRAGMA {name}={value}")
+    return AsyncDeltaSqliteSaver(conn) if delta else AsyncSqliteSaver(conn)
@@ -18,6 +18,8 @@ from langchain_core.messages import AIMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import interrupt
 from backend.agent.state import ApprovalState
+from backend.agent.async_nodes import async_variant
+from backend.agent.metrics import instrument
 from backend.config import DEPARTMENT_BUDGETS, MEDIUM_RISK_THRESHOLD, HIGH_RISK_THRESHOLD
 
 
@@ -243,46 +245,61 @@ def demo_route_after_final(state: ApprovalState) -> str:
 # GRAPH ASSEMBLY
 # ============================================================
 
-def create_demo_graph(checkpointer=None):
-    """Build the demo graph with full escalation routing."""
+def create_demo_graph(checkpointer=None, async_mode=False):
+    """
+    Build the demo graph with full escalation routing.
+
+    With async_mode=True every node and router is registered as a
+    coroutine function (see backend.agent.async_nodes), for use with
+    ainvoke/astream and an async checkpointer. Every node and router is
+    instrumented for /metrics (see backend.agent.metrics).
+    """
+    wrap = async_variant if async_mode else (lambda fn: fn)
+
+    def node(fn):
+        return instrument(wrap(fn))
+
+    def route(fn):
+        return instrument(wrap(fn), kind="router")
+
     graph = StateGraph(ApprovalState)
 
     # Nodes
-    graph.add_node("demo_submit", demo_submit)
-    graph.add_node("demo_assess", demo_assess)
-    graph.add_node("demo_validate_budget", demo_validate_budget)
-    graph.add_node("demo_manager_review", demo_manager_review)
-    graph.add_node("demo_finance_review", demo_finance_review)
-    graph.add_node("demo_final_signoff", demo_final_signoff)
-    graph.add_node("demo_process", demo_process)
-    graph.add_node("demo_reject", demo_reject)
+    graph.add_node("demo_submit", node(demo_submit))
+    graph.add_node("demo_assess", node(demo_assess))
+    graph.add_node("demo_validate_budget", node(demo_validate_budget))
+    graph.add_node("demo_manager_review", node(demo_manager_review))
+    graph.add_node("demo_finance_review", node(demo_finance_review))
+    graph.add_node("demo_final_signoff", node(demo_final_signoff))
+    graph.add_node("demo_process", node(demo_process))
+    graph.add_node("demo_reject", node(demo_reject))
 
     # Entry
     graph.add_edge(START, "demo_submit")
     graph.add_edge("demo_submit", "demo_assess")
 
     # Conditional edges (escalation routing)
-    graph.add_conditional_edges("demo_assess", demo_route_after_risk, {
+    graph.add_conditional_edges("demo_assess", route(demo_route_after_risk), {
         "demo_validate_budget": "demo_validate_budget",
         "demo_manager_review": "demo_manager_review",
     })
-    graph.add_conditional_edges("demo_manager_review", demo_route_after_manager, {
+    graph.add_conditional_edges("demo_manager_review", route(demo_route_after_manager), {
         "demo_process": "demo_process",
         "demo_validate_budget": "demo_validate_budget",
         "demo_finance_review": "demo_finance_review",
         "demo_reject": "demo_reject",
     })
-    graph.add_conditional_edges("demo_validate_budget", demo_route_after_budget, {
+    graph.add_conditional_edges("demo_validate_budget", route(demo_route_after_budget), {
         "demo_process": "demo_process",
         "demo_manager_review": "demo_manager_review",
         "demo_finance_review": "demo_finance_review",
     })
-    graph.add_conditional_edges("demo_finance_review", demo_route_after_finance, {
+    graph.add_conditional_edges("demo_finance_review", route(demo_route_after_finance), {
         "demo_process": "demo_process",
         "demo_final_signoff": "demo_final_signoff",
         "demo_reject": "demo_reject",
     })
-    graph.add_conditional_edges("demo_final_signoff", demo_route_after_final, {
+    graph.add_conditional_edges("demo_final_signoff", route(demo_route_after_final), {
         "demo_process": "demo_process",
         "demo_reject": "demo_reject",
     })
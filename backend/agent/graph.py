@@ -10,6 +10,8 @@ Part 1: LangGraph Workflow + Interrupts (35 points)
 
 from langgraph.graph import StateGraph, START, END
 from backend.agent.state import ApprovalState
+from backend.agent.async_nodes import async_variants
+from backend.agent.metrics import instrument
 from backend.agent.nodes import (
     submit_request,
     assess_risk,
@@ -28,7 +30,41 @@ from backend.agent.nodes import (
 )
 
 
-def create_approval_graph(checkpointer=None):
+def approval_graph_functions(async_mode=False) -> tuple[dict, dict]:
+    """
+    Return ({node_name: node_fn}, {router_name: router_fn}) for the graph.
+
+    GIVEN helper. With async_mode=True every function is replaced by its
+    coroutine variant (see backend.agent.async_nodes). Every function is
+    instrumented for /metrics (see backend.agent.metrics).
+    """
+    node_fns = {
+        "submit_request": submit_request,
+        "assess_risk": assess_risk,
+        "manager_review": manager_review,
+        "validate_budget": validate_budget,
+        "finance_review": finance_review,
+        "final_signoff": final_signoff,
+        "process_request": process_request,
+        "handle_rejection": handle_rejection,
+    }
+    router_fns = {
+        "route_after_submission": route_after_submission,
+        "route_after_risk": route_after_risk,
+        "route_after_manager": route_after_manager,
+        "route_after_budget": route_after_budget,
+        "route_after_finance": route_after_finance,
+        "route_after_final": route_after_final,
+    }
+    if async_mode:
+        node_fns, router_fns = async_variants(node_fns), async_variants(router_fns)
+    return (
+        {name: instrument(fn) for name, fn in node_fns.items()},
+        {name: instrument(fn, kind="router") for name, fn in router_fns.items()},
+    )
+
+
+def create_approval_graph(checkpointer=None, async_mode=False):
     """
     Build and return the compiled Financial Approval StateGraph.
 
@@ -61,8 +97,12 @@ def create_approval_graph(checkpointer=None):
     Args:
         checkpointer: SqliteSaver checkpointer for persisting graph state
                       across interrupt/resume cycles (passed by server.py)
+        async_mode: register coroutine variants of every node and router
+                    (server.py uses this with an AsyncSqliteSaver)
 
     Hints:
+    - nodes, routers = approval_graph_functions(async_mode) gives you the
+      sync or async callables keyed by name — use them so async_mode works
     - Use graph.add_node("name", function) for each node
     - Use graph.add_edge(START, "submit_request") for the entry edge
     - Use graph.add_conditional_edges("source", router_fn, {"value": "target", ...})
@@ -65,6 +65,13 @@ def assess_risk(state: ApprovalState) -> dict:
     - The route_after_risk router will decide the next step based on risk_level
     - Low risk → budget validation (auto-approve path)
     - Medium/High/Critical → manager review
+    - Optional: backend.agent.risk_engine.assess_risk_tiered(state) classifies
+      unambiguous amounts by rule and only calls the LLM near thresholds
+    - Optional: backend.agent.risk_cache.assess_risk_cached(state) serves repeat
+      requests from a persistent cache; append its "decisions" entry to the audit trail
+    - Optional (async mode): define `async def aassess_risk(state)` in this module
+      using `await get_llm().ainvoke(...)`; otherwise create_approval_graph(async_mode=True)
+      runs this sync node in a worker thread
     """
     raise NotImplementedError("TODO: Implement assess_risk node (5 points)")
 
@@ -0,0 +1,355 @@
+"""
+Persistent cache for risk assessments.
+
+Recurring requests (monthly office supplies, SaaS renewals, ...) are
+assessed once and served from SQLite afterwards. Two lookup tiers:
+
+  exact — blake2b hash of a normalized fingerprint of
+          (title, description, justification, department, priority,
+          amount bucket, model)
+  near  — optional MinHash signature over word shingles of the text,
+          compared only against entries in the same (department,
+          priority, amount bucket, model) block
+
+Entries expire after a TTL and the table is trimmed to a maximum size by
+least-recent use. Recent exact hits are also kept in a small in-memory
+LRU so repeat lookups never touch SQLite. Every lookup produces an
+audit entry suitable for the ``decisions`` list in ApprovalState.
+
+This file is GIVEN — students may call it from assess_risk.
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from backend.config import (
+    LLM_PROVIDER,
+    OPENAI_MODEL,
+    GOOGLE_MODEL,
+    RISK_CACHE_DB,
+    RISK_CACHE_TTL,
+    RISK_CACHE_MAX_ENTRIES,
+    RISK_CACHE_NEAR_THRESHOLD,
+)
+from backend.agent.risk_engine import assess_risk_tiered, rule_risk_level
+
+MINHASH_PERMUTATIONS = 64
+SHINGLE_SIZE = 2
+HOT_ENTRIES = 1024
+
+# Geometric amount buckets (5% wide); combined with the rule level so a
+# bucket never straddles a risk threshold.
+_AMOUNT_BUCKET_RATIO = 1.05
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_MASK64 = (1 << 64) - 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS risk_cache (
+    key TEXT PRIMARY KEY,
+    block TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    risk_reasoning TEXT NOT NULL,
+    signature BLOB,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_risk_cache_block ON risk_cache (block);
+CREATE INDEX IF NOT EXISTS idx_risk_cache_last_used ON risk_cache (last_used);
+"""
+
+
+# ============================================================
+# FINGERPRINTING
+# ============================================================
+
+def normalize_text(text: str) -> str:
+    """Lowercase and reduce text to space-separated alphanumeric words."""
+    return " ".join(_WORD_RE.findall(str(text).lower()))
+
+
+def amount_bucket(amount: float) -> str:
+    """Bucket an amount by risk level and 5% geometric band."""
+    amount = float(amount)
+    level = rule_risk_level(amount)
+    if amount <= 0:
+        return f"{level}:nonpositive"
+    return f"{level}:{int(math.log(amount, _AMOUNT_BUCKET_RATIO))}"
+
+
+def current_model() -> str:
+    """Identifier for the configured LLM (part of every cache key)."""
+    model = GOOGLE_MODEL if LLM_PROVIDER == "google" else OPENAI_MODEL
+    return f"{LLM_PROVIDER}:{model}"
+
+
+def _block(state: dict, model: str) -> str:
+    dept = normalize_text(state.get("department", ""))
+    # Priority changes the risk level (urgent requests are escalated), so
+    # requests differing only in priority must never share an entry.
+    priority = normalize_text(state.get("priority") or "normal")
+    return f"{dept}|{priority}|{amount_bucket(state.get('amount', 0))}|{model}"
+
+
+def _text(state: dict) -> str:
+    return " | ".join(
+        normalize_text(state.get(field, ""))
+        for field in ("title", "description", "justification")
+    )
+
+
+def fingerprint(state: dict, model: Optional[str] = None) -> str:
+    """Exact-tier cache key for a request."""
+    model = model or current_model()
+    raw = f"{_block(state, model)}#{_text(state)}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def minhash_signature(text: str, permutations: int = MINHASH_PERMUTATIONS) -> bytes:
+    """MinHash signature over word shingles, packed as unsigned 64-bit ints."""
+    words = text.replace("|", " ").split()
+    shingles = {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))
+    }
+    base = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles
+    ]
+    mins = []
+    for seed in range(permutations):
+        # Cheap universal hash family: (a*x + b) mod 2^64 with odd a.
+        a = (seed * 0x9E3779B97F4A7C15 + 0xBF58476D1CE4E5B9) & _MASK64 | 1
+        b = (seed * 0x94D049BB133111EB) & _MASK64
+        mins.append(min(((a * h + b) & _MASK64) for h in base) if base else 0)
+    return struct.pack(f"<{permutations}Q", *mins)
+
+
+def signature_similarity(sig_a: bytes, sig_b: bytes) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if len(sig_a) != len(sig_b) or not sig_a:
+        return 0.0
+    n = len(sig_a) // 8
+    a = struct.unpack(f"<{n}Q", sig_a)
+    b = struct.unpack(f"<{n}Q", sig_b)
+    return sum(1 for x, y in zip(a, b) if x == y) / n
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class RiskCache:
+    """
+    SQLite-backed risk assessment cache with TTL and LRU trimming.
+
+    Args:
+        path: SQLite database path (":memory:" for a process-local cache)
+        ttl: seconds an entry stays valid
+        max_entries: maximum rows kept; oldest-used rows are evicted
+        near_duplicates: enable the MinHash near-duplicate tier
+        near_threshold: minimum estimated Jaccard similarity for a near hit
+    """
+
+    def __init__(
+        self,
+        path: str = RISK_CACHE_DB,
+        ttl: float = RISK_CACHE_TTL,
+        max_entries: int = RISK_CACHE_MAX_ENTRIES,
+        near_duplicates: bool = True,
+        near_threshold: float = RISK_CACHE_NEAR_THRESHOLD,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.near_duplicates = near_duplicates
+        self.near_threshold = near_threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "evictions": 0}
+        # key → (risk_level, risk_reasoning, created_at); mirrors recent SQLite rows
+        self._hot: "OrderedDict[str, tuple]" = OrderedDict()
+        # key → last_used, flushed to SQLite on the next write
+        self._pending_touch: dict[str, float] = {}
+
+    def get(self, state: dict, model: Optional[str] = None) -> Optional[dict]:
+        """
+        Look up a cached assessment.
+
+        Returns {"risk_level", "risk_reasoning", "cache": "exact"|"near", "key"}
+        or None on a miss.
+        """
+        model = model or current_model()
+        key = fingerprint(state, model)
+        now = time.time()
+        cutoff = now - self.ttl
+        with self._lock:
+            entry = self._hot.get(key)
+            if entry is None or entry[2] < cutoff:
+                row = self._conn.execute(
+                    "SELECT risk_level, risk_reasoning, created_at FROM risk_cache "
+                    "WHERE key = ? AND created_at >= ?",
+                    (key, cutoff),
+                ).fetchone()
+                entry = self._remember(key, row) if row is not None else None
+            if entry is not None:
+                self._hot.move_to_end(key)
+                self._pending_touch[key] = now
+                self.stats["exact_hits"] += 1
+                return {"risk_level": entry[0], "risk_reasoning": entry[1], "cache": "exact", "key": key}
+
+            if self.near_duplicates:
+                signature = minhash_signature(_text(state))
+                best = None
+                for cand_key, level, reasoning, cand_sig in self._conn.execute(
+                    "SELECT key, risk_level, risk_reasoning, signature FROM risk_cache "
+                    "WHERE block = ? AND created_at >= ? AND signature IS NOT NULL",
+                    (_block(state, model), cutoff),
+                ):
+                    similarity = signature_similarity(signature, cand_sig)
+                    if similarity >= self.near_threshold and (best is None or similarity > best[0]):
+                        best = (similarity, cand_key, level, reasoning)
+                if best is not None:
+                    self._pending_touch[best[1]] = now
+                    self.stats["near_hits"] += 1
+                    return {
+                        "risk_level": best[2],
+                        "risk_reasoning": best[3],
+                        "cache": "near",
+                        "key": best[1],
+                        "similarity": best[0],
+                    }
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, state: dict, risk_level: str, risk_reasoning: str, model: Optional[str] = None) -> str:
+        """Store an assessment and trim the table; returns the cache key."""
+        model = model or current_model()
+        key = fingerprint(state, model)
+        signature = minhash_signature(_text(state)) if self.near_duplicates else None
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO risk_cache "
+                "(key, block, risk_level, risk_reasoning, signature, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, _block(state, model), risk_level, risk_reasoning, signature, now, now),
+            )
+            self._remember(key, (risk_level, risk_reasoning, now))
+            self._flush_touches()
+            self._evict(now)
+            self._conn.commit()
+        return key
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM risk_cache")
+            self._conn.commit()
+            self._hot.clear()
+            self._pending_touch.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM risk_cache").fetchone()[0]
+
+    def _remember(self, key: str, entry: tuple) -> tuple:
+        self._hot[key] = tuple(entry)
+        self._hot.move_to_end(key)
+        while len(self._hot) > HOT_ENTRIES:
+            self._hot.popitem(last=False)
+        return self._hot[key]
+
+    def _flush_touches(self) -> None:
+        if self._pending_touch:
+            self._conn.executemany(
+                "UPDATE risk_cache SET last_used = ? WHERE key = ?",
+                [(ts, key) for key, ts in self._pending_touch.items()],
+            )
+            self._pending_touch.clear()
+
+    def _evict(self, now: float) -> None:
+        expired = self._conn.execute(
+            "DELETE FROM risk_cache WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+        overflow = self._conn.execute("SELECT COUNT(*) FROM risk_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM risk_cache WHERE key IN "
+                "(SELECT key FROM risk_cache ORDER BY last_used ASC LIMIT ?)",
+                (overflow,),
+            )
+        if expired or overflow > 0:
+            # Drop hot entries whose rows were just deleted.
+            self._hot.clear()
+        self.stats["evictions"] += expired + max(overflow, 0)
+
+
+_default_cache: Optional[RiskCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_risk_cache() -> RiskCache:
+    """Return the process-wide RiskCache backed by RISK_CACHE_DB."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = RiskCache()
+        return _default_cache
+
+
+def cache_decision(outcome: str, detail: str) -> dict:
+    """Audit entry for the decisions list describing a cache lookup."""
+    return {
+        "stage": "risk_assessment",
+        "decision": f"cache_{outcome}",
+        "reasoning": detail,
+        "reviewer": "Risk cache",
+    }
+
+
+def assess_risk_cached(
+    state: dict,
+    assess: Callable[[dict], dict] = assess_risk_tiered,
+    cache: Optional[RiskCache] = None,
+) -> dict:
+    """
+    Serve a risk assessment from the cache, falling back to ``assess``.
+
+    Only LLM-tier results are stored; rule-tier results are cheaper to
+    recompute than to look up.
+
+    Returns:
+        dict with risk_level, risk_reasoning, risk_tier and a one-item
+        ``decisions`` list recording the cache outcome
+    """
+    if cache is None:
+        cache = get_risk_cache()
+    hit = cache.get(state)
+    if hit is not None:
+        detail = f"Served from {hit['cache']} cache entry {hit['key'][:12]}"
+        if "similarity" in hit:
+            detail += f" (similarity {hit['similarity']:.2f})"
+        return {
+            "risk_level": hit["risk_level"],
+            "risk_reasoning": hit["risk_reasoning"],
+            "risk_tier": f"cache_{hit['cache']}",
+            "decisions": [cache_decision("hit", detail)],
+        }
+
+    result = dict(assess(state))
+    if result.get("risk_tier", "llm") == "rules":
+        detail = "Cache bypassed: decided by rule tier"
+    else:
+        key = cache.put(state, result["risk_level"], result["risk_reasoning"])
+        detail = f"Cache miss; stored assessment as {key[:12]}"
+    result["decisions"] = [cache_decision("miss", detail)]
+    return result
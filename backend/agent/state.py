@@ -29,6 +29,7 @@ class ApprovalState(MessagesState):
     # --- Risk Assessment ---
     risk_level: str  # "low", "medium", "high", "critical"
     risk_reasoning: str
+    risk_tier: str  # which engine tier decided: "rules", "llm", ...
 
     # --- Validation ---
     is_valid: bool
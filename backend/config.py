@@ -4,6 +4,8 @@ Loads environment variables and provides LLM factory.
 """
 
 import os
+import threading
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -30,27 +32,126 @@ VALID_DEPARTMENTS = list(DEPARTMENT_BUDGETS.keys())
 HIGH_RISK_THRESHOLD = 50000
 MEDIUM_RISK_THRESHOLD = 10000
 
+# Fraction of a threshold within which an amount is "ambiguous" and the
+# tiered risk engine defers to the LLM (0.1 → within ±10% of a threshold).
+RISK_AMBIGUITY_BAND = float(os.getenv("RISK_AMBIGUITY_BAND", "0.1"))
+# Rough per-call LLM cost (USD) used to report spend avoided by the rule tier.
+RISK_LLM_COST_PER_CALL = float(os.getenv("RISK_LLM_COST_PER_CALL", "0.0005"))
+
 # --- LangSmith ---
 LANGSMITH_API_KEY = os.getenv("LANGSMITH_API_KEY", "")
 LANGSMITH_PROJECT = os.getenv("LANGSMITH_PROJECT", "financial-approval-system")
 
 # --- Checkpointer ---
 CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "checkpoints.db")
+CHECKPOINT_READERS = int(os.getenv("CHECKPOINT_READERS", "4"))  # reader pool size
+CHECKPOINT_READER_TIMEOUT = float(os.getenv("CHECKPOINT_READER_TIMEOUT", "30"))  # seconds to wait for a reader
+CHECKPOINT_DELTA = os.getenv("CHECKPOINT_DELTA", "false").lower() in ("1", "true", "yes")
+CHECKPOINT_SNAPSHOT_EVERY = int(os.getenv("CHECKPOINT_SNAPSHOT_EVERY", "8"))  # full snapshot cadence
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "1"))  # kept per completed thread
+CHECKPOINT_ARCHIVE_DIR = os.getenv("CHECKPOINT_ARCHIVE_DIR", "checkpoint_archive")
+CHECKPOINT_COMPACTION_INTERVAL = float(os.getenv("CHECKPOINT_COMPACTION_INTERVAL", "0"))  # seconds, 0 = off
+CHECKPOINT_FULL_VACUUM_EVERY = int(os.getenv("CHECKPOINT_FULL_VACUUM_EVERY", "0"))  # passes, 0 = never (locks the DB)
+
+# --- Risk Assessment Cache ---
+RISK_CACHE_DB = os.getenv("RISK_CACHE_DB", "risk_cache.db")
+RISK_CACHE_TTL = float(os.getenv("RISK_CACHE_TTL", str(30 * 24 * 3600)))  # 30 days
+RISK_CACHE_MAX_ENTRIES = int(os.getenv("RISK_CACHE_MAX_ENTRIES", "10000"))
+RISK_CACHE_NEAR_THRESHOLD = float(os.getenv("RISK_CACHE_NEAR_THRESHOLD", "0.7"))
+
+# --- Guardrail Verdict Cache ---
+GUARDRAIL_CACHE_ENTRIES = int(os.getenv("GUARDRAIL_CACHE_ENTRIES", "4096"))  # per guarded function
+
+# --- Evaluation Runner ---
+EVAL_MAX_WORKERS = int(os.getenv("EVAL_MAX_WORKERS", "4"))  # heuristic evaluator threads
+EVAL_LLM_CONCURRENCY = int(os.getenv("EVAL_LLM_CONCURRENCY", "4"))  # LLM evaluator calls in flight
+EVAL_LLM_RATE_LIMIT = float(os.getenv("EVAL_LLM_RATE_LIMIT", "0"))  # LLM calls/sec, 0 = unlimited
+EVAL_CACHE_DB = os.getenv("EVAL_CACHE_DB", "eval_cache.db")  # evaluator result cache
+EVAL_MANIFEST = os.getenv("EVAL_MANIFEST", "eval_manifest.json")  # incremental run manifest
+EVAL_GRAPH_WORKERS = int(os.getenv("EVAL_GRAPH_WORKERS", "4"))  # processes for --graph runs
+EVAL_SHARD_WORKERS = int(os.getenv("EVAL_SHARD_WORKERS", "4"))  # processes for --sharded runs
+EVAL_SHARD_SIZE = int(os.getenv("EVAL_SHARD_SIZE", "500"))  # cases per shard
+EVAL_STREAM_CHUNK = int(os.getenv("EVAL_STREAM_CHUNK", "1000"))  # cases per chunk for streamed datasets
+EVAL_GEN_CONCURRENCY = int(os.getenv("EVAL_GEN_CONCURRENCY", "8"))  # generation prompts in flight
+EVAL_GEN_RATE_LIMIT = float(os.getenv("EVAL_GEN_RATE_LIMIT", "0"))  # generation prompts/sec, 0 = unlimited
+EVAL_GEN_CASES_PER_PROMPT = int(os.getenv("EVAL_GEN_CASES_PER_PROMPT", "10"))  # cases asked of each prompt
+EVAL_UPLOAD_CHUNK = int(os.getenv("EVAL_UPLOAD_CHUNK", "200"))  # examples per LangSmith create_examples call
+EVAL_UPLOAD_CONCURRENCY = int(os.getenv("EVAL_UPLOAD_CONCURRENCY", "4"))  # upload requests in flight
+EVAL_UPLOAD_RETRIES = int(os.getenv("EVAL_UPLOAD_RETRIES", "5"))  # retries per chunk on transient errors
+EVAL_UPLOAD_BACKOFF = float(os.getenv("EVAL_UPLOAD_BACKOFF", "0.5"))  # seconds, doubled per retry
+EVAL_UPLOAD_MANIFEST = os.getenv("EVAL_UPLOAD_MANIFEST", "langsmith_upload.json")  # upload resume manifest
 
+# --- LLM Client Pool ---
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "8"))
 
-def get_llm(temperature: float = 0.0):
-    """Factory function to create the appropriate LLM based on LLM_PROVIDER."""
-    if LLM_PROVIDER == "google":
+# Process-wide LRU pool of LLM clients keyed by (provider, model, temperature).
+# Reusing a client keeps its HTTP connection pool (and TLS sessions) warm.
+_llm_pool: "OrderedDict[tuple, object]" = OrderedDict()
+_llm_pool_lock = threading.Lock()
+_llm_pool_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _build_llm(provider: str, model: str, temperature: float):
+    """Construct a new LLM client for the given provider/model/temperature."""
+    if provider == "google":
         from langchain_google_genai import ChatGoogleGenerativeAI
         return ChatGoogleGenerativeAI(
-            model=GOOGLE_MODEL,
+            model=model,
             google_api_key=GOOGLE_API_KEY,
             temperature=temperature,
         )
 
     from langchain_openai import ChatOpenAI
     return ChatOpenAI(
-        model=OPENAI_MODEL,
+        model=model,
         api_key=OPENAI_API_KEY,
         temperature=temperature,
     )
+
+
+def get_llm(temperature: float = 0.0, model: str | None = None):
+    """
+    Factory function to get the appropriate LLM based on LLM_PROVIDER.
+
+    Clients are pooled per (provider, model, temperature) and shared across
+    threads, so repeated calls return the same warm instance. The pool holds
+    at most LLM_POOL_SIZE clients and evicts the least recently used one.
+    """
+    provider = LLM_PROVIDER
+    if model is None:
+        model = GOOGLE_MODEL if provider == "google" else OPENAI_MODEL
+    key = (provider, model, float(temperature))
+
+    with _llm_pool_lock:
+        llm = _llm_pool.get(key)
+        if llm is not None:
+            _llm_pool.move_to_end(key)
+            _llm_pool_stats["hits"] += 1
+            return llm
+
+        _llm_pool_stats["misses"] += 1
+        llm = _build_llm(provider, model, float(temperature))
+        _llm_pool[key] = llm
+        while len(_llm_pool) > max(LLM_POOL_SIZE, 1):
+            _llm_pool.popitem(last=False)
+            _llm_pool_stats["evictions"] += 1
+        return llm
+
+
+def get_llm_pool_stats() -> dict:
+    """Return hit/miss/eviction counters and the current size of the LLM pool."""
+    with _llm_pool_lock:
+        stats = dict(_llm_pool_stats)
+        stats["size"] = len(_llm_pool)
+        stats["max_size"] = LLM_POOL_SIZE
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def clear_llm_pool() -> None:
+    """Drop every pooled LLM client and reset the pool counters."""
+    with _llm_pool_lock:
+        _llm_pool.clear()
+        for name in _llm_pool_stats:
+            _llm_pool_stats[name] = 0
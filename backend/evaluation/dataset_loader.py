@@ -0,0 +1,183 @@
+"""
+Lazy evaluation datasets from JSONL, gzip-JSONL or Parquet files.
+
+EVAL_DATASET is a literal list. Large regression suites live in files
+instead: one {"input": {...}, "expected": {...}} case per JSONL line, or
+one per Parquet row with "input" and "expected" struct (or JSON string)
+columns. load_dataset() returns a CaseStream that reads the file only
+while it is iterated, one line or one record batch at a time. Filters
+and sampling are applied in the same pass:
+
+  risk_levels  — keep cases whose expected risk_level is listed
+  departments  — keep cases whose input department is listed
+  fraction     — keep each case with this probability (seeded; O(1) memory)
+  k            — uniform sample of exactly k cases (reservoir; O(k) memory)
+  limit        — stop after this many cases
+
+    cases = load_dataset("regression.jsonl.gz", risk_levels=["high", "critical"], fraction=0.1)
+    run_three_layer_evaluation(cases)   # streamed in chunks, constant memory
+
+A CaseStream is re-iterable (each iteration re-reads the file with the
+same seed), so the same object can be scored more than once. Parquet
+needs the optional pyarrow package.
+
+This file is GIVEN — students do not modify it.
+"""
+
+import argparse
+import gzip
+import heapq
+import json
+import os
+import random
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet input is optional
+    pq = None
+
+PARQUET_BATCH_ROWS = 1024
+
+
+def _read_jsonl(path: str) -> Iterator[dict]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _read_parquet(path: str) -> Iterator[dict]:
+    if pq is None:
+        raise ImportError("Reading Parquet datasets requires pyarrow (pip install pyarrow)")
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=PARQUET_BATCH_ROWS):
+        for row in batch.to_pylist():
+            for key in ("input", "expected"):
+                if isinstance(row.get(key), str):
+                    row[key] = json.loads(row[key])
+            yield row
+
+
+def read_cases(source: Union[str, os.PathLike, Iterable[dict]]) -> Iterator[dict]:
+    """Cases from a .jsonl / .jsonl.gz / .parquet path, or any iterable of cases."""
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source
+        return
+    path = os.fspath(source)
+    if path.endswith(".parquet"):
+        yield from _read_parquet(path)
+    else:
+        yield from _read_jsonl(path)
+
+
+def write_jsonl(cases: Iterable[dict], path: Union[str, os.PathLike]) -> int:
+    """Write cases one per line (gzip-compressed for .gz paths); returns the count."""
+    path = os.fspath(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    count = 0
+    with opener(path, "wt", encoding="utf-8") as f:
+        for case in cases:
+            f.write(json.dumps(case, separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+class CaseStream:
+    """Re-iterable, lazily filtered and sampled view of a case source."""
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, Iterable[dict]],
+        risk_levels: Optional[Sequence[str]] = None,
+        departments: Optional[Sequence[str]] = None,
+        fraction: Optional[float] = None,
+        k: Optional[int] = None,
+        limit: Optional[int] = None,
+        seed: int = 0,
+    ):
+        self.source = source
+        self.risk_levels = frozenset(risk_levels) if risk_levels else None
+        self.departments = frozenset(departments) if departments else None
+        self.fraction = fraction
+        self.k = k
+        self.limit = limit
+        self.seed = seed
+
+    def _matches(self, case: dict) -> bool:
+        if self.risk_levels is not None and case.get("expected", {}).get("risk_level") not in self.risk_levels:
+            return False
+        if self.departments is not None and case.get("input", {}).get("department") not in self.departments:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[dict]:
+        rng = random.Random(self.seed)
+        cases = (case for case in read_cases(self.source) if self._matches(case))
+        if self.fraction is not None and self.fraction < 1:
+            cases = (case for case in cases if rng.random() < self.fraction)
+        if self.k is not None:
+            # Reservoir via random keys; keep file order in the output.
+            reservoir = heapq.nlargest(self.k, ((rng.random(), i, case) for i, case in enumerate(cases)))
+            cases = (case for _, _, case in sorted(reservoir, key=lambda item: item[1]))
+        for count, case in enumerate(cases):
+            if self.limit is not None and count >= self.limit:
+                return
+            yield case
+
+    def __repr__(self) -> str:
+        return f"CaseStream({self.source!r})"
+
+
+def load_dataset(
+    source: Union[str, os.PathLike, Iterable[dict]],
+    risk_levels: Optional[Sequence[str]] = None,
+    departments: Optional[Sequence[str]] = None,
+    fraction: Optional[float] = None,
+    k: Optional[int] = None,
+    limit: Optional[int] = None,
+    seed: int = 0,
+) -> CaseStream:
+    """
+    Open a dataset for lazy iteration.
+
+    Args:
+        source: .jsonl, .jsonl.gz or .parquet path, or an iterable of cases
+        risk_levels: Keep only these expected risk levels
+        departments: Keep only these input departments
+        fraction: Keep each case with this probability
+        k: Keep a uniform random sample of k cases
+        limit: Stop after this many cases
+        seed: Seed for sampling
+
+    Returns:
+        CaseStream yielding {"input", "expected"} dicts
+    """
+    return CaseStream(source, risk_levels, departments, fraction, k, limit, seed)
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """--dataset and filter/sampling options shared by the evaluation CLIs."""
+    parser.add_argument("--dataset", help="JSONL, gzip-JSONL or Parquet dataset (default: EVAL_DATASET)")
+    parser.add_argument("--risk", action="append", help="only this expected risk level (repeatable)")
+    parser.add_argument("--department", action="append", help="only this department (repeatable)")
+    parser.add_argument("--sample", type=float, help="keep each case with this probability")
+    parser.add_argument("--sample-size", type=int, help="uniform random sample of this many cases")
+    parser.add_argument("--limit", type=int, help="stop after this many cases")
+    parser.add_argument("--seed", type=int, default=0, help="sampling seed")
+
+
+def dataset_from_args(args: argparse.Namespace, default: Iterable[dict]) -> Iterable[dict]:
+    """The dataset selected by add_dataset_arguments options (``default`` if none)."""
+    filters = (args.risk, args.department, args.sample, args.sample_size, args.limit)
+    if args.dataset is None and all(value is None for value in filters):
+        return default
+    return load_dataset(
+        args.dataset if args.dataset is not None else default,
+        risk_levels=args.risk,
+        departments=args.department,
+        fraction=args.sample,
+        k=args.sample_size,
+        limit=args.limit,
+        seed=args.seed,
+    )
@@ -0,0 +1,374 @@
+"""
+Parallel, deduplicating LLM dataset generation.
+
+generate_eval_dataset() asks a single prompt for every case. Output-token
+limits and serial latency cap that at a few dozen cases. generate_dataset()
+instead fans out many small prompts of ``cases_per_prompt`` cases each:
+
+  stratified — each prompt is pinned to one department x risk band x
+               priority stratum (seeded shuffle, cycled), so a large run
+               covers every combination evenly
+  concurrent — through asyncio, at most ``concurrency`` prompts in flight
+               and at most ``rate_limit`` started per second
+  streamed   — responses are parsed with JsonArrayStream as tokens
+               arrive, so each case is handled as soon as its object
+               closes, and a truncated response still yields its
+               complete cases
+  validated  — each case goes through validate_generated_dataset() on
+               arrival (skipped with a warning while it is a TODO)
+  deduped    — near-identical cases (same department, priority and
+               amount, same title/description words) are dropped by
+               fingerprint hash
+
+Request IDs are reassigned (GEN-00001, ...), since every prompt numbers
+its cases from 1. Dropped cases are topped up in further rounds, sized
+by the acceptance rate so far, until ``total`` is reached or
+``max_rounds`` is used up.
+
+    report = generate_dataset(2000)
+    write_jsonl(report.cases, "generated.jsonl.gz")
+
+Usage:
+    python -m backend.evaluation.generation_pipeline --cases 2000 --out generated.jsonl.gz
+        [--edge] [--per-prompt 10] [--concurrency 8] [--rate-limit 0] [--seed 0]
+
+This file is GIVEN — students do not modify it.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import product
+from typing import AsyncIterator, Callable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.config import EVAL_GEN_CASES_PER_PROMPT, EVAL_GEN_CONCURRENCY, EVAL_GEN_RATE_LIMIT
+from backend.evaluation.dataset_generator import (
+    EDGE_CASE_PROMPT,
+    GENERATION_PROMPT,
+    VALID_DEPARTMENTS,
+    validate_generated_dataset,
+)
+from backend.evaluation.dataset_loader import write_jsonl
+from backend.evaluation.parallel import RateLimiter
+from backend.evaluation.result_cache import canonical_json
+
+RISK_BANDS = {
+    "low": "between $1 and $10,000",
+    "medium": "between $10,001 and $50,000",
+    "high": "between $50,001 and $100,000",
+    "over_ceiling": "above $100,000",
+    "invalid": "of zero or below zero",
+}
+PRIORITIES = ("low", "normal", "high", "urgent")
+
+STRATUM_PROMPT = """
+For this batch, every test case must use department "{department}", priority
+"{priority}" and an amount {band}. Apply the business rules above to fill in
+"expected". Vary the titles, descriptions, requesters and justifications.
+"""
+
+# Error messages kept on the report; the counters cover the rest.
+MAX_REPORTED_ERRORS = 20
+# Floor on the acceptance rate used to size top-up rounds.
+MIN_ACCEPT_RATE = 0.1
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True, slots=True)
+class GenerationSeed:
+    """One prompt: a stratum and how many cases to ask for."""
+    department: str
+    band: str
+    priority: str
+    num_cases: int
+
+    def prompt(self, template: str) -> str:
+        return template.format(num_cases=self.num_cases, departments=VALID_DEPARTMENTS) + STRATUM_PROMPT.format(
+            department=self.department, priority=self.priority, band=RISK_BANDS[self.band]
+        )
+
+
+@dataclass
+class GenerationReport:
+    """Accepted cases plus what was dropped on the way."""
+    cases: list[dict] = field(default_factory=list)
+    prompts: int = 0
+    parsed: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    failed_prompts: int = 0
+    errors: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def note(self, message: str) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+
+def stratified_seeds(total: int, cases_per_prompt: int, seed: int = 0, start: int = 0) -> list[GenerationSeed]:
+    """
+    Seeds for ``total`` cases, cycling through every stratum in a seeded order.
+
+    ``start`` continues the cycle where a previous call stopped, so top-up
+    rounds move on to strata not yet used.
+    """
+    strata = list(product(VALID_DEPARTMENTS, RISK_BANDS, PRIORITIES))
+    random.Random(seed).shuffle(strata)
+    per_prompt = max(int(cases_per_prompt), 1)
+    seeds = []
+    for i, offset in enumerate(range(0, max(int(total), 0), per_prompt)):
+        department, band, priority = strata[(start + i) % len(strata)]
+        seeds.append(GenerationSeed(department, band, priority, min(per_prompt, total - offset)))
+    return seeds
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for a JSON array of objects arriving in pieces.
+
+    feed() returns the objects completed by the new text. Anything before
+    the opening bracket (such as a markdown fence) is ignored.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self.done = False
+
+    def feed(self, text: str) -> list[dict]:
+        if self.done:
+            return []
+        self._buffer += text
+        if not self._started:
+            start = self._buffer.find("[")
+            if start < 0:
+                self._buffer = ""
+                return []
+            self._buffer, self._started = self._buffer[start + 1:], True
+        elif "}" not in text and "]" not in text:
+            return []  # no element can have completed
+        items, pos, buffer = [], 0, self._buffer
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.done = True
+                pos += 1
+                break
+            try:
+                item, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # element still incomplete
+            if isinstance(item, dict):
+                items.append(item)
+        self._buffer = buffer[pos:]
+        return items
+
+    def close(self) -> None:
+        """Raise ValueError if the array was never closed (e.g. truncated output)."""
+        if not self.done:
+            tail = self._buffer.strip()[:60]
+            raise ValueError(f"unterminated JSON array{f' near {tail!r}' if tail else ''}")
+
+
+def case_fingerprint(case: dict) -> str:
+    """Hash that is equal for near-identical cases, whatever their request_id or requester."""
+    inputs = case.get("input") or {}
+    amount = inputs.get("amount")
+    text = f"{inputs.get('title', '')} {inputs.get('description', '')}".lower()
+    key = [
+        str(inputs.get("department", "")).lower(),
+        str(inputs.get("priority", "")).lower(),
+        round(float(amount), 2) if isinstance(amount, (int, float)) else str(amount),
+        sorted(set(_WORD_RE.findall(text))),
+    ]
+    return hashlib.blake2b(canonical_json(key).encode(), digest_size=16).hexdigest()
+
+
+def _text(chunk) -> str:
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, list):  # content blocks (Gemini, Anthropic)
+        return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+    return content if isinstance(content, str) else str(content)
+
+
+async def _stream_text(llm, prompt: str) -> AsyncIterator[str]:
+    if hasattr(llm, "astream"):
+        async for chunk in llm.astream(prompt):
+            yield _text(chunk)
+    else:
+        yield _text(await llm.ainvoke(prompt))
+
+
+async def _run_prompts(
+    seeds: list[GenerationSeed],
+    llm,
+    template: str,
+    on_case: Callable[[dict], bool],
+    report: GenerationReport,
+    concurrency: int,
+    rate_limit: float,
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate_limit)
+    stop = asyncio.Event()
+
+    async def run(seed: GenerationSeed) -> None:
+        async with semaphore:
+            if stop.is_set():
+                return
+            await limiter.acquire()
+            report.prompts += 1
+            parser = JsonArrayStream()
+            try:
+                async for text in _stream_text(llm, seed.prompt(template)):
+                    for case in parser.feed(text):
+                        if not on_case(case):
+                            stop.set()
+                            return
+                parser.close()
+            except Exception as e:
+                report.failed_prompts += 1
+                report.note(f"{seed.department}/{seed.band}/{seed.priority}: {e}")
+
+    await asyncio.gather(*(run(seed) for seed in seeds))
+
+
+def generate_dataset(
+    total: int,
+    llm=None,
+    edge_cases: bool = False,
+    cases_per_prompt: int = EVAL_GEN_CASES_PER_PROMPT,
+    concurrency: int = EVAL_GEN_CONCURRENCY,
+    rate_limit: float = EVAL_GEN_RATE_LIMIT,
+    max_rounds: int = 3,
+    seed: int = 0,
+    id_prefix: str = "GEN",
+    validate: Optional[Callable] = validate_generated_dataset,
+) -> GenerationReport:
+    """
+    Generate ``total`` unique, valid cases from many concurrent prompts.
+
+    Args:
+        total: Number of cases wanted
+        llm: LangChain chat model (default: get_llm(temperature=0.7));
+             astream() is used when available, else ainvoke()
+        edge_cases: Use EDGE_CASE_PROMPT instead of GENERATION_PROMPT
+        cases_per_prompt: Cases asked of each prompt
+        concurrency: Prompts in flight
+        rate_limit: Prompts started per second (0 = unlimited)
+        max_rounds: Rounds of prompts used to top up dropped cases
+        seed: Seed for the stratum order
+        id_prefix: Prefix of the reassigned request IDs
+        validate: validate_generated_dataset-style checker, called with
+                  one case at a time; None to skip validation
+
+    Returns:
+        GenerationReport with the accepted cases and drop counters
+    """
+    if llm is None:
+        from backend.config import get_llm
+        llm = get_llm(temperature=0.7)
+
+    report = GenerationReport()
+    seen: set[str] = set()
+
+    def accept(case: dict) -> bool:
+        # Runs on the event loop thread, so no locking is needed.
+        nonlocal validate
+        if len(report.cases) >= total:
+            return False
+        report.parsed += 1
+        if not isinstance(case.get("input"), dict) or not isinstance(case.get("expected"), dict):
+            report.invalid += 1
+            report.note("case without input/expected objects")
+            return True
+        if validate is not None:
+            try:
+                valid, errors = validate([case])
+            except NotImplementedError:
+                print("  Warning: validate_generated_dataset is not implemented; cases are not validated")
+                validate = None
+            else:
+                if not valid:
+                    report.invalid += 1
+                    for error in errors[:1]:
+                        report.note(error)
+                    return True
+        fingerprint = case_fingerprint(case)
+        if fingerprint in seen:
+            report.duplicates += 1
+            return True
+        seen.add(fingerprint)
+        case["input"]["request_id"] = f"{id_prefix}-{len(report.cases) + 1:05d}"
+        report.cases.append(case)
+        return len(report.cases) < total
+
+    template = EDGE_CASE_PROMPT if edge_cases else GENERATION_PROMPT
+    start, used, asked = time.perf_counter(), 0, 0
+    for _ in range(max(int(max_rounds), 1)):
+        missing = total - len(report.cases)
+        if missing <= 0:
+            break
+        # Top-up rounds ask for more than is missing, scaled by the share of
+        # cases accepted so far; accept() stops the round at the target.
+        accepted = len(report.cases) / asked if asked else 1.0
+        request = math.ceil(missing / max(accepted, MIN_ACCEPT_RATE))
+        seeds = stratified_seeds(request, cases_per_prompt, seed=seed, start=used)
+        used += len(seeds)
+        asked += request
+        before = len(report.cases)
+        asyncio.run(_run_prompts(
+            seeds, llm, template, accept, report, max(int(concurrency), 1), rate_limit,
+        ))
+        if len(report.cases) == before:
+            break  # a round that adds nothing will not be helped by another
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100, help="unique valid cases to generate")
+    parser.add_argument("--out", default="generated_dataset.jsonl", help="JSONL output (.gz to compress)")
+    parser.add_argument("--edge", action="store_true", help="generate edge/adversarial cases")
+    parser.add_argument("--per-prompt", type=int, default=EVAL_GEN_CASES_PER_PROMPT, help="cases per prompt")
+    parser.add_argument("--concurrency", type=int, default=EVAL_GEN_CONCURRENCY, help="prompts in flight")
+    parser.add_argument("--rate-limit", type=float, default=EVAL_GEN_RATE_LIMIT,
+                        help="prompts per second (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0, help="stratum order seed")
+    args = parser.parse_args()
+
+    report = generate_dataset(
+        args.cases,
+        edge_cases=args.edge,
+        cases_per_prompt=args.per_prompt,
+        concurrency=args.concurrency,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    written = write_jsonl(report.cases, args.out)
+    print(f"  Generated {written}/{args.cases} cases in {report.elapsed:.1f}s from {report.prompts} prompts")
+    print(f"  Dropped: {report.invalid} invalid, {report.duplicates} duplicates; "
+          f"{report.failed_prompts} prompts failed")
+    for error in report.errors:
+        print(f"    {error}")
+    print(f"  Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
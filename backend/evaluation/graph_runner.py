@@ -0,0 +1,162 @@
+"""
+Run evaluation cases through the real approval graph.
+
+By default the three-layer runner scores ``expected`` against itself,
+which never exercises the agent. run_cases() instead executes every
+case through create_approval_graph, or create_demo_graph while the
+student graph raises NotImplementedError. Each case runs on a fresh
+thread of an in-memory checkpointer. A scripted review policy answers
+each interrupt:
+
+  - approve, unless the case scripts a decision for that stage in
+    ``test_case["reviews"]`` ({stage: {"approved": bool, "comments": str}})
+  - reject at the last human review stage of the expected path when the
+    case expects a rejection after review
+
+The outputs the evaluators see come from the run: approval_path (nodes
+in execution order, demo node names mapped to the student names),
+human_reviews (review nodes that completed), decisions, status and
+risk_level. Cases run in parallel on a process pool. Each worker builds
+its graph once. Per-case wall time from submit to the end of the last
+resume is returned next to the outputs.
+
+    results = run_cases(EVAL_DATASET, graph="auto", workers=4)
+    results[0]["outputs"]["approval_path"], results[0]["latency_ms"]
+
+This file is GIVEN — students do not modify it.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from backend.config import EVAL_GRAPH_WORKERS
+
+GRAPH_KINDS = ("auto", "approval", "demo")
+REVIEW_STAGES = ("manager_review", "finance_review", "final_signoff")
+DEMO_NODE_NAMES = {
+    "demo_submit": "submit_request",
+    "demo_assess": "assess_risk",
+    "demo_validate_budget": "validate_budget",
+    "demo_manager_review": "manager_review",
+    "demo_finance_review": "finance_review",
+    "demo_final_signoff": "final_signoff",
+    "demo_process": "process_request",
+    "demo_reject": "handle_rejection",
+}
+
+_graph = None
+_graph_name: Optional[str] = None
+
+
+def build_graph(kind: str = "auto"):
+    """Return (compiled graph, "approval" | "demo") with an in-memory checkpointer."""
+    if kind not in GRAPH_KINDS:
+        raise ValueError(f"Unknown graph {kind!r}; expected one of {GRAPH_KINDS}")
+    if kind in ("auto", "approval"):
+        from backend.agent.graph import create_approval_graph
+        try:
+            return create_approval_graph(checkpointer=InMemorySaver()), "approval"
+        except NotImplementedError:
+            if kind == "approval":
+                raise
+    from backend.agent.demo_graph import create_demo_graph
+    return create_demo_graph(checkpointer=InMemorySaver()), "demo"
+
+
+def review_decision(stage: str, test_case: dict) -> dict:
+    """Scripted reviewer answer for one interrupt."""
+    scripted = test_case.get("reviews", {}).get(stage)
+    if scripted is not None:
+        return {"approved": bool(scripted.get("approved")), "comments": scripted.get("comments", "")}
+    expected = test_case.get("expected", {})
+    reviews = [s for s in expected.get("approval_path", []) if s in REVIEW_STAGES]
+    if expected.get("status") == "rejected" and reviews and stage == reviews[-1]:
+        return {"approved": False, "comments": "Rejected by evaluation script."}
+    return {"approved": True, "comments": "Approved by evaluation script."}
+
+
+def _normalize_decision(decision: dict) -> dict:
+    """Give demo-style decisions the decision/reasoning keys evaluators read."""
+    decision = dict(decision)
+    if "decision" not in decision and "approved" in decision:
+        decision["decision"] = "approved" if decision["approved"] else "rejected"
+    decision.setdefault("reasoning", decision.get("comments", ""))
+    return decision
+
+
+def run_case(test_case: dict, graph=None, thread_id: str = "eval") -> dict:
+    """
+    Run one case to completion, answering every interrupt.
+
+    Returns:
+        {"outputs": {...}, "latency_ms": float, "graph": name}
+    """
+    global _graph, _graph_name
+    if graph is None:
+        if _graph is None:
+            _graph, _graph_name = build_graph()
+        graph = _graph
+    name = _graph_name if graph is _graph else "custom"
+    config = {"configurable": {"thread_id": thread_id}}
+    path = []
+    payload = {**test_case["input"], "messages": []}
+
+    start = time.perf_counter()
+    while payload is not None:
+        interrupted = None
+        for update in graph.stream(payload, config, stream_mode="updates"):
+            for node in update:
+                if node == "__interrupt__":
+                    interrupted = update[node][0].value
+                else:
+                    path.append(DEMO_NODE_NAMES.get(node, node))
+        if interrupted is None:
+            payload = None
+        else:
+            stage = interrupted.get("type", "") if isinstance(interrupted, dict) else ""
+            payload = Command(resume=review_decision(stage, test_case))
+    latency = time.perf_counter() - start
+
+    values = graph.get_state(config).values
+    return {
+        "outputs": {
+            "status": values.get("status", ""),
+            "risk_level": values.get("risk_level", ""),
+            "approval_path": path,
+            "human_reviews": sum(1 for node in path if node in REVIEW_STAGES),
+            "decisions": [_normalize_decision(d) for d in values.get("decisions", [])],
+        },
+        "latency_ms": latency * 1000,
+        "graph": name,
+    }
+
+
+def _init_worker(kind: str) -> None:
+    global _graph, _graph_name
+    _graph, _graph_name = build_graph(kind)
+
+
+def _run_indexed(item: tuple[int, dict]) -> dict:
+    idx, test_case = item
+    return run_case(test_case, thread_id=f"eval-{idx}")
+
+
+def run_cases(dataset: list[dict], graph: str = "auto", workers: int = EVAL_GRAPH_WORKERS) -> list[dict]:
+    """
+    Run every case through the graph; results are in dataset order.
+
+    Args:
+        dataset: list[dict] with "input" and "expected" keys
+        graph: "auto" (approval graph, demo if unimplemented), "approval" or "demo"
+        workers: Worker processes; 1 runs in this process
+    """
+    items = list(enumerate(dataset))
+    if workers <= 1 or len(items) <= 1:
+        _init_worker(graph)
+        return [_run_indexed(item) for item in items]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,)) as pool:
+        return list(pool.map(_run_indexed, items, chunksize=max(len(items) // (workers * 4), 1)))
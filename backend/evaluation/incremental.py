@@ -0,0 +1,128 @@
+"""
+Incremental three-layer evaluation.
+
+The evaluation dataset keeps growing, but most cases and evaluators do
+not change between runs. EvalManifest records, for every case of the
+last run:
+
+  case id — the case's "id", else its input request_id, else its hash
+  hash    — blake2b of the canonical JSON of the whole case
+  scores  — {evaluator: {"version": evaluator version, "score": score}}
+
+On the next run, plan() compares the dataset and the current evaluator
+versions (result_cache.evaluator_version) with the manifest. Only new
+cases, edited cases and evaluators whose source changed are scored.
+Every other pair reuses its recorded score. Cases no longer in the
+dataset are dropped. The runner merges the two sets into the usual
+layer averages, so evaluator calls scale with the number of changes,
+not the dataset size.
+
+    manifest = EvalManifest("eval_manifest.json")
+    prior, pending = manifest.plan(ids, hashes, versions)
+    ... score only ``pending`` ...
+    manifest.update(ids, hashes, versions, per_case)
+    manifest.save()
+
+This file is GIVEN — students do not modify it.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional
+
+from backend.config import EVAL_MANIFEST
+from backend.evaluation.result_cache import canonical_json
+
+MANIFEST_FORMAT = 1
+
+
+def case_hash(test_case: dict) -> str:
+    """Content hash of a whole test case (input and expected)."""
+    return hashlib.blake2b(canonical_json(test_case).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def case_ids(dataset: list[dict], hashes: Optional[list[str]] = None) -> list[str]:
+    """Stable id per case; repeated ids get a "#n" suffix."""
+    hashes = hashes or [case_hash(test_case) for test_case in dataset]
+    ids, seen = [], {}
+    for test_case, digest in zip(dataset, hashes):
+        base = str(test_case.get("id") or test_case.get("input", {}).get("request_id") or digest)
+        seen[base] = seen.get(base, 0) + 1
+        ids.append(base if seen[base] == 1 else f"{base}#{seen[base]}")
+    return ids
+
+
+class EvalManifest:
+    """
+    Per-case scores and hashes from the previous evaluation run.
+
+    Args:
+        path: JSON manifest path (created on first save)
+    """
+
+    def __init__(self, path: str = EVAL_MANIFEST):
+        self.path = path
+        self.cases: dict[str, dict] = {}
+        self.stats = {"changed": 0, "reused": 0, "removed": 0}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == MANIFEST_FORMAT:
+                self.cases = data.get("cases", {})
+
+    def plan(
+        self,
+        ids: list[str],
+        hashes: list[str],
+        versions: dict[str, str],
+    ) -> tuple[dict[str, list], dict[str, list[int]]]:
+        """
+        Split (evaluator, case) pairs into reusable scores and work to do.
+
+        Returns:
+            Tuple of ({name: [prior score or None per case]},
+                      {name: [case indices to score]})
+        """
+        prior = {name: [None] * len(ids) for name in versions}
+        pending = {name: [] for name in versions}
+        for idx, (case_id, digest) in enumerate(zip(ids, hashes)):
+            entry = self.cases.get(case_id)
+            recorded = entry["scores"] if entry is not None and entry.get("hash") == digest else {}
+            for name, version in versions.items():
+                previous = recorded.get(name)
+                if previous is not None and previous.get("version") == version and previous.get("score") is not None:
+                    prior[name][idx] = previous["score"]
+                else:
+                    pending[name].append(idx)
+        self.stats["reused"] = sum(score is not None for scores in prior.values() for score in scores)
+        self.stats["changed"] = sum(len(indices) for indices in pending.values())
+        self.stats["removed"] = len(set(self.cases) - set(ids))
+        return prior, pending
+
+    def update(
+        self,
+        ids: list[str],
+        hashes: list[str],
+        versions: dict[str, str],
+        per_case: dict[str, list],
+    ) -> None:
+        """Replace the manifest with this run's cases and merged scores."""
+        self.cases = {
+            case_id: {
+                "hash": digest,
+                "scores": {
+                    name: {"version": version, "score": per_case[name][idx]}
+                    for name, version in versions.items()
+                    if per_case[name][idx] is not None
+                },
+            }
+            for idx, (case_id, digest) in enumerate(zip(ids, hashes))
+        }
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": MANIFEST_FORMAT, "cases": self.cases}, f, sort_keys=True)
+        os.replace(tmp, self.path)
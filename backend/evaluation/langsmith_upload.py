@@ -0,0 +1,350 @@
+"""
+Bulk, resumable upload of evaluation datasets to LangSmith.
+
+upload_to_langsmith() makes one create_example() request per case. For a
+generated dataset of thousands of cases, that is thousands of sequential
+HTTP round trips, with no retry and no way to resume. upload_dataset()
+instead:
+
+  batches   — groups cases into chunks of ``chunk_size`` examples and
+              sends each chunk with one create_examples() call
+  parallel  — keeps up to ``concurrency`` chunks in flight on a thread
+              pool; the input is read lazily, so a CaseStream is never
+              materialized
+  retries   — rate-limit, timeout, connection and server errors are
+              retried with jittered exponential backoff, up to
+              ``max_retries`` times per chunk
+  resumes   — after each chunk, its content hashes are appended to a
+              local manifest log, compacted when the upload ends; a
+              rerun after a crash skips everything recorded
+  skips     — each example carries its content hash in metadata, and
+              examples already in the dataset are listed first, so
+              cases the server has are skipped even without a manifest
+
+Example IDs are derived from the dataset ID and content hash. A chunk
+whose response was lost but which did land therefore comes back as a
+conflict on retry, and is counted as uploaded rather than duplicated.
+A conflict on the first attempt means examples from an earlier run are
+already there; the chunk is split to upload the rest, and those found
+are counted as skipped.
+
+    report = upload_dataset(load_dataset("generated.jsonl.gz"), "financial-approval-eval")
+    report.uploaded, report.skipped
+
+Usage:
+    python -m backend.evaluation.langsmith_upload generated.jsonl.gz [--name financial-approval-eval]
+        [--chunk-size 200] [--concurrency 4] [--manifest langsmith_upload.json] [--no-remote-check]
+
+This file is GIVEN — students do not modify it.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from langsmith import utils as ls_utils
+
+from backend.config import (
+    EVAL_UPLOAD_BACKOFF,
+    EVAL_UPLOAD_CHUNK,
+    EVAL_UPLOAD_CONCURRENCY,
+    EVAL_UPLOAD_MANIFEST,
+    EVAL_UPLOAD_RETRIES,
+)
+from backend.evaluation.dataset_loader import load_dataset
+from backend.evaluation.result_cache import canonical_json
+from backend.evaluation.sharding import SHARDS_IN_FLIGHT, shards
+
+MANIFEST_FORMAT = 1
+
+# Errors worth another attempt; anything else (auth, bad request) fails fast.
+RETRYABLE_ERRORS = (
+    ls_utils.LangSmithRateLimitError,
+    ls_utils.LangSmithRequestTimeout,
+    ls_utils.LangSmithConnectionError,
+    ls_utils.LangSmithAPIError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def example_hash(test_case: dict) -> str:
+    """Content hash of a case as a LangSmith example (inputs and outputs)."""
+    payload = {"inputs": test_case["input"], "outputs": test_case["expected"]}
+    return hashlib.blake2b(canonical_json(payload).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _stored_hash(example) -> str:
+    metadata = getattr(example, "metadata", None) or {}
+    if "content_hash" in metadata:
+        return metadata["content_hash"]
+    return example_hash({"input": example.inputs or {}, "expected": example.outputs or {}})
+
+
+@dataclass
+class UploadReport:
+    """Counters for one upload_dataset() call."""
+    dataset_id: str
+    uploaded: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+
+
+class UploadManifest:
+    """
+    Content hashes already uploaded, per dataset name.
+
+    record() appends one line per chunk to a JSONL log next to the
+    manifest (``<path>.log``), so saving progress costs one short write
+    per chunk however large the manifest grows. Loading replays the log
+    over the manifest; compact() folds it back in with one atomic write.
+
+    Args:
+        path: JSON manifest path (created on first compact)
+    """
+
+    def __init__(self, path: str = EVAL_UPLOAD_MANIFEST):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.datasets: dict[str, dict] = {}
+        self._log = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == MANIFEST_FORMAT:
+                self.datasets = data.get("datasets", {})
+        if os.path.exists(self.log_path):
+            with open(self.log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last line from a crash mid-write
+                    self._apply(entry["dataset"], entry["dataset_id"], entry["hashes"])
+
+    def hashes(self, name: str, dataset_id: str) -> set[str]:
+        """Hashes recorded for ``name``; empty if the dataset was recreated since."""
+        entry = self.datasets.get(name)
+        if entry is None or entry.get("dataset_id") != dataset_id:
+            return set()
+        return set(entry.get("hashes", ()))
+
+    def _apply(self, name: str, dataset_id: str, hashes: list[str]) -> None:
+        entry = self.datasets.get(name)
+        if entry is None or entry.get("dataset_id") != dataset_id:
+            entry = self.datasets[name] = {"dataset_id": dataset_id, "hashes": []}
+        entry["hashes"].extend(hashes)
+
+    def record(self, name: str, dataset_id: str, hashes: Iterable[str]) -> None:
+        """Add hashes and append them to the log."""
+        hashes = list(hashes)
+        self._apply(name, dataset_id, hashes)
+        if self._log is None:
+            self._log = open(self.log_path, "a", encoding="utf-8")
+        self._log.write(json.dumps({"dataset": name, "dataset_id": dataset_id, "hashes": hashes}) + "\n")
+        self._log.flush()
+
+    def compact(self) -> None:
+        """Write the manifest atomically and truncate the log."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": MANIFEST_FORMAT, "datasets": self.datasets}, f, sort_keys=True)
+        os.replace(tmp, self.path)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+
+def _upload_chunk(
+    client, dataset_id: str, chunk: list[tuple[str, dict]], max_retries: int, backoff: float,
+) -> tuple[int, int]:
+    """
+    Create one chunk of examples.
+
+    Returns (retries, examples found already on the server). A conflict
+    on the first attempt means some of the chunk was uploaded before,
+    by a run that left no manifest; the chunk is split in half until
+    every example is either created or known to be present.
+    """
+    examples = [
+        {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{dataset_id}/{digest}")),
+            "inputs": test_case["input"],
+            "outputs": test_case["expected"],
+            "metadata": {"content_hash": digest},
+        }
+        for digest, test_case in chunk
+    ]
+    for attempt in range(max_retries + 1):
+        try:
+            client.create_examples(dataset_id=dataset_id, examples=examples)
+            return attempt, 0
+        except ls_utils.LangSmithConflictError:
+            if attempt:
+                return attempt, 0  # an earlier attempt landed; IDs are content-derived
+            break
+        except RETRYABLE_ERRORS:
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.0))
+    else:
+        return max_retries, 0
+
+    if len(chunk) == 1:
+        return 0, 1
+    half = len(chunk) // 2
+    head = _upload_chunk(client, dataset_id, chunk[:half], max_retries, backoff)
+    tail = _upload_chunk(client, dataset_id, chunk[half:], max_retries, backoff)
+    return head[0] + tail[0], head[1] + tail[1]
+
+
+def upload_dataset(
+    dataset: Iterable[dict],
+    dataset_name: str = "financial-approval-eval",
+    client=None,
+    chunk_size: int = EVAL_UPLOAD_CHUNK,
+    concurrency: int = EVAL_UPLOAD_CONCURRENCY,
+    max_retries: int = EVAL_UPLOAD_RETRIES,
+    backoff: float = EVAL_UPLOAD_BACKOFF,
+    manifest_path: Optional[str] = EVAL_UPLOAD_MANIFEST,
+    check_remote: bool = True,
+    description: str = "Financial approval evaluation cases",
+) -> UploadReport:
+    """
+    Upload cases to a LangSmith dataset in concurrent, retried chunks.
+
+    Args:
+        dataset: Iterable of {"input", "expected"} cases (may be a generator)
+        dataset_name: LangSmith dataset name; created if it does not exist
+        client: langsmith.Client (default: langsmith.Client())
+        chunk_size: Examples per create_examples() call
+        concurrency: Chunks in flight
+        max_retries: Retries per chunk for transient errors
+        backoff: Base delay in seconds, doubled on every retry
+        manifest_path: Resume manifest; None to keep no manifest
+        check_remote: List the dataset's examples first and skip those present
+        description: Description for a newly created dataset
+
+    Returns:
+        UploadReport with the dataset ID and counters
+
+    Raises:
+        ValueError: If the dataset is empty
+        langsmith.utils.LangSmithError: If a chunk still fails after its
+            retries; chunks that finished are in the manifest
+    """
+    cases = iter(dataset)
+    first = next(cases, None)
+    if first is None:
+        raise ValueError("Cannot upload an empty dataset")
+
+    if client is None:
+        import langsmith
+        client = langsmith.Client()
+
+    start = time.perf_counter()
+    created = not client.has_dataset(dataset_name=dataset_name)
+    if created:
+        remote = client.create_dataset(dataset_name, description=description)
+    else:
+        remote = client.read_dataset(dataset_name=dataset_name)
+    dataset_id = str(remote.id)
+    report = UploadReport(dataset_id=dataset_id)
+
+    manifest = UploadManifest(manifest_path) if manifest_path else None
+    present = manifest.hashes(dataset_name, dataset_id) if manifest else set()
+    if check_remote and not created:
+        present.update(_stored_hash(example) for example in client.list_examples(dataset_id=dataset_id))
+
+    def pending():
+        for test_case in chain([first], cases):
+            digest = example_hash(test_case)
+            if digest in present:
+                report.skipped += 1
+                continue
+            present.add(digest)
+            yield digest, test_case
+
+    failure = None
+
+    def collect(done) -> None:
+        # Runs on the calling thread, so the manifest needs no lock.
+        nonlocal failure
+        for future in done:
+            try:
+                retries, already_present = future.result()
+            except Exception as e:
+                failure = failure or e
+                continue
+            report.retries += retries
+            report.uploaded += len(future.chunk) - already_present
+            report.skipped += already_present
+            report.chunks += 1
+            if manifest:
+                manifest.record(dataset_name, dataset_id, [digest for digest, _ in future.chunk])
+
+    workers = max(int(concurrency), 1)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ls-upload") as pool:
+            in_flight = set()
+            for chunk in shards(pending(), chunk_size):
+                if len(in_flight) >= workers * SHARDS_IN_FLIGHT:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                if failure is not None:
+                    break
+                future = pool.submit(_upload_chunk, client, dataset_id, chunk, max_retries, backoff)
+                future.chunk = chunk
+                in_flight.add(future)
+            collect(wait(in_flight).done)
+    finally:
+        if manifest:
+            manifest.compact()
+
+    if failure is not None:
+        raise failure
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dataset", help="JSONL, gzip-JSONL or Parquet dataset to upload")
+    parser.add_argument("--name", default="financial-approval-eval", help="LangSmith dataset name")
+    parser.add_argument("--chunk-size", type=int, default=EVAL_UPLOAD_CHUNK, help="examples per request")
+    parser.add_argument("--concurrency", type=int, default=EVAL_UPLOAD_CONCURRENCY, help="requests in flight")
+    parser.add_argument("--manifest", default=EVAL_UPLOAD_MANIFEST, help="resume manifest path")
+    parser.add_argument("--no-remote-check", action="store_true",
+                        help="do not list existing examples before uploading")
+    args = parser.parse_args()
+
+    report = upload_dataset(
+        load_dataset(args.dataset),
+        args.name,
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        manifest_path=args.manifest,
+        check_remote=not args.no_remote_check,
+    )
+    print(f"  Dataset {args.name} ({report.dataset_id})")
+    print(f"  Uploaded {report.uploaded} examples in {report.chunks} chunks, "
+          f"skipped {report.skipped} already present, {report.retries} retries, {report.elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Persistent cache for evaluator scores.
+
+Re-running an evaluation after changing one evaluator used to re-score
+every case with every evaluator, including the slow LLM judges.
+EvalResultCache stores each score in SQLite, keyed by a blake2b hash of
+
+  (evaluator name, evaluator version, canonical inputs, outputs, reference)
+
+The evaluator version hashes the source of the factory and of the
+evaluator it returns. Editing an evaluator therefore invalidates only
+that evaluator's entries. Helpers shared between evaluators are not
+part of the version. After changing one, run with --no-cache or clear
+the cache. Inputs are canonicalized as sorted-key JSON, so dict order
+does not matter. Only real scores are stored. Errors and unimplemented
+evaluators are retried on the next run.
+
+    cache = EvalResultCache()
+    version = evaluator_version(evaluator, factory)
+    score = cache.get("approval_path", version, inputs, outputs, reference)
+    if score is None:
+        ...
+        cache.put_many([("approval_path", version, inputs, outputs, reference, score)])
+    cache.info()   # hits, misses, writes, hit_rate, size
+
+This file is GIVEN — students do not modify it.
+"""
+
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from backend.config import EVAL_CACHE_DB
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS eval_results (
+    key TEXT PRIMARY KEY,
+    evaluator TEXT NOT NULL,
+    version TEXT NOT NULL,
+    score REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eval_results_evaluator ON eval_results (evaluator);
+"""
+
+
+def canonical_json(value) -> str:
+    """Key-order-independent JSON encoding (non-JSON values fall back to str)."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _source(obj) -> str:
+    if not (inspect.isfunction(obj) or inspect.ismethod(obj) or inspect.isclass(obj)):
+        obj = type(obj)
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        code = getattr(obj, "__code__", None)
+        return repr((code.co_code, code.co_consts)) if code is not None else repr(obj)
+
+
+def evaluator_version(*objs: Callable) -> str:
+    """Short digest of the source of an evaluator (and the factory that built it)."""
+    source = "\n".join(_source(obj) for obj in objs if obj is not None)
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def result_key(name: str, version: str, inputs: dict, outputs: dict, reference_outputs: dict) -> str:
+    raw = canonical_json([name, version, inputs, outputs, reference_outputs])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EvalResultCache:
+    """
+    SQLite-backed store of evaluator scores.
+
+    Args:
+        path: SQLite database path (":memory:" for a process-local cache)
+    """
+
+    def __init__(self, path: str = EVAL_CACHE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def get(self, name: str, version: str, inputs: dict, outputs: dict, reference_outputs: dict) -> Optional[float]:
+        """Cached score, or None on a miss."""
+        key = result_key(name, version, inputs, outputs, reference_outputs)
+        with self._lock:
+            row = self._conn.execute("SELECT score FROM eval_results WHERE key = ?", (key,)).fetchone()
+            self.stats["hits" if row is not None else "misses"] += 1
+        return row[0] if row is not None else None
+
+    def put_many(self, entries: Iterable[tuple]) -> int:
+        """Store (name, version, inputs, outputs, reference_outputs, score) tuples; returns rows written."""
+        now = time.time()
+        rows = [
+            (result_key(name, version, inputs, outputs, reference), name, version, float(score), now)
+            for name, version, inputs, outputs, reference, score in entries
+            if score is not None
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO eval_results (key, evaluator, version, score, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self.stats["writes"] += len(rows)
+        return len(rows)
+
+    def clear(self, evaluator: Optional[str] = None) -> None:
+        """Remove every entry, or only one evaluator's."""
+        with self._lock:
+            if evaluator is None:
+                self._conn.execute("DELETE FROM eval_results")
+            else:
+                self._conn.execute("DELETE FROM eval_results WHERE evaluator = ?", (evaluator,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM eval_results").fetchone()[0]
+
+    def info(self) -> dict:
+        """Counters plus hit_rate and the number of stored scores."""
+        info = dict(self.stats)
+        lookups = info["hits"] + info["misses"]
+        info["hit_rate"] = info["hits"] / lookups if lookups else 0.0
+        info["size"] = len(self)
+        return info
+
+
+def lookup_cases(
+    cache: EvalResultCache,
+    evaluators: dict[str, Optional[Callable]],
+    versions: dict[str, str],
+    cases: list[tuple[dict, dict, dict]],
+    pending: Optional[dict[str, list[int]]] = None,
+) -> tuple[dict[str, list], dict[str, list[int]]]:
+    """
+    Serve what the cache has for every (evaluator, case) pair.
+
+    ``pending`` restricts the lookups to {name: [case indices]}.
+
+    Returns:
+        Tuple of ({name: [cached score or None per case]},
+                  {name: [case indices still to score]})
+    """
+    cached, missing = {}, {}
+    for name, evaluator in evaluators.items():
+        cached[name] = [None] * len(cases)
+        if evaluator is None:
+            continue
+        indices = range(len(cases)) if pending is None else pending.get(name, ())
+        for idx in indices:
+            cached[name][idx] = cache.get(name, versions[name], *cases[idx])
+        missing[name] = [idx for idx in indices if cached[name][idx] is None]
+    return cached, missing
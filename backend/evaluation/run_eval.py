@@ -3,18 +3,27 @@ Evaluation runner for the Financial Approval System.
 
 Runs the evaluation pipeline using LangSmith to measure
 risk assessment accuracy and approval consistency.
+
+Scores are cached on disk per (evaluator version, case); pass --no-cache
+to score everything again. --dataset streams cases from a JSONL,
+gzip-JSONL or Parquet file instead of EVAL_DATASET (see dataset_loader.py).
 """
 
+import argparse
 import os
+from collections.abc import Sized
 from backend.config import LANGSMITH_API_KEY, LANGSMITH_PROJECT
 from backend.evaluation.dataset import EVAL_DATASET
+from backend.evaluation.dataset_loader import add_dataset_arguments, dataset_from_args
+from backend.evaluation.result_cache import EvalResultCache, evaluator_version
+from backend.evaluation.sharding import ScoreAccumulator
 from backend.evaluation.evaluators import (
     create_risk_accuracy_evaluator,
     create_approval_consistency_evaluator,
 )
 
 
-def run_evaluation():
+def run_evaluation(dataset=None, use_cache=True, cache=None):
     """
     Run the evaluation pipeline.
 
@@ -23,6 +32,11 @@ def run_evaluation():
     2. Creates evaluator instances
     3. Runs each test case through the approval workflow
     4. Collects and reports scores
+
+    Args:
+        dataset: Iterable of {"input", "expected"} cases; defaults to EVAL_DATASET.
+        use_cache: Serve unchanged (evaluator, case) scores from the result cache.
+        cache: EvalResultCache to use; defaults to one backed by EVAL_CACHE_DB.
     """
     if not LANGSMITH_API_KEY:
         print("Warning: LANGSMITH_API_KEY not set. Running in local-only mode.")
@@ -33,19 +47,29 @@ def run_evaluation():
     risk_evaluator = create_risk_accuracy_evaluator()
     consistency_evaluator = create_approval_consistency_evaluator()
 
-    print(f"Running evaluation with {len(EVAL_DATASET)} test cases...")
+    if dataset is None:
+        dataset = EVAL_DATASET
+    size = len(dataset) if isinstance(dataset, Sized) else "streamed"
+    print(f"Running evaluation with {size} test cases...")
     print(f"LangSmith project: {LANGSMITH_PROJECT}")
     print("=" * 60)
 
-    risk_scores = []
-    consistency_scores = []
+    risk_scores = ScoreAccumulator()
+    consistency_scores = ScoreAccumulator()
 
     evaluators = [
         ("Risk", risk_evaluator, lambda exp: {"risk_level": exp["risk_level"]}, risk_scores),
         ("Consistency", consistency_evaluator, lambda exp: {"status": exp["status"]}, consistency_scores),
     ]
 
-    for i, test_case in enumerate(EVAL_DATASET):
+    if use_cache:
+        cache = cache if cache is not None else EvalResultCache()
+        versions = {
+            "Risk": evaluator_version(create_risk_accuracy_evaluator, risk_evaluator),
+            "Consistency": evaluator_version(create_approval_consistency_evaluator, consistency_evaluator),
+        }
+
+    for i, test_case in enumerate(dataset):
         inputs = test_case["input"]
         expected = test_case["expected"]
 
@@ -56,26 +80,46 @@ def run_evaluation():
         print(f"  Expected status: {expected['status']}")
 
         for name, evaluator, make_outputs, scores in evaluators:
+            outputs = make_outputs(expected)
+            if use_cache:
+                score = cache.get(name, versions[name], inputs, outputs, expected)
+                if score is not None:
+                    scores.add(score)
+                    print(f"  {name} evaluator score: {score} (cached)")
+                    continue
             try:
                 result = evaluator(
                     inputs=inputs,
-                    outputs=make_outputs(expected),
+                    outputs=outputs,
                     reference_outputs=expected,
                 )
-                scores.append(result.get("score", 0))
+                scores.add(result.get("score", 0))
                 print(f"  {name} evaluator score: {result.get('score', 'N/A')}")
+                if use_cache:
+                    cache.put_many([(name, versions[name], inputs, outputs, expected, result.get("score", 0))])
             except NotImplementedError:
                 print(f"  {name} evaluator: NOT IMPLEMENTED")
             except Exception as e:
                 print(f"  {name} evaluator error: {e}")
 
     print("\n" + "=" * 60)
-    if risk_scores:
-        print(f"Average risk accuracy: {sum(risk_scores) / len(risk_scores):.2f}")
-    if consistency_scores:
-        print(f"Average consistency: {sum(consistency_scores) / len(consistency_scores):.2f}")
+    if risk_scores.count:
+        print(f"Average risk accuracy: {risk_scores.mean:.2f}")
+    if consistency_scores.count:
+        print(f"Average consistency: {consistency_scores.mean:.2f}")
+    if use_cache:
+        info = cache.info()
+        print(f"Result cache: {info['hits']} hits, {info['misses']} misses ({info['hit_rate']:.0%})")
     print("Evaluation complete.")
 
 
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+    run_evaluation(dataset_from_args(args, EVAL_DATASET), use_cache=not args.no_cache)
+
+
 if __name__ == "__main__":
-    run_evaluation()
+    main()
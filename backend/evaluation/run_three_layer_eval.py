@@ -5,15 +5,68 @@ Imports all evaluator factories, runs them against a dataset,
 and prints a report card grouped by layer. Supports both
 LangSmith-hosted and local evaluation modes.
 
+With --parallel, heuristic evaluators run on a thread pool and the
+LLM-backed ones run concurrently under a concurrency cap and rate limit
+(see backend/evaluation/parallel.py). Scores are identical either way.
+
+Scores are cached on disk per (evaluator version, case), so a re-run only
+scores evaluators or cases that changed (see result_cache.py). The
+report card shows the cache hit rate; --no-cache scores everything.
+
+With --incremental, a manifest of the last run's case hashes, evaluator
+versions and scores decides which pairs to score at all; the rest are
+merged in from the manifest (see incremental.py).
+
+With --graph, outputs come from running each case through the approval
+graph (or the demo graph) on a process pool instead of from expected;
+per-case graph latency is reported next to the scores (see
+graph_runner.py).
+
+With --sharded, large datasets are split into shards scored on a process
+pool; per-evaluator mean and variance are merged from streaming
+accumulators instead of score lists (see sharding.py).
+
+Any iterable dataset can be passed in; --dataset streams a JSONL,
+gzip-JSONL or Parquet file with optional filters and sampling (see
+dataset_loader.py).
+
+Usage:
+    python -m backend.evaluation.run_three_layer_eval [--dataset cases.jsonl.gz]
+        [--risk high] [--department engineering] [--sample 0.1] [--limit N]
+        [--parallel] [--no-cache]
+        [--incremental] [--manifest eval_manifest.json]
+        [--graph auto|approval|demo] [--graph-workers 4]
+        [--sharded] [--shard-workers 4] [--shard-size 500]
+        [--workers 4] [--llm-concurrency 4] [--rate-limit 0]
+
 This file is GIVEN — students do not modify it.
 """
 
+import argparse
 import os
 import sys
+import time
+from collections.abc import Sequence, Sized
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
+from backend.config import (
+    EVAL_GRAPH_WORKERS,
+    EVAL_LLM_CONCURRENCY,
+    EVAL_LLM_RATE_LIMIT,
+    EVAL_MANIFEST,
+    EVAL_MAX_WORKERS,
+    EVAL_SHARD_SIZE,
+    EVAL_SHARD_WORKERS,
+    EVAL_STREAM_CHUNK,
+)
 from backend.evaluation.dataset import EVAL_DATASET
+from backend.evaluation.dataset_loader import add_dataset_arguments, dataset_from_args
+from backend.evaluation.graph_runner import GRAPH_KINDS, run_cases
+from backend.evaluation.incremental import EvalManifest, case_hash, case_ids
+from backend.evaluation.parallel import score_cases
+from backend.evaluation.result_cache import EvalResultCache, evaluator_version, lookup_cases
+from backend.evaluation.sharding import ScoreAccumulator, score_sharded, shards
 from backend.evaluation.three_layer_evaluators import (
     create_approval_path_evaluator,
     create_false_positive_evaluator,
@@ -84,13 +137,170 @@ def _run_evaluator(evaluator, inputs, outputs, reference_outputs):
         return None
 
 
-def run_three_layer_evaluation(dataset=None):
+def _build_outputs(expected):
+    """Outputs dict for a test case.
+
+    In a real setup this comes from running the agent. For scaffolding
+    evaluation, we use expected as a stand-in for outputs.
+    """
+    return {
+        "status": expected.get("status", ""),
+        "risk_level": expected.get("risk_level", ""),
+        "approval_path": expected.get("approval_path", []),
+        "human_reviews": expected.get("human_reviews", 0),
+        "decisions": expected.get("decisions", [
+            {"stage": stage, "decision": "approved", "reasoning": "Auto-generated"}
+            for stage in expected.get("approval_path", [])
+        ]),
+    }
+
+
+def _score_per_case(
+    dataset,
+    evaluators,
+    parallel,
+    max_workers,
+    llm_concurrency,
+    llm_rate_limit,
+    use_cache,
+    cache,
+    incremental,
+    manifest_path,
+    graph,
+    graph_workers,
+):
+    """
+    Score every (evaluator, case) pair, in dataset order.
+
+    Returns:
+        Tuple of (per_case scores, graph results or None,
+        cache info or None, incremental stats or None)
+    """
+    graph_results = None
+    if graph is not None:
+        start = time.perf_counter()
+        graph_results = run_cases(dataset, graph=graph, workers=graph_workers)
+        used = graph_results[0]["graph"] if graph_results else graph
+        print(f"  Ran {len(dataset)} cases through the {used} graph in {time.perf_counter() - start:.2f}s")
+        outputs = [result["outputs"] for result in graph_results]
+    else:
+        outputs = [_build_outputs(test_case["expected"]) for test_case in dataset]
+
+    cases = [
+        (test_case["input"], case_outputs, test_case["expected"])
+        for test_case, case_outputs in zip(dataset, outputs)
+    ]
+
+    versions = {
+        name: evaluator_version(EVALUATOR_REGISTRY[name][0], evaluator)
+        for name, evaluator in evaluators.items()
+        if evaluator is not None
+    }
+    pending = None
+    reused = []
+
+    # Reuse last run's scores for unchanged (case, evaluator version) pairs
+    if incremental:
+        manifest = EvalManifest(manifest_path)
+        # Graph outputs are part of the case: a graph change re-scores it.
+        hashes = [
+            case_hash(test_case if graph is None else {**test_case, "outputs": case_outputs})
+            for test_case, case_outputs in zip(dataset, outputs)
+        ]
+        ids = case_ids(dataset, hashes)
+        prior, pending = manifest.plan(ids, hashes, versions)
+        reused.append(prior)
+
+    # Serve unchanged (evaluator, case) pairs from the result cache
+    if use_cache:
+        cache = cache if cache is not None else EvalResultCache()
+        cached, pending = lookup_cases(cache, evaluators, versions, cases, pending)
+        reused.append(cached)
+
+    # Collect scores per evaluator across all test cases, in dataset order
+    per_case = score_cases(
+        evaluators, cases, _run_evaluator,
+        parallel=parallel,
+        max_workers=max_workers,
+        llm_concurrency=llm_concurrency,
+        llm_rate_limit=llm_rate_limit,
+        pending=pending,
+    )
+
+    if use_cache:
+        cache.put_many(
+            (name, versions[name], *cases[idx], per_case[name][idx])
+            for name, indices in pending.items()
+            for idx in indices
+        )
+    for earlier in reused:
+        for name, scores in earlier.items():
+            per_case[name] = [e if e is not None else s for e, s in zip(scores, per_case[name])]
+    if incremental:
+        manifest.update(ids, hashes, versions, per_case)
+        manifest.save()
+    return (
+        per_case,
+        graph_results,
+        cache.info() if use_cache else None,
+        dict(manifest.stats) if incremental else None,
+    )
+
+
+def run_three_layer_evaluation(
+    dataset=None,
+    parallel=False,
+    max_workers=EVAL_MAX_WORKERS,
+    llm_concurrency=EVAL_LLM_CONCURRENCY,
+    llm_rate_limit=EVAL_LLM_RATE_LIMIT,
+    sharded=False,
+    shard_workers=EVAL_SHARD_WORKERS,
+    shard_size=EVAL_SHARD_SIZE,
+    use_cache=True,
+    cache=None,
+    incremental=False,
+    manifest_path=EVAL_MANIFEST,
+    graph=None,
+    graph_workers=EVAL_GRAPH_WORKERS,
+):
     """
     Run all three-layer evaluators against the dataset.
 
     Args:
-        dataset: list[dict] with "input" and "expected" keys.
+        dataset: list[dict] with "input" and "expected" keys, or any
+                 iterable of them (e.g. dataset_loader.load_dataset).
+                 Non-list iterables are scored in chunks of
+                 EVAL_STREAM_CHUNK cases in constant memory, except in
+                 graph and incremental modes, which read them fully.
                  Defaults to EVAL_DATASET from dataset.py.
+        parallel: Score concurrently instead of one call at a time.
+        max_workers: Thread pool size for heuristic evaluators.
+        llm_concurrency: Maximum LLM evaluator calls in flight.
+        llm_rate_limit: Maximum LLM evaluator calls per second (0 = unlimited).
+        sharded: Score shards of the dataset on a process pool and merge
+                 streaming mean/variance accumulators. Raises ValueError
+                 with graph, incremental, parallel or an explicit cache;
+                 warns that the result cache and llm_rate_limit are not
+                 used by the workers.
+        shard_workers: Worker processes for sharded scoring.
+        shard_size: Cases per shard.
+        use_cache: Serve unchanged (evaluator, case) pairs from the result cache.
+        cache: EvalResultCache to use; defaults to one backed by EVAL_CACHE_DB.
+        incremental: Score only cases and evaluators changed since the
+                     run recorded in the manifest, and update it.
+        manifest_path: Manifest file for incremental runs.
+        graph: Run each case through "auto", "approval" or "demo" graph
+               to produce outputs; None uses expected as a stand-in.
+        graph_workers: Worker processes for graph runs.
+
+    Returns:
+        dict with per-evaluator averages ("scores") and standard
+        deviations ("stddev"), the number of cases ("n_cases"),
+        per-layer averages ("layers"), the
+        overall score ("overall"), result cache counters ("cache"),
+        incremental counters ("incremental") and, with a graph,
+        per-case latency and mean score ("cases"); None where nothing
+        was scored or the feature is off.
     """
     if dataset is None:
         dataset = EVAL_DATASET
@@ -99,7 +309,7 @@ def run_three_layer_evaluation(dataset=None):
     print("=" * 50)
     print("  Three-Layer Evaluation Framework")
     print("=" * 50)
-    print(f"  Dataset: {len(dataset)} test cases")
+    print(f"  Dataset: {len(dataset)} test cases" if isinstance(dataset, Sized) else f"  Dataset: streamed ({dataset!r})")
     print()
 
     evaluators = _instantiate_evaluators()
@@ -109,32 +319,50 @@ def run_three_layer_evaluation(dataset=None):
     print(f"  Evaluators: {implemented}/{total} implemented")
     print()
 
-    # Collect scores per evaluator across all test cases
-    all_scores = {name: [] for name in EVALUATOR_REGISTRY}
-
-    for i, test_case in enumerate(dataset):
-        inputs = test_case["input"]
-        expected = test_case["expected"]
-
-        # Build outputs dict — in a real setup this comes from running the agent.
-        # For scaffolding evaluation, we use expected as a stand-in for outputs.
-        outputs = {
-            "status": expected.get("status", ""),
-            "risk_level": expected.get("risk_level", ""),
-            "approval_path": expected.get("approval_path", []),
-            "human_reviews": expected.get("human_reviews", 0),
-            "decisions": expected.get("decisions", [
-                {"stage": stage, "decision": "approved", "reasoning": "Auto-generated"}
-                for stage in expected.get("approval_path", [])
-            ]),
-        }
-
-        for name, evaluator in evaluators.items():
-            if evaluator is None:
-                continue
-            score = _run_evaluator(evaluator, inputs, outputs, expected)
-            if score is not None:
-                all_scores[name].append(score)
+    streamed = not isinstance(dataset, Sequence)
+    if streamed and not sharded and (graph is not None or incremental):
+        dataset = list(dataset)  # per-case graph and incremental modes need every case at once
+        streamed = False
+
+    start = time.perf_counter()
+    per_case = graph_results = cache_info = incremental_stats = None
+    if sharded:
+        if graph is not None or incremental or parallel or cache is not None:
+            raise ValueError(
+                "Sharded evaluation does not combine with graph, incremental, parallel or cached runs"
+            )
+        # Workers score without the result cache or the async lane's limits.
+        if use_cache:
+            print("  Warning: sharded runs do not read or update the result cache")
+        if llm_rate_limit:
+            print(f"  Warning: the LLM rate limit is not applied to sharded runs; "
+                  f"up to {shard_workers} LLM evaluator calls run at once")
+        totals, n_cases = score_sharded(dataset, workers=shard_workers, shard_size=shard_size)
+        mode = f"sharded, {shard_workers} processes"
+    elif streamed:
+        # Score fixed-size chunks and keep only the accumulators: constant memory.
+        if use_cache and cache is None:
+            cache = EvalResultCache()
+        totals, n_cases = {}, 0
+        for chunk in shards(dataset, EVAL_STREAM_CHUNK):
+            chunk_scores, _, _, _ = _score_per_case(
+                chunk, evaluators, parallel, max_workers, llm_concurrency, llm_rate_limit,
+                use_cache, cache, False, manifest_path, None, graph_workers,
+            )
+            for name, scores in chunk_scores.items():
+                totals.setdefault(name, ScoreAccumulator()).merge(ScoreAccumulator.from_scores(scores))
+            n_cases += len(chunk)
+        cache_info = cache.info() if use_cache else None
+        mode = f"streamed, {'parallel' if parallel else 'serial'}"
+    else:
+        per_case, graph_results, cache_info, incremental_stats = _score_per_case(
+            dataset, evaluators, parallel, max_workers, llm_concurrency, llm_rate_limit,
+            use_cache, cache, incremental, manifest_path, graph, graph_workers,
+        )
+        totals = {name: ScoreAccumulator.from_scores(scores) for name, scores in per_case.items()}
+        n_cases = len(dataset)
+        mode = "parallel" if parallel else "serial"
+    print(f"  Scored {n_cases} cases in {time.perf_counter() - start:.2f}s ({mode})")
 
     # --- Report card ---
     print()
@@ -143,15 +371,28 @@ def run_three_layer_evaluation(dataset=None):
     print("\u2550" * 50)
 
     layer_scores = {1: [], 2: [], 3: []}
+    report = {
+        "scores": {},
+        "layers": {},
+        "overall": None,
+        "stddev": {},
+        "n_cases": n_cases,
+        "cache": cache_info,
+        "incremental": incremental_stats,
+        "cases": None,
+    }
 
     for name, (_, layer, pts) in EVALUATOR_REGISTRY.items():
-        scores = all_scores[name]
-        if scores:
-            avg = sum(scores) / len(scores)
+        acc = totals.get(name)
+        if acc is not None and acc.count:
+            avg = acc.mean
             layer_scores[layer].append(avg)
-            status = f"{avg:.2f}"
+            status = f"{avg:.2f}  (sd {acc.stddev:.2f}, n={acc.count})"
+            report["stddev"][name] = acc.stddev
         else:
+            avg = None
             status = "NOT IMPLEMENTED"
+        report["scores"][name] = avg
         print(f"  {name:30s}  {status}")
 
     print()
@@ -165,17 +406,89 @@ def run_three_layer_evaluation(dataset=None):
             overall_scores.append(avg)
             print(f"  Layer {layer_num} - {LAYER_NAMES[layer_num]:25s} {avg:.2f}")
         else:
+            avg = None
             print(f"  Layer {layer_num} - {LAYER_NAMES[layer_num]:25s} N/A")
+        report["layers"][layer_num] = avg
 
     print("\u2500" * 50)
     if overall_scores:
         overall = sum(overall_scores) / len(overall_scores)
+        report["overall"] = overall
         print(f"  {'Overall Score':36s} {overall:.2f}")
     else:
         print(f"  {'Overall Score':36s} N/A (no evaluators implemented)")
+    if report["cache"] is not None:
+        info = report["cache"]
+        print(
+            f"  Result cache: {info['hits']} hits, {info['misses']} misses "
+            f"({info['hit_rate']:.0%}), {info['size']} stored"
+        )
+    else:
+        print("  Result cache: off")
+    if report["incremental"] is not None:
+        info = report["incremental"]
+        print(
+            f"  Incremental: {info['changed']} changed pairs, {info['reused']} reused, "
+            f"{info['removed']} removed cases"
+        )
+
+    if graph_results is not None:
+        print("\u2500" * 50)
+        print(f"  {'Case':20s} {'Latency':>10s}  {'Score':>6s}")
+        report["cases"] = []
+        for idx, (case_id, result) in enumerate(zip(case_ids(dataset), graph_results)):
+            scores = [per_case[name][idx] for name in per_case if per_case[name][idx] is not None]
+            score = sum(scores) / len(scores) if scores else None
+            report["cases"].append({"id": case_id, "latency_ms": result["latency_ms"], "score": score})
+            shown = f"{score:.2f}" if score is not None else "N/A"
+            print(f"  {case_id:20s} {result['latency_ms']:8.1f}ms  {shown:>6s}")
+        latencies = sorted(result["latency_ms"] for result in graph_results)
+        if latencies:
+            print(
+                f"  Graph latency p50 {latencies[len(latencies) // 2]:.1f}ms, "
+                f"max {latencies[-1]:.1f}ms"
+            )
     print("\u2550" * 50)
     print()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--parallel", action="store_true", help="score evaluators concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    parser.add_argument("--incremental", action="store_true", help="score only changes since the last manifest")
+    parser.add_argument("--manifest", default=EVAL_MANIFEST, help="manifest file for --incremental")
+    parser.add_argument("--graph", nargs="?", const="auto", choices=GRAPH_KINDS,
+                        help="derive outputs by running the approval graph (default: auto)")
+    parser.add_argument("--graph-workers", type=int, default=EVAL_GRAPH_WORKERS, help="graph worker processes")
+    parser.add_argument("--sharded", action="store_true",
+                        help="score dataset shards on a process pool (no result cache or rate limit)")
+    parser.add_argument("--shard-workers", type=int, default=EVAL_SHARD_WORKERS, help="sharded worker processes")
+    parser.add_argument("--shard-size", type=int, default=EVAL_SHARD_SIZE, help="cases per shard")
+    parser.add_argument("--workers", type=int, default=EVAL_MAX_WORKERS, help="heuristic evaluator threads")
+    parser.add_argument("--llm-concurrency", type=int, default=EVAL_LLM_CONCURRENCY,
+                        help="LLM evaluator calls in flight")
+    parser.add_argument("--rate-limit", type=float, default=EVAL_LLM_RATE_LIMIT,
+                        help="LLM evaluator calls per second (0 = unlimited)")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+    run_three_layer_evaluation(
+        dataset_from_args(args, EVAL_DATASET),
+        parallel=args.parallel,
+        max_workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        llm_rate_limit=args.rate_limit,
+        use_cache=not args.no_cache,
+        incremental=args.incremental,
+        manifest_path=args.manifest,
+        graph=args.graph,
+        graph_workers=args.graph_workers,
+        sharded=args.sharded,
+        shard_workers=args.shard_workers,
+        shard_size=args.shard_size,
+    )
 
 
 if __name__ == "__main__":
-    run_three_layer_evaluation()
+    main()
@@ -9,6 +9,8 @@ Part 2: Safety Guardrails (10 points from this file)
 
 import re
 
+from backend.guardrails.verdict_cache import verdict_cache
+
 # --- GIVEN: PII detection patterns ---
 PII_PATTERNS = {
     "ssn": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
@@ -18,6 +20,9 @@ PII_PATTERNS = {
 }
 
 
+# GIVEN: repeat checks of the same text are served from a verdict cache
+# that resets itself when PII_PATTERNS changes.
+@verdict_cache(PII_PATTERNS)
 def sanitize_output(text: str) -> str:
     """
     Remove PII and sensitive information from output text.
@@ -30,6 +35,10 @@ def sanitize_output(text: str) -> str:
       - "phone": replace matches with "***-***-XXXX"
     - Return the sanitized text
 
+    Optional: PII_REDACTOR.redact(text) from backend.guardrails.redaction
+    applies all four masks in one scan (import it inside the function:
+    redaction.py imports PII_PATTERNS from this module).
+
     Args:
         text: Output text that may contain PII
 
@@ -53,6 +62,8 @@ def mask_financial_details(text: str) -> str:
     - Use re.sub with a replacement function for dollar amounts
     - Pattern for dollars: r'\$[\d,]+\.?\d*'
     - Pattern for account numbers: r'\b\d{8,}\b'
+    - Optional: OUTPUT_REDACTOR.redact(text) in backend.guardrails.redaction
+      masks PII, dollar amounts and account numbers in a single scan
 
     Args:
         text: Text containing financial details
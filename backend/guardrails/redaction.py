@@ -0,0 +1,145 @@
+"""
+Single-pass PII and financial-detail redaction for the output guardrails.
+
+sanitize_output() masks the four PII_PATTERNS one re.sub at a time and
+mask_financial_details() adds two more passes, so each summary is
+rescanned and copied six times. RedactionEngine fuses the rules into
+one regex of named groups with a dispatch table mapping each group to
+its replacement, and runs it in a single left-to-right scan.
+
+CPython's re engine tries every branch of an alternation at every
+position, which makes a bare fused regex no faster than six passes. The
+scan therefore jumps between trigger characters (a digit, "@" or "$";
+every rule's match contains one) and runs the fused regex only on the
+whitespace-delimited region around each trigger. No rule matches across
+whitespace, except a card's single separator between two digits, so
+regions cover every possible match.
+
+Precedence is the order of the alternation. At any position the first
+rule that matches wins, so longer or more specific shapes go first:
+a 16-digit card is masked as a card before phone can claim its first
+ten digits, and a 10-digit phone before the account-number rule. On
+ordinary text this gives the same output as the sequential passes
+(benchmarks/bench_redaction.py checks it); where two shapes overlap,
+say an SSN directly followed by "@host.com", one mask replaces the
+whole span instead of two masks nesting.
+
+    from backend.guardrails.redaction import OUTPUT_REDACTOR, PII_REDACTOR
+    PII_REDACTOR.redact(summary)     # same masks as sanitize_output's spec
+    OUTPUT_REDACTOR.redact(summary)  # ... plus mask_financial_details'
+
+This file is GIVEN — students do not modify it.
+"""
+
+import re
+from collections import Counter
+from typing import Callable
+
+from backend.guardrails.output_filter import PII_PATTERNS
+
+# Fixed masks from the sanitize_output spec.
+PII_MASKS = {
+    "ssn": "***-**-XXXX",
+    "credit_card": "****-****-****-XXXX",
+    "email": "[EMAIL REDACTED]",
+    "phone": "***-***-XXXX",
+}
+# Patterns from the mask_financial_details hints.
+FINANCIAL_PATTERNS = {
+    "dollar": re.compile(r"\$[\d,]+\.?\d*"),
+    "account": re.compile(r"\b\d{8,}\b"),
+}
+PII_ORDER = ("credit_card", "ssn", "email", "phone")
+OUTPUT_ORDER = PII_ORDER + ("dollar", "account")
+
+# A character every match contains; the ASCII set is ~3x faster to search.
+_TRIGGER = re.compile(r"[\d@$]")
+_ASCII_TRIGGER = re.compile(r"[0-9@$]")
+# From a trigger to the end of its region (digit-whitespace-digit joins).
+_REGION_END = re.compile(r"\S*(?:(?<=\d)\s(?=\d)\S*)*")
+
+
+def mask_dollar(amount: str) -> str:
+    """"$45,000.00" -> "$***0.00": keep the tail holding the last 3 digits."""
+    digits = 0
+    for i in range(len(amount) - 1, 0, -1):
+        if amount[i].isdigit():
+            digits += 1
+            if digits == 3:
+                return "$***" + amount[i:]
+    return "$***"
+
+
+def mask_account(number: str) -> str:
+    """Mask all but the last 4 digits."""
+    return "*" * (len(number) - 4) + number[-4:]
+
+
+def _constant(mask: str) -> Callable[[str], str]:
+    return lambda _: mask
+
+
+class RedactionEngine:
+    """
+    One compiled alternation over named rules plus a replacement table.
+
+    ``rules`` maps a rule name to (pattern, replace) in precedence order,
+    where replace takes the matched text and returns its mask. Every
+    pattern must contain a trigger character and must not match
+    whitespace other than between two digits (see the module docstring).
+    """
+
+    def __init__(self, rules: dict[str, tuple[re.Pattern, Callable[[str], str]]]):
+        self.names = tuple(rules)
+        self.patterns = {name: pattern for name, (pattern, _) in rules.items()}
+        self._replace = {name: replace for name, (_, replace) in rules.items()}
+        self.regex = re.compile("|".join(f"(?P<{name}>{pattern.pattern})" for name, (pattern, _) in rules.items()))
+
+    def _sub(self, match: re.Match) -> str:
+        return self._replace[match.lastgroup](match.group())
+
+    def redact(self, text: str) -> str:
+        """Mask every rule's matches in one scan."""
+        if not text:
+            return text
+        search = (_ASCII_TRIGGER if text.isascii() else _TRIGGER).search
+        trigger = search(text)
+        if trigger is None:
+            return text
+        out, last = [], 0
+        while trigger is not None:
+            start = trigger.start()
+            while start > last:
+                # Walk back to the region start: whitespace ends it unless
+                # it separates two digits.
+                if not text[start - 1].isspace():
+                    start -= 1
+                elif start >= 2 and text[start - 2].isdecimal() and text[start].isdecimal():
+                    start -= 1
+                else:
+                    break
+            end = _REGION_END.match(text, trigger.start()).end()
+            out.append(text[last:start])
+            out.append(self.regex.sub(self._sub, text[start:end]))
+            last = end
+            trigger = search(text, end)
+        out.append(text[last:])
+        return "".join(out)
+
+    def counts(self, text: str) -> Counter:
+        """How many matches of each rule ``text`` contains (for audits and tests)."""
+        return Counter(match.lastgroup for match in self.regex.finditer(text or ""))
+
+
+def _rules(order: tuple) -> dict:
+    rules = {}
+    for name in order:
+        if name in PII_MASKS:
+            rules[name] = (PII_PATTERNS[name], _constant(PII_MASKS[name]))
+        else:
+            rules[name] = (FINANCIAL_PATTERNS[name], mask_dollar if name == "dollar" else mask_account)
+    return rules
+
+
+PII_REDACTOR = RedactionEngine(_rules(PII_ORDER))
+OUTPUT_REDACTOR = RedactionEngine(_rules(OUTPUT_ORDER))
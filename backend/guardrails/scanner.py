@@ -0,0 +1,166 @@
+"""
+Compiled blocked-pattern scanner for the input guardrails.
+
+PatternScanner is built once from BLOCKED_PATTERNS. It scans all the
+text fields of a request together: each field is lowercased once and
+the fields are joined with a NUL separator, so no pattern can match
+across a field boundary. Every occurrence is reported with the field it
+was found in and its position there.
+
+Building the scanner compiles each pattern down to a guard: its rarest
+character (punctuation before uncommon letters before common ones). A
+scan first checks which guards occur at all, a memchr-speed test, and
+runs str.find only for patterns whose guard is present. Most injection
+patterns are guarded by a character like "<", "'" or "=" that ordinary
+request text rarely contains, so clean text skips most searches.
+CPython's re module tries each branch of an alternation at every
+position, so one combined regex measures several times slower than
+these C-level searches (see benchmarks/bench_scanner.py).
+
+    ok, match = BLOCKED_SCANNER.check({"title": t, "description": d})
+    if not ok:
+        ...  # f"Blocked content detected in {match.field}: suspicious pattern"
+
+This file is GIVEN — students do not modify it.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import NamedTuple, Optional, Sequence, Union
+
+from backend.guardrails.input_validator import BLOCKED_PATTERNS
+
+FIELD_SEPARATOR = "\x00"
+# Characters of typical request text, most frequent first; anything not
+# listed (most punctuation) counts as rarer than all of them.
+_CHAR_FREQUENCY = " etaoinsrhldcumfpgwybv,.kxjqz0123456789-:()'"
+
+
+def _rarity(char: str) -> int:
+    idx = _CHAR_FREQUENCY.find(char)
+    return len(_CHAR_FREQUENCY) if idx < 0 else idx
+
+
+class PatternMatch(NamedTuple):
+    """One blocked-pattern occurrence; start/end index the lowercased field."""
+    field: str
+    pattern: str
+    start: int
+    end: int
+
+
+class PatternScanner:
+    """Case-insensitive multi-pattern scanner over one or more named fields."""
+
+    def __init__(self, patterns: list[str]):
+        # Lowercased and de-duplicated, longest first so overlapping
+        # patterns report the most specific one first at a position.
+        self.patterns = tuple(sorted(dict.fromkeys(p.lower() for p in patterns), key=len, reverse=True))
+        if any(FIELD_SEPARATOR in p or not p for p in self.patterns):
+            raise ValueError("Patterns must be non-empty and must not contain the field separator")
+        guards: dict[str, list[str]] = {}
+        for pattern in self.patterns:
+            guards.setdefault(max(pattern, key=_rarity), []).append(pattern)
+        self._guards = tuple((guard, tuple(group)) for guard, group in guards.items())
+        self._byte_guards = tuple(
+            (guard.encode(), tuple(p.encode() for p in group)) for guard, group in self._guards
+        )
+
+    def _candidates(self, text: str):
+        """Patterns whose guard character occurs in ``text``."""
+        for guard, group in self._guards:
+            if guard in text:
+                yield from group
+
+    def _prepare(self, fields: Union[str, dict[str, str]]) -> tuple[list[str], list[int], str]:
+        if isinstance(fields, str):
+            fields = {"text": fields}
+        names = list(fields)
+        lowered = [(fields[name] or "").lower() for name in names]
+        starts, offset = [], 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+        return names, starts, FIELD_SEPARATOR.join(lowered)
+
+    def scan(self, fields: Union[str, dict[str, str]]) -> list[PatternMatch]:
+        """Every occurrence of every pattern, ordered by field then position."""
+        names, starts, text = self._prepare(fields)
+        found = []
+        for pattern in self._candidates(text):
+            pos = text.find(pattern)
+            while pos != -1:
+                idx = bisect_right(starts, pos) - 1
+                start = pos - starts[idx]
+                found.append((idx, start, PatternMatch(names[idx], pattern, start, start + len(pattern))))
+                pos = text.find(pattern, pos + 1)
+        found.sort(key=lambda item: item[:2])
+        return [match for _, _, match in found]
+
+    def first(self, fields: Union[str, dict[str, str]]) -> Optional[PatternMatch]:
+        """The earliest occurrence (by field order, then position), or None."""
+        names, starts, text = self._prepare(fields)
+        best = -1
+        best_pattern = None
+        for pattern in self._candidates(text):
+            # Once something matched, only an earlier start can win.
+            pos = text.find(pattern, 0, best + len(pattern) - 1) if best >= 0 else text.find(pattern)
+            if pos != -1:
+                best, best_pattern = pos, pattern
+        if best_pattern is None:
+            return None
+        idx = bisect_right(starts, best) - 1
+        start = best - starts[idx]
+        return PatternMatch(names[idx], best_pattern, start, start + len(best_pattern))
+
+    def matching_rows(self, texts: Sequence[str]) -> list[int]:
+        """
+        Indices of the texts (one column of many rows) that contain any pattern.
+
+        The column is joined and lowercased once and each candidate pattern
+        is searched once over the whole column (see rows_in_buffer).
+        """
+        texts = [text or "" for text in texts]
+        joined = "".join(texts)
+        text = joined.lower()
+        if len(text) != len(joined):
+            # Some character's lowercase form has a different length.
+            texts = [t.lower() for t in texts]
+            text = "".join(texts)
+        return self.rows_in_buffer(text, [0, *accumulate(map(len, texts))])
+
+    def rows_in_buffer(self, text: Union[str, bytes], offsets: Sequence[int]) -> list[int]:
+        """
+        Rows of a concatenated, already lowercased column that contain any pattern.
+
+        Row i is text[offsets[i]:offsets[i + 1]]; ``text`` may be a str or
+        UTF-8 bytes with byte offsets (e.g. an Arrow string array's data
+        buffer). Hits straddling two rows are ignored; after a real hit
+        the search skips to the next row.
+        """
+        guards = self._byte_guards if isinstance(text, (bytes, bytearray)) else self._guards
+        last = len(offsets) - 2
+        rows = set()
+        for guard, group in guards:
+            if guard not in text:
+                continue
+            for pattern in group:
+                pos = text.find(pattern)
+                while pos != -1:
+                    row = bisect_right(offsets, pos) - 1
+                    if pos + len(pattern) > offsets[row + 1]:
+                        pos = text.find(pattern, pos + 1)
+                        continue
+                    rows.add(row)
+                    if row >= last:
+                        break
+                    pos = text.find(pattern, offsets[row + 1])
+        return sorted(rows)
+
+    def check(self, fields: Union[str, dict[str, str]]) -> tuple[bool, Optional[PatternMatch]]:
+        """(True, None) when clean, else (False, first match)."""
+        match = self.first(fields)
+        return match is None, match
+
+
+BLOCKED_SCANNER = PatternScanner(BLOCKED_PATTERNS)
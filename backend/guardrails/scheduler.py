@@ -0,0 +1,189 @@
+"""
+Cost-aware, short-circuiting scheduler for validation rules.
+
+validate_request's checks differ in cost by orders of magnitude. The
+amount, department and title-length checks are O(1). The three
+blocked-pattern scans walk up to 2,000 characters each. RuleScheduler
+runs the cheap rules first, in their declared order, and stops at the
+first failure. The expensive rules run after them, in an order learned
+from traffic: every run records each rule's calls, rejections and time.
+Every ``reorder_every`` runs, the expensive rules are re-sorted by
+expected cost per rejection (mean seconds / rejection rate). That is
+the order that minimizes expected time for independent filters. A rule
+that often rejects cheaply moves to the front.
+
+    ok, message = VALIDATION_SCHEDULER.run({
+        "amount": 1200.0, "department": "engineering",
+        "title": ..., "description": ..., "justification": ...,
+    })
+    VALIDATION_SCHEDULER.report()   # per-rule calls, rejections, time
+
+With adaptive ordering, a request failing several expensive rules
+reports whichever of them runs first. The cheap rules always report in
+validate_request's order.
+
+This file is GIVEN — students do not modify it.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from backend.config import BUDGET_CEILING, VALID_DEPARTMENTS
+from backend.guardrails.input_validator import MAX_TITLE_LENGTH
+from backend.guardrails.scanner import BLOCKED_SCANNER
+
+VALID_MESSAGE = "Request validated successfully"
+REORDER_EVERY = 256
+
+
+@dataclass(slots=True)
+class Rule:
+    """One validation rule: check(request) returns a failure message or None."""
+    name: str
+    check: Callable[[dict], Optional[str]]
+    cheap: bool = True
+
+
+@dataclass(slots=True)
+class RuleStats:
+    calls: int = 0
+    rejections: int = 0
+    seconds: float = 0.0
+
+    def expected_cost(self) -> float:
+        """Mean seconds per call divided by the (smoothed) rejection rate."""
+        if not self.calls:
+            return 0.0
+        return (self.seconds / self.calls) / ((self.rejections + 1) / (self.calls + 2))
+
+
+class RuleScheduler:
+    """Runs rules cheap-first with short-circuit; reorders expensive rules by observed cost."""
+
+    def __init__(self, rules: list[Rule], adaptive: bool = True, reorder_every: int = REORDER_EVERY):
+        self.rules = list(rules)
+        self.adaptive = adaptive
+        self.reorder_every = max(int(reorder_every), 1)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear stats and return to the declared order."""
+        with self._lock:
+            self.stats = {rule.name: RuleStats() for rule in self.rules}
+            self.runs = 0
+            self.order = tuple(r for r in self.rules if r.cheap) + tuple(r for r in self.rules if not r.cheap)
+
+    def run(self, request: dict) -> tuple[bool, str]:
+        """(True, VALID_MESSAGE) or (False, message of the first failing rule)."""
+        timings = []
+        message = None
+        clock = time.perf_counter
+        for rule in self.order:
+            start = clock()
+            message = rule.check(request)
+            timings.append((rule.name, clock() - start))
+            if message is not None:
+                break
+        with self._lock:
+            for name, seconds in timings:
+                stats = self.stats[name]
+                stats.calls += 1
+                stats.seconds += seconds
+            if message is not None:
+                self.stats[timings[-1][0]].rejections += 1
+            self.runs += 1
+            if self.adaptive and self.runs % self.reorder_every == 0:
+                self._reorder()
+        return (True, VALID_MESSAGE) if message is None else (False, message)
+
+    def _reorder(self) -> None:
+        cheap = [r for r in self.rules if r.cheap]
+        expensive = sorted(
+            (r for r in self.rules if not r.cheap),
+            key=lambda r: self.stats[r.name].expected_cost(),
+        )
+        self.order = tuple(cheap + expensive)
+
+    def report(self) -> list[dict]:
+        """Per-rule stats in current order, with each rule's share of total time."""
+        with self._lock:
+            total = sum(s.seconds for s in self.stats.values()) or 1.0
+            return [
+                {
+                    "rule": rule.name,
+                    "cheap": rule.cheap,
+                    "calls": self.stats[rule.name].calls,
+                    "rejections": self.stats[rule.name].rejections,
+                    "rejection_rate": self.stats[rule.name].rejections / max(self.stats[rule.name].calls, 1),
+                    "seconds": self.stats[rule.name].seconds,
+                    "mean_us": self.stats[rule.name].seconds / max(self.stats[rule.name].calls, 1) * 1e6,
+                    "time_share": self.stats[rule.name].seconds / total,
+                }
+                for rule in self.order
+            ]
+
+    def render_metrics(self, prefix: str = "guardrail_rule") -> str:
+        """Per-rule counters in Prometheus text format (appended to /metrics)."""
+        rows = self.report()
+        lines = [
+            f"# HELP {prefix}_calls_total Validation rule evaluations.",
+            f"# TYPE {prefix}_calls_total counter",
+        ] + [f'{prefix}_calls_total{{rule="{r["rule"]}"}} {r["calls"]}' for r in rows]
+        lines += [
+            f"# HELP {prefix}_rejections_total Requests rejected by each validation rule.",
+            f"# TYPE {prefix}_rejections_total counter",
+        ] + [f'{prefix}_rejections_total{{rule="{r["rule"]}"}} {r["rejections"]}' for r in rows]
+        lines += [
+            f"# HELP {prefix}_seconds_total Time spent in each validation rule.",
+            f"# TYPE {prefix}_seconds_total counter",
+        ] + [f'{prefix}_seconds_total{{rule="{r["rule"]}"}} {r["seconds"]:.6f}' for r in rows]
+        return "\n".join(lines) + "\n"
+
+
+def _amount_positive(request: dict) -> Optional[str]:
+    return "Amount must be positive" if request["amount"] <= 0 else None
+
+
+def _amount_ceiling(request: dict) -> Optional[str]:
+    if request["amount"] > BUDGET_CEILING:
+        return f"Amount exceeds budget ceiling of ${BUDGET_CEILING:,.2f}"
+    return None
+
+
+_DEPARTMENTS = frozenset(VALID_DEPARTMENTS)
+
+
+def _department(request: dict) -> Optional[str]:
+    department = request["department"]
+    return None if department in _DEPARTMENTS else f"Invalid department: {department}"
+
+
+def _title_length(request: dict) -> Optional[str]:
+    return "Title too long" if len(request["title"]) > MAX_TITLE_LENGTH else None
+
+
+def _blocked(field: str) -> Callable[[dict], Optional[str]]:
+    def check(request: dict) -> Optional[str]:
+        clean, _ = BLOCKED_SCANNER.check(request.get(field) or "")
+        return None if clean else f"Blocked content detected in {field}: suspicious pattern"
+    check.__name__ = f"blocked_{field}"
+    return check
+
+
+def default_validation_rules() -> list[Rule]:
+    """validate_request's rules: four O(1) checks, then one pattern scan per text field."""
+    return [
+        Rule("amount_positive", _amount_positive),
+        Rule("amount_ceiling", _amount_ceiling),
+        Rule("department", _department),
+        Rule("title_length", _title_length),
+        Rule("blocked_title", _blocked("title"), cheap=False),
+        Rule("blocked_description", _blocked("description"), cheap=False),
+        Rule("blocked_justification", _blocked("justification"), cheap=False),
+    ]
+
+
+VALIDATION_SCHEDULER = RuleScheduler(default_validation_rules())
@@ -0,0 +1,218 @@
+"""
+Incremental PII redaction for streamed assistant output.
+
+The AG-UI endpoint streams assistant text to the frontend token by
+token, while sanitize_output() and the redaction engines work on whole
+strings. StreamingRedactor sits in between. Each chunk is appended to a
+small buffer. Everything up to the last character that cannot be part
+of any PII match is redacted and released at once. Only the open tail
+is held back: usually the word being typed, or a digit group that a
+card number could still continue. A tail longer than MAX_HELD_CHARS
+(a long token with no whitespace) is released early, so a stream is
+never held for more than that many characters.
+
+    redactor = StreamingRedactor()
+    for chunk in llm_stream:
+        send(redactor.feed(chunk))
+    send(redactor.flush())
+
+redact_text_events() applies one redactor per message to the
+TEXT_MESSAGE_CONTENT and TEXT_MESSAGE_CHUNK deltas of a stream of AG-UI
+events, and redacts the strings inside MESSAGES_SNAPSHOT, STATE_SNAPSHOT
+and STATE_DELTA events whole (backend/server.py wraps the agent's run()
+with it).
+
+This file is GIVEN — students do not modify it.
+"""
+
+from typing import Any, AsyncIterator
+
+from ag_ui.core import EventType, TextMessageChunkEvent, TextMessageContentEvent
+
+from backend.guardrails.redaction import PII_REDACTOR, RedactionEngine
+
+# Non-alphanumeric characters a PII match can contain (email local part
+# and domain, phone/card/SSN separators, dollar amounts). Letters, digits
+# and "_" count too: \b treats them as word characters.
+MATCH_PUNCTUATION = frozenset("._%+-@$,|")
+# Longest open tail held back. Longer than any real email (254 chars),
+# card or account number, so only runs like hashes or encoded blobs hit it.
+MAX_HELD_CHARS = 256
+
+
+def _can_continue(c: str) -> bool:
+    return c.isalnum() or c in MATCH_PUNCTUATION or c == "_"
+
+
+def open_tail_start(text: str) -> int:
+    """
+    Index where the suffix that could still grow into a match begins.
+
+    Walks back over match characters. Whitespace stops the walk unless
+    it could be a card's separator between two digits; at the very end
+    of the text the next character is unknown, so a digit followed by
+    one whitespace stays open.
+    """
+    i = len(text)
+    while i > 0:
+        c = text[i - 1]
+        if _can_continue(c):
+            i -= 1
+        elif (
+            c.isspace()
+            and i >= 2
+            and text[i - 2].isdecimal()
+            and (i == len(text) or text[i].isdecimal())
+        ):
+            i -= 1
+        else:
+            break
+    return i
+
+
+class StreamingRedactor:
+    """Redacts a chunked stream, holding back only the still-open tail."""
+
+    __slots__ = ("engine", "_pending")
+
+    def __init__(self, engine: RedactionEngine = PII_REDACTOR):
+        self.engine = engine
+        self._pending = ""
+
+    @property
+    def held(self) -> int:
+        """Number of characters currently held back."""
+        return len(self._pending)
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; return the redacted text that is now final (may be "")."""
+        if not chunk:
+            return ""
+        text = self._pending + chunk
+        cut = open_tail_start(text)
+        if len(text) - cut > MAX_HELD_CHARS:
+            cut = self._forced_cut(text, cut)
+        self._pending = text[cut:]
+        return self.engine.redact(text[:cut]) if cut else ""
+
+    def _forced_cut(self, text: str, start: int) -> int:
+        """
+        Cut an over-long open tail down to MAX_HELD_CHARS.
+
+        The cut is moved off any match found in the tail: to the match's
+        start, or past its end when it starts the tail, so a match is
+        never split between the released text and the held text.
+        """
+        cut = len(text) - MAX_HELD_CHARS
+        for match in self.engine.regex.finditer(text, start):
+            if match.start() >= cut:
+                break
+            if match.end() > cut:
+                cut = match.start() if match.start() > start else match.end()
+                break
+        return cut
+
+    def flush(self) -> str:
+        """End of stream: redact and return whatever is still held back."""
+        text, self._pending = self._pending, ""
+        return self.engine.redact(text)
+
+
+def redact_value(value: Any, engine: RedactionEngine = PII_REDACTOR) -> Any:
+    """Copy of a JSON-like value with every string redacted (keys are kept)."""
+    if isinstance(value, str):
+        return engine.redact(value)
+    if isinstance(value, dict):
+        return {key: redact_value(item, engine) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact_value(item, engine) for item in value]
+    return value
+
+
+def _redact_message(message, engine: RedactionEngine):
+    content = getattr(message, "content", None)
+    if isinstance(content, list):
+        # Multimodal content: only text parts carry text.
+        content = [
+            part.model_copy(update={"text": engine.redact(part.text)})
+            if isinstance(getattr(part, "text", None), str) else part
+            for part in content
+        ]
+    elif content is None:
+        return message
+    else:
+        content = redact_value(content, engine)
+    return message.model_copy(update={"content": content})
+
+
+def _redact_snapshot(event, engine: RedactionEngine):
+    if event.type == EventType.MESSAGES_SNAPSHOT:
+        return event.model_copy(update={"messages": [_redact_message(m, engine) for m in event.messages]})
+    if event.type == EventType.STATE_SNAPSHOT:
+        return event.model_copy(update={"snapshot": redact_value(event.snapshot, engine)})
+    # STATE_DELTA: JSON Patch operations; add/replace/test carry a value.
+    delta = [
+        op.model_copy(update={"value": redact_value(op.value, engine)}) if hasattr(op, "value") else op
+        for op in event.delta
+    ]
+    return event.model_copy(update={"delta": delta})
+
+
+_SNAPSHOT_EVENTS = (EventType.MESSAGES_SNAPSHOT, EventType.STATE_SNAPSHOT, EventType.STATE_DELTA)
+
+
+async def redact_text_events(events: AsyncIterator, engine: RedactionEngine = PII_REDACTOR) -> AsyncIterator:
+    """
+    Redact the text and state of an AG-UI event stream.
+
+    Content events, and chunk events after a message's first, are
+    dropped when their text is all held back. A content message's held
+    text is sent as one last content event just before its
+    TEXT_MESSAGE_END. Chunk messages have no end event: one ends at the
+    first event that is not a chunk of the same message, so its held
+    text is sent as one last chunk just before that event (or at the
+    end of the stream). Snapshot and state delta events are redacted
+    whole. Other events pass through unchanged.
+    """
+    redactors: dict[str, StreamingRedactor] = {}
+    chunk_id, chunk_redactor = None, None
+    async for event in events:
+        continues = event.type == EventType.TEXT_MESSAGE_CHUNK and event.message_id in (None, chunk_id)
+        if chunk_redactor is not None and not continues:
+            rest = chunk_redactor.flush()
+            if rest:
+                yield TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id=chunk_id, delta=rest)
+            chunk_id, chunk_redactor = None, None
+
+        if event.type == EventType.TEXT_MESSAGE_CHUNK:
+            first = chunk_redactor is None
+            if first:
+                chunk_id, chunk_redactor = event.message_id, StreamingRedactor(engine)
+            delta = chunk_redactor.feed(event.delta or "")
+            if not delta and not first:
+                continue
+            # The first chunk names the message, so it is sent even if empty.
+            event = event.model_copy(update={"delta": delta or None})
+        elif event.type in _SNAPSHOT_EVENTS:
+            event = _redact_snapshot(event, engine)
+        elif event.type == EventType.TEXT_MESSAGE_CONTENT:
+            redactor = redactors.get(event.message_id)
+            if redactor is None:
+                redactor = redactors[event.message_id] = StreamingRedactor(engine)
+            delta = redactor.feed(event.delta)
+            if not delta:
+                continue
+            event = event.model_copy(update={"delta": delta})
+        elif event.type == EventType.TEXT_MESSAGE_END:
+            redactor = redactors.pop(event.message_id, None)
+            rest = redactor.flush() if redactor is not None else ""
+            if rest:
+                yield TextMessageContentEvent(
+                    type=EventType.TEXT_MESSAGE_CONTENT, message_id=event.message_id, delta=rest,
+                )
+        yield event
+
+    if chunk_redactor is not None:
+        rest = chunk_redactor.flush()
+        if rest:
+            yield TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id=chunk_id, delta=rest)
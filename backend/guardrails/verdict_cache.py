@@ -0,0 +1,153 @@
+"""
+Bounded LRU cache for guardrail verdicts.
+
+The same titles, descriptions and summaries are re-checked on every
+graph replay, resume and evaluation run. verdict_cache() wraps a
+guardrail function so a repeated input returns the stored verdict
+instead of running the check again.
+
+Entries are keyed by a 128-bit content hash of the text (xxh3 when the
+xxhash package is installed, blake2b otherwise), the remaining call
+arguments and a version of the pattern set. The pattern set is
+snapshotted on every call; a cheap tuple comparison detects any change
+(including in-place edits of BLOCKED_PATTERNS or PII_PATTERNS), bumps
+the version and drops the stale entries. Exceptions are never cached.
+
+    @verdict_cache(BLOCKED_PATTERNS)
+    def sanitize_text(text, field_name="text"): ...
+
+    sanitize_text.cache.info()   # hits, misses, hit_rate, size, ...
+
+This file is GIVEN — students do not modify it.
+"""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Union
+
+from backend.config import GUARDRAIL_CACHE_ENTRIES
+
+try:
+    import xxhash
+
+    def content_hash(text: str) -> bytes:
+        return xxhash.xxh3_128_digest(text.encode("utf-8", "surrogatepass"))
+except ImportError:  # xxhash is optional; blake2b is ~10x slower on long text
+    def content_hash(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+_caches: dict[str, "VerdictCache"] = {}
+
+
+def _snapshot(patterns: Union[list, tuple, dict]) -> tuple:
+    """Comparable snapshot of a pattern list or {name: compiled regex} dict."""
+    if isinstance(patterns, dict):
+        return tuple(patterns.items())
+    return tuple(patterns)
+
+
+def pattern_version(patterns: Union[list, tuple, dict]) -> str:
+    """Short stable digest of a pattern set (regexes by source and flags)."""
+    parts = []
+    for item in _snapshot(patterns):
+        if isinstance(item, tuple):
+            name, regex = item
+            item = (name, getattr(regex, "pattern", regex), getattr(regex, "flags", 0))
+        parts.append(repr(item))
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class VerdictCache:
+    """LRU of fn(text, *args) results, invalidated when ``patterns`` changes."""
+
+    def __init__(self, fn: Callable, patterns: Union[list, tuple, dict], max_entries: int = GUARDRAIL_CACHE_ENTRIES):
+        self.fn = fn
+        self.patterns = patterns
+        self.max_entries = max(int(max_entries), 1)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self._seen = _snapshot(patterns)
+        self.version = pattern_version(patterns)
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _check_version(self) -> None:
+        seen = _snapshot(self.patterns)
+        if seen != self._seen:
+            with self._lock:
+                self._seen = seen
+                self.version = pattern_version(self.patterns)
+                self._entries.clear()
+                self.stats["invalidations"] += 1
+
+    def __call__(self, text, *args, **kwargs):
+        if not isinstance(text, str):
+            return self.fn(text, *args, **kwargs)
+        self._check_version()
+        key = (self.version, content_hash(text), args, tuple(sorted(kwargs.items())) if kwargs else ())
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._entries[key]
+            self.stats["misses"] += 1
+        result = self.fn(text, *args, **kwargs)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> dict:
+        """Counters plus hit_rate, current size and pattern version."""
+        with self._lock:
+            info = dict(self.stats)
+            info["size"] = len(self._entries)
+            info["max_entries"] = self.max_entries
+            info["version"] = self.version
+        lookups = info["hits"] + info["misses"]
+        info["hit_rate"] = info["hits"] / lookups if lookups else 0.0
+        return info
+
+
+def verdict_cache(patterns: Union[list, tuple, dict], max_entries: int = GUARDRAIL_CACHE_ENTRIES) -> Callable:
+    """Decorator: cache fn(text, ...) verdicts; the cache is exposed as fn.cache."""
+    def decorate(fn: Callable) -> Callable:
+        cache = VerdictCache(fn, patterns, max_entries)
+
+        @functools.wraps(fn)
+        def cached(text, *args, **kwargs):
+            return cache(text, *args, **kwargs)
+
+        cached.cache = cache
+        _caches[fn.__name__] = cache
+        return cached
+    return decorate
+
+
+def cache_stats() -> dict[str, dict]:
+    """info() of every verdict cache, by guarded function name."""
+    return {name: cache.info() for name, cache in _caches.items()}
+
+
+def render_cache_metrics() -> str:
+    """Verdict cache counters in Prometheus text format (appended to /metrics)."""
+    stats = cache_stats()
+    lines = [
+        "# HELP guardrail_cache_lookups_total Guardrail verdict cache lookups by result.",
+        "# TYPE guardrail_cache_lookups_total counter",
+    ]
+    for name, info in sorted(stats.items()):
+        lines.append(f'guardrail_cache_lookups_total{{function="{name}",result="hit"}} {info["hits"]}')
+        lines.append(f'guardrail_cache_lookups_total{{function="{name}",result="miss"}} {info["misses"]}')
+    lines += [
+        "# HELP guardrail_cache_entries Cached guardrail verdicts.",
+        "# TYPE guardrail_cache_entries gauge",
+    ] + [f'guardrail_cache_entries{{function="{name}"}} {info["size"]}' for name, info in sorted(stats.items())]
+    return "\n".join(lines) + "\n"
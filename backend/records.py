@@ -0,0 +1,197 @@
+"""
+Compact internal records for the Financial Approval System.
+
+The Pydantic models in models.py validate data at the API boundary.
+Inside the workflow the same data moves between nodes, batch helpers
+and checkpoints, where rebuilding and revalidating a model on every hop
+is pure overhead. The slotted dataclasses here carry the same fields
+without validation, and each has a RecordCodec that packs it as a
+positional msgpack array, so field names are not repeated in every
+payload.
+
+Convert at the boundary: Record.validate(data) for untrusted input,
+Record.from_model(model) / record.to_model() for Pydantic interop.
+"""
+
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import Optional
+
+import ormsgpack
+from backend.models import ApprovalDecision, ApprovalResult, FinancialRequest
+
+
+class RecordCodec:
+    """
+    Pre-compiled msgpack codec for one record class.
+
+    Records are encoded as arrays in field order; ``nested`` maps a field
+    name to the codec of the records it holds (a list of records).
+    """
+
+    def __init__(self, cls: type, nested: Optional[dict[str, "RecordCodec"]] = None):
+        self.cls = cls
+        self.names = tuple(f.name for f in fields(cls))
+        self.nested = nested or {}
+        self._getter = attrgetter(*self.names)
+
+    def row(self, record) -> tuple:
+        values = self._getter(record)
+        if not self.nested:
+            return values
+        return tuple(
+            [self.nested[name].row(item) for item in value] if name in self.nested else value
+            for name, value in zip(self.names, values)
+        )
+
+    def from_row(self, row) -> object:
+        if self.nested:
+            row = [
+                [self.nested[name].from_row(item) for item in value] if name in self.nested else value
+                for name, value in zip(self.names, row)
+            ]
+        return self.cls(*row)
+
+    def encode(self, record) -> bytes:
+        return ormsgpack.packb(self.row(record))
+
+    def decode(self, data: bytes):
+        return self.from_row(ormsgpack.unpackb(data))
+
+    def encode_many(self, records: list) -> bytes:
+        return ormsgpack.packb([self.row(r) for r in records])
+
+    def decode_many(self, data: bytes) -> list:
+        return [self.from_row(row) for row in ormsgpack.unpackb(data)]
+
+
+@dataclass(slots=True)
+class RequestRecord:
+    """Internal form of FinancialRequest."""
+    request_id: str
+    title: str
+    description: str
+    amount: float
+    department: str
+    requester: str
+    justification: str
+    priority: str = "normal"
+
+    @classmethod
+    def validate(cls, data: dict) -> "RequestRecord":
+        """Validate untrusted input once, with the Pydantic model."""
+        return cls.from_model(FinancialRequest.model_validate(data))
+
+    @classmethod
+    def from_model(cls, model: FinancialRequest) -> "RequestRecord":
+        return cls(*_REQUEST_FIELDS(model))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RequestRecord":
+        """Build from trusted fields (e.g. ApprovalState) without validation."""
+        return cls(
+            data["request_id"], data["title"], data.get("description", ""), data["amount"],
+            data["department"], data.get("requester", ""), data.get("justification", ""),
+            data.get("priority", "normal"),
+        )
+
+    def to_model(self) -> FinancialRequest:
+        return FinancialRequest.model_construct(**self.to_dict())
+
+    def to_dict(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "title": self.title,
+            "description": self.description,
+            "amount": self.amount,
+            "department": self.department,
+            "requester": self.requester,
+            "justification": self.justification,
+            "priority": self.priority,
+        }
+
+
+@dataclass(slots=True)
+class DecisionRecord:
+    """Internal form of ApprovalDecision (one entry of state["decisions"])."""
+    stage: str
+    approved: bool
+    reviewer: str
+    comments: str = ""
+    timestamp: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, model: ApprovalDecision) -> "DecisionRecord":
+        return cls(*_DECISION_FIELDS(model))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DecisionRecord":
+        return cls(
+            data["stage"], data["approved"], data.get("reviewer", ""),
+            data.get("comments", ""), data.get("timestamp"),
+        )
+
+    def to_model(self) -> ApprovalDecision:
+        return ApprovalDecision.model_construct(**self.to_dict())
+
+    def to_dict(self) -> dict:
+        """Dict entry for the decisions list; timestamp is omitted when unset."""
+        entry = {"stage": self.stage, "approved": self.approved, "reviewer": self.reviewer, "comments": self.comments}
+        if self.timestamp is not None:
+            entry["timestamp"] = self.timestamp
+        return entry
+
+
+@dataclass(slots=True)
+class ResultRecord:
+    """Internal form of ApprovalResult."""
+    request_id: str
+    status: str
+    risk_level: str
+    decisions: list[DecisionRecord] = field(default_factory=list)
+    total_approvals: int = 0
+    total_rejections: int = 0
+    final_comments: str = ""
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ResultRecord":
+        """Summarize a finished ApprovalState; non-review audit entries are skipped."""
+        decisions = [DecisionRecord.from_dict(d) for d in state.get("decisions", []) if "approved" in d]
+        approvals = sum(1 for d in decisions if d.approved)
+        return cls(
+            request_id=state.get("request_id", ""),
+            status=state.get("status", "pending"),
+            risk_level=state.get("risk_level", "medium"),
+            decisions=decisions,
+            total_approvals=approvals,
+            total_rejections=len(decisions) - approvals,
+            final_comments=state.get("final_comments", ""),
+        )
+
+    @classmethod
+    def from_model(cls, model: ApprovalResult) -> "ResultRecord":
+        return cls(
+            model.request_id, model.status.value, model.risk_level.value,
+            [DecisionRecord.from_model(d) for d in model.decisions],
+            model.total_approvals, model.total_rejections, model.final_comments,
+        )
+
+    def to_model(self) -> ApprovalResult:
+        """Validated model for API responses (status and risk_level become enums)."""
+        return ApprovalResult(
+            request_id=self.request_id,
+            status=self.status,
+            risk_level=self.risk_level,
+            decisions=[d.to_model() for d in self.decisions],
+            total_approvals=self.total_approvals,
+            total_rejections=self.total_rejections,
+            final_comments=self.final_comments,
+        )
+
+
+REQUEST_CODEC = RecordCodec(RequestRecord)
+DECISION_CODEC = RecordCodec(DecisionRecord)
+RESULT_CODEC = RecordCodec(ResultRecord, nested={"decisions": DECISION_CODEC})
+
+_REQUEST_FIELDS = attrgetter(*REQUEST_CODEC.names)
+_DECISION_FIELDS = attrgetter(*DECISION_CODEC.names)
@@ -6,13 +6,20 @@ https://docs.copilotkit.ai/langgraph/quickstart?agent=bring-your-own
 """
 
 import os
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from ag_ui_langgraph import add_langgraph_fastapi_endpoint
 from copilotkit import LangGraphAGUIAgent
-from backend.agent.checkpointer import create_checkpointer
-from backend.config import LANGSMITH_API_KEY, LANGSMITH_PROJECT
+from backend.agent.checkpointer import create_async_checkpointer
+from backend.agent.compaction import CompactionWorker
+from backend.agent.metrics import instrument_checkpointer, render_metrics
+from backend.guardrails.streaming import redact_text_events
+from backend.guardrails.scheduler import VALIDATION_SCHEDULER
+from backend.guardrails.verdict_cache import render_cache_metrics
+from backend.config import LANGSMITH_API_KEY, LANGSMITH_PROJECT, CHECKPOINT_COMPACTION_INTERVAL
 
 # Enable LangSmith tracing if configured
 if LANGSMITH_API_KEY:
@@ -20,21 +27,38 @@ if LANGSMITH_API_KEY:
     os.environ["LANGCHAIN_API_KEY"] = LANGSMITH_API_KEY
     os.environ["LANGCHAIN_PROJECT"] = LANGSMITH_PROJECT
 
-# Create checkpointer for interrupt/resume persistence
-checkpointer = create_checkpointer()
-
-# Try the student's graph first; fall back to the demo graph
+# Try the student's graph first; fall back to the demo graph.
+# Graphs are built in async mode: the AG-UI endpoint drives them with
+# astream_events, so async nodes keep the event loop free.
 try:
     from backend.agent.graph import create_approval_graph
-    graph = create_approval_graph(checkpointer=checkpointer)
+    graph = create_approval_graph(async_mode=True)
     print("[server] Loaded student approval graph")
 except Exception as exc:
     from backend.agent.demo_graph import create_demo_graph
-    graph = create_demo_graph(checkpointer=checkpointer)
+    graph = create_demo_graph(async_mode=True)
     print(f"[server] Student graph not ready ({type(exc).__name__}), using demo graph")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The async checkpointer binds to the running event loop, so it is
+    # created here and attached to the compiled graph before serving.
+    checkpointer = await create_async_checkpointer()
+    graph.checkpointer = instrument_checkpointer(checkpointer)
+    # Completed threads are compacted in the background when enabled.
+    compactor = CompactionWorker().start() if CHECKPOINT_COMPACTION_INTERVAL > 0 else None
+    app.state.compactor = compactor
+    try:
+        yield
+    finally:
+        if compactor is not None:
+            compactor.stop(timeout=5)
+        await checkpointer.conn.close()
+
+
 # FastAPI app
-app = FastAPI(title="Financial Approval System")
+app = FastAPI(title="Financial Approval System", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -44,10 +68,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint: node latency, LLM tokens, checkpoint bytes, interrupt dwell, guardrails, compaction."""
+    body = render_metrics() + render_cache_metrics() + VALIDATION_SCHEDULER.render_metrics()
+    compactor = getattr(app.state, "compactor", None)
+    if compactor is not None:
+        body += compactor.render_metrics()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
+class RedactingAGUIAgent(LangGraphAGUIAgent):
+    """LangGraphAGUIAgent whose streamed text, message snapshots and state are PII-redacted on the fly."""
+
+    async def run(self, input):
+        async for event in redact_text_events(super().run(input)):
+            yield event
+
+
 # Attach the LangGraph agent as an AG-UI endpoint (official CopilotKit pattern)
 add_langgraph_fastapi_endpoint(
     app=app,
-    agent=LangGraphAGUIAgent(
+    agent=RedactingAGUIAgent(
         name="approval_agent",
         description="Financial approval workflow agent",
         graph=graph,
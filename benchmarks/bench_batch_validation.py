@@ -0,0 +1,115 @@
+"""
+Batch guardrail validation benchmark.
+
+Pre-screens N synthetic historical requests two ways:
+
+  per-row — the validate_request rules from the input_validator
+            docstrings, called once per request
+  batch   — validate_requests_batch() on list columns
+  arrow   — validate_requests_batch() on pyarrow string columns
+
+and checks all three produce the same messages.
+
+Usage:
+    python -m benchmarks.bench_batch_validation [--rows 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+from backend.config import BUDGET_CEILING, VALID_DEPARTMENTS
+from backend.guardrails.batch_validation import VALID_MESSAGE, validate_requests_batch
+from backend.guardrails.input_validator import BLOCKED_PATTERNS, MAX_TITLE_LENGTH
+
+WORDS = (
+    "budget server upgrade team quarterly license cloud migration (Q3) vendor: "
+    "renewal, 3 seats. laptops for new hires; annual conference travel"
+).split()
+
+
+def dataset(rows: int, seed: int = 0) -> dict:
+    """Columnar requests; ~1% carry a blocked pattern, some fail other rules."""
+    rng = random.Random(seed)
+
+    def text(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    data = {
+        "amounts": np.array([rng.uniform(-1_000, 120_000) for _ in range(rows)]),
+        "departments": [rng.choice(VALID_DEPARTMENTS + ["legal"]) for _ in range(rows)],
+        "titles": [text(rng.randint(2, 40)) for _ in range(rows)],
+        "descriptions": [text(30) for _ in range(rows)],
+        "justifications": [text(20) for _ in range(rows)],
+    }
+    for i in rng.sample(range(rows), rows // 100):
+        column = rng.choice(["titles", "descriptions", "justifications"])
+        data[column][i] += " " + rng.choice(BLOCKED_PATTERNS).upper()
+    return data
+
+
+def _per_row(amount, department, title, description, justification) -> str:
+    if amount <= 0:
+        return "Amount must be positive"
+    if amount > BUDGET_CEILING:
+        return f"Amount exceeds budget ceiling of ${BUDGET_CEILING:,.2f}"
+    if department not in VALID_DEPARTMENTS:
+        return f"Invalid department: {department}"
+    if len(title) > MAX_TITLE_LENGTH:
+        return "Title too long"
+    for name, text in (("title", title), ("description", description), ("justification", justification)):
+        lowered = text.lower()
+        if any(pattern in lowered for pattern in BLOCKED_PATTERNS):
+            return f"Blocked content detected in {name}: suspicious pattern"
+    return VALID_MESSAGE
+
+
+def run(rows: int = 100_000) -> dict:
+    """Return {method: seconds} plus the number of rejected rows."""
+    data = dataset(rows)
+    columns = [data["amounts"], data["departments"], data["titles"], data["descriptions"], data["justifications"]]
+    results = {}
+
+    start = time.perf_counter()
+    expected = [_per_row(*row) for row in zip(data["amounts"].tolist(), *columns[1:])]
+    results["per-row"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    valid, messages = validate_requests_batch(*columns)
+    results["batch"] = time.perf_counter() - start
+    assert messages == expected
+
+    try:
+        import pyarrow as pa
+        arrow = [columns[0]] + [pa.array(col) for col in columns[1:]]
+        start = time.perf_counter()
+        _, arrow_messages = validate_requests_batch(*arrow)
+        results["arrow"] = time.perf_counter() - start
+        assert arrow_messages == expected
+    except ImportError:
+        pass
+
+    results["rejected"] = int((~valid).sum())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="requests to validate")
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    print(f"Batch validation benchmark: {args.rows:,} requests, {results.pop('rejected'):,} rejected")
+    print("-" * 64)
+    for method, seconds in results.items():
+        print(f"  {method:8s} {seconds * 1000:8.1f}ms  {args.rows / seconds:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
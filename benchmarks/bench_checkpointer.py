@@ -0,0 +1,141 @@
+"""
+Checkpoint throughput benchmark.
+
+Drives the demo graph on many concurrent approval threads and reports
+checkpoints written per second for:
+
+  baseline       — plain SqliteSaver on one shared sqlite3 connection
+  tuned          — create_checkpointer(): WAL pragmas + reader pool
+  async_baseline — AsyncSqliteSaver with default pragmas
+  async_tuned    — create_async_checkpointer()
+
+Usage:
+    python -m benchmarks.bench_checkpointer [--threads 32] [--requests 400]
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import aiosqlite
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.types import Command
+
+from backend.agent.checkpointer import create_checkpointer, create_async_checkpointer
+from backend.agent.demo_graph import create_demo_graph
+
+# Alternate low-risk (no interrupt) and medium-risk (one interrupt) requests.
+AMOUNTS = [2_500.0, 25_000.0]
+
+
+def _request(i: int) -> dict:
+    return {
+        "request_id": f"BENCH-{i:05d}",
+        "title": "Benchmark request",
+        "amount": AMOUNTS[i % len(AMOUNTS)],
+        "department": "engineering",
+        "messages": [],
+    }
+
+
+def _count_checkpoints(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+
+def _run_sync(graph, i: int) -> None:
+    config = {"configurable": {"thread_id": f"t{i}"}}
+    result = graph.invoke(_request(i), config)
+    if result.get("__interrupt__"):
+        graph.invoke(Command(resume={"approved": True, "comments": ""}), config)
+    graph.get_state(config)
+
+
+async def _run_async(graph, i: int) -> None:
+    config = {"configurable": {"thread_id": f"t{i}"}}
+    result = await graph.ainvoke(_request(i), config)
+    if result.get("__interrupt__"):
+        await graph.ainvoke(Command(resume={"approved": True, "comments": ""}), config)
+    await graph.aget_state(config)
+
+
+def bench_sync(path: str, saver, threads: int, requests: int) -> dict:
+    graph = create_demo_graph(checkpointer=saver)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda i: _run_sync(graph, i), range(requests)))
+    elapsed = time.perf_counter() - start
+    written = _count_checkpoints(path)
+    return {"seconds": elapsed, "checkpoints": written, "checkpoints_per_sec": written / elapsed}
+
+
+async def bench_async(path: str, saver, concurrency: int, requests: int) -> dict:
+    graph = create_demo_graph(checkpointer=saver, async_mode=True)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await _run_async(graph, i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    written = _count_checkpoints(path)
+    return {"seconds": elapsed, "checkpoints": written, "checkpoints_per_sec": written / elapsed}
+
+
+def run(threads: int = 32, requests: int = 400) -> dict:
+    """Run every mode against a fresh database; returns {mode: stats}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "baseline.db")
+        conn = sqlite3.connect(path, check_same_thread=False)
+        results["baseline"] = bench_sync(path, SqliteSaver(conn), threads, requests)
+        conn.close()
+
+        path = os.path.join(tmp, "tuned.db")
+        saver = create_checkpointer(path)
+        results["tuned"] = bench_sync(path, saver, threads, requests)
+        saver.close()
+
+        async def async_modes():
+            path = os.path.join(tmp, "async_baseline.db")
+            async with aiosqlite.connect(path) as conn:
+                results["async_baseline"] = await bench_async(path, AsyncSqliteSaver(conn), threads, requests)
+
+            path = os.path.join(tmp, "async_tuned.db")
+            saver = await create_async_checkpointer(path)
+            try:
+                results["async_tuned"] = await bench_async(path, saver, threads, requests)
+            finally:
+                await saver.conn.close()
+
+        asyncio.run(async_modes())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32, help="concurrent approval threads")
+    parser.add_argument("--requests", type=int, default=400, help="requests per mode")
+    args = parser.parse_args()
+
+    print(f"Checkpoint throughput: {args.requests} requests, {args.threads} concurrent threads")
+    print("-" * 64)
+    for mode, stats in run(args.threads, args.requests).items():
+        print(
+            f"  {mode:16s} {stats['checkpoints']:6d} checkpoints  "
+            f"{stats['seconds']:7.2f}s  {stats['checkpoints_per_sec']:9.1f} ckpt/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Checkpoint compaction benchmark.
+
+Fills a database with completed demo-graph threads, runs one
+compact_checkpoints() pass and reports database size and latest-
+checkpoint lookup latency before and after.
+
+Usage:
+    python -m benchmarks.bench_compaction [--requests 1000] [--keep-last 1]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.agent.checkpointer import create_checkpointer
+from backend.agent.compaction import compact_checkpoints
+from backend.agent.demo_graph import create_demo_graph
+from benchmarks.bench_checkpointer import _run_sync
+
+
+def run(requests: int = 1000, keep_last: int = 1) -> dict:
+    """Populate a fresh database, compact it once and return the report."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "compaction.db")
+        saver = create_checkpointer(path)
+        graph = create_demo_graph(checkpointer=saver)
+        for i in range(requests):
+            _run_sync(graph, i)
+        saver.close()
+        return compact_checkpoints(
+            path,
+            keep_last=keep_last,
+            archive_dir=os.path.join(tmp, "archive"),
+            batch_size=requests,
+            full_vacuum=True,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000, help="completed threads to create")
+    parser.add_argument("--keep-last", type=int, default=1, help="checkpoints kept per thread")
+    args = parser.parse_args()
+
+    report = run(args.requests, args.keep_last)
+    print(f"Checkpoint compaction: {args.requests} completed threads, keep_last={args.keep_last}")
+    print("-" * 64)
+    print(f"  threads compacted     {report['threads_compacted']:10d}")
+    print(f"  checkpoints archived  {report['checkpoints_archived']:10d}")
+    print(f"  writes archived       {report['writes_archived']:10d}")
+    print(f"  db size               {report['db_bytes_before'] / 1024:9.1f}K -> {report['db_bytes_after'] / 1024:.1f}K")
+    print(
+        f"  lookup latency        {report['lookup_seconds_before'] * 1e6:9.1f}us -> "
+        f"{report['lookup_seconds_after'] * 1e6:.1f}us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Delta-encoded checkpoint benchmark.
+
+Runs critical-risk demo threads (manager -> finance -> executive, three
+interrupts each) with full and delta-encoded checkpoints and reports:
+
+  bytes/transition — mean stored checkpoint blob size
+  resume latency   — Command(resume=...) per interrupt, measured with a
+                     freshly opened saver so deltas are replayed from disk
+
+Usage:
+    python -m benchmarks.bench_delta_checkpoint [--requests 200] [--snapshot-every 8]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langgraph.types import Command
+
+from backend.agent.checkpointer import DeltaSqliteSaver, PooledSqliteSaver, _connect
+from backend.agent.demo_graph import create_demo_graph
+
+CRITICAL_AMOUNT = 90_000.0
+INTERRUPTS = 3
+APPROVE = {"approved": True, "comments": "Reviewed in benchmark."}
+
+
+def _saver(path: str, delta: bool, snapshot_every: int):
+    if delta:
+        return DeltaSqliteSaver(_connect(path), [], snapshot_every=snapshot_every)
+    return PooledSqliteSaver(_connect(path), [])
+
+
+def _config(i: int) -> dict:
+    return {"configurable": {"thread_id": f"critical-{i}"}}
+
+
+def bench_mode(path: str, delta: bool, requests: int, snapshot_every: int) -> dict:
+    saver = _saver(path, delta, snapshot_every)
+    graph = create_demo_graph(checkpointer=saver)
+    for i in range(requests):
+        graph.invoke(
+            {"title": "Critical purchase", "amount": CRITICAL_AMOUNT, "department": "engineering", "messages": []},
+            _config(i),
+        )
+    saver.close()
+
+    latencies = []
+    for _ in range(INTERRUPTS):
+        # A fresh saver per round: nothing is cached, as after a restart.
+        saver = _saver(path, delta, snapshot_every)
+        graph = create_demo_graph(checkpointer=saver)
+        for i in range(requests):
+            start = time.perf_counter()
+            graph.invoke(Command(resume=APPROVE), _config(i))
+            latencies.append(time.perf_counter() - start)
+        saver.close()
+
+    with sqlite3.connect(path) as conn:
+        count, total = conn.execute("SELECT COUNT(*), SUM(LENGTH(checkpoint)) FROM checkpoints").fetchone()
+    latencies.sort()
+    return {
+        "checkpoints": count,
+        "bytes_total": total,
+        "bytes_per_transition": total / count,
+        "resume_ms_mean": statistics.fmean(latencies) * 1000,
+        "resume_ms_p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def run(requests: int = 200, snapshot_every: int = 8) -> dict:
+    """Benchmark full and delta checkpoints; returns {mode: stats}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, delta in (("full", False), ("delta", True)):
+            results[mode] = bench_mode(os.path.join(tmp, f"{mode}.db"), delta, requests, snapshot_every)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="critical-risk threads per mode")
+    parser.add_argument("--snapshot-every", type=int, default=8, help="full snapshot cadence for delta mode")
+    args = parser.parse_args()
+
+    print(
+        f"Delta checkpoints: {args.requests} critical threads, {INTERRUPTS} interrupts each, "
+        f"snapshot every {args.snapshot_every}"
+    )
+    print("-" * 64)
+    for mode, stats in run(args.requests, args.snapshot_every).items():
+        print(
+            f"  {mode:6s} {stats['checkpoints']:6d} checkpoints  "
+            f"{stats['bytes_per_transition']:8.0f} B/transition  "
+            f"resume {stats['resume_ms_mean']:6.2f}ms mean  {stats['resume_ms_p95']:6.2f}ms p95"
+        )
+
+
+if __name__ == "__main__":
+    main()
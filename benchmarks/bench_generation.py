@@ -0,0 +1,99 @@
+"""
+Dataset generation benchmark.
+
+Generates N cases from a streaming stand-in chat model with fixed
+time-to-first-token and per-chunk latency, at several concurrency
+levels, and reports wall time, prompts issued and cases dropped as
+duplicates. Each prompt repeats one of its cases, so dedup is exercised.
+
+Usage:
+    python -m benchmarks.bench_generation [--cases 2000] [--concurrency 1,8,32] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.agent.risk_engine import rule_risk_level
+from backend.evaluation.generation_pipeline import generate_dataset
+
+_AMOUNTS = {
+    "low": (1, 10_000),
+    "medium": (10_001, 50_000),
+    "high": (50_001, 100_000),
+    "over_ceiling": (100_001, 1_000_000),
+    "invalid": (-5_000, 0),
+}
+
+
+class StreamingGeneratorLLM:
+    """Answers generation prompts with a JSON array streamed in 32-char chunks."""
+
+    def __init__(self, latency: float, chunk_latency: float = 0.0005):
+        self.latency = latency
+        self.chunk_latency = chunk_latency
+        self.calls = 0
+
+    def _case(self, rng, department, priority, amount):
+        level = rule_risk_level(amount, priority)
+        status = "approved" if 0 < amount <= 100_000 else "rejected"
+        return {
+            "input": {
+                "request_id": "GEN-001", "title": f"{department} request {rng.getrandbits(32):x}",
+                "description": "Synthetic purchase", "amount": amount, "department": department,
+                "requester": "Bench", "justification": "Benchmark", "priority": priority,
+            },
+            "expected": {"risk_level": level, "status": status, "approval_path": [], "human_reviews": 0},
+        }
+
+    async def astream(self, prompt):
+        self.calls += 1
+        rng = random.Random(self.calls)
+        num = int(re.search(r"Generate (\d+)", prompt).group(1))
+        department = re.search(r'department "(\w+)"', prompt).group(1)
+        priority = re.search(r'priority\s+"(\w+)"', prompt).group(1)
+        band = next(name for name, text in (
+            ("over_ceiling", "above $100,000"), ("invalid", "below zero"), ("high", "$50,001"),
+            ("medium", "$10,001"), ("low", "$1 and"),
+        ) if text in prompt)
+        cases = [self._case(rng, department, priority, round(rng.uniform(*_AMOUNTS[band]), 2)) for _ in range(num)]
+        cases[-1] = json.loads(json.dumps(cases[0]))
+        text = json.dumps(cases)
+        await asyncio.sleep(self.latency)
+        for i in range(0, len(text), 32):
+            await asyncio.sleep(self.chunk_latency if i % 1024 == 0 else 0)
+            yield text[i:i + 32]
+
+
+def run(cases: int = 2000, concurrency: list[int] = (1, 8, 32), latency: float = 0.2) -> dict:
+    """Return {concurrency: report}."""
+    return {
+        n: generate_dataset(cases, llm=StreamingGeneratorLLM(latency), concurrency=n, validate=None)
+        for n in concurrency
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=2000, help="cases to generate")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated prompts in flight")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds to first token per prompt")
+    args = parser.parse_args()
+
+    results = run(args.cases, [int(n) for n in args.concurrency.split(",")], args.latency)
+    print(f"Dataset generation benchmark: {args.cases:,} cases, {args.latency * 1000:.0f}ms to first token")
+    print("-" * 64)
+    baseline = next(iter(results.values())).elapsed
+    for n, report in results.items():
+        print(f"  concurrency {n:3d}  {report.elapsed:7.2f}s  ({baseline / report.elapsed:5.1f}x)  "
+              f"{report.prompts} prompts, {report.duplicates} duplicates, {len(report.cases)} cases")
+
+
+if __name__ == "__main__":
+    main()
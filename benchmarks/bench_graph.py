@@ -0,0 +1,260 @@
+"""
+Throughput/latency benchmark for the approval graphs.
+
+Drives create_demo_graph and create_approval_graph with a deterministic
+StubLLM and scripted approvals across all four risk paths (low, medium,
+high, critical), and reports:
+
+  - p50/p95/p99 latency per node (from LangChain callbacks)
+  - checkpoint write time (put + put_writes) p50/p95/p99
+  - end-to-end throughput at each concurrency level
+  - peak RSS of the process
+
+Results are written as JSON (with the git commit) so runs can be
+compared; --compare prints the change against an earlier result file.
+
+Usage:
+    python -m benchmarks.bench_graph [--threads 1,8,32] [--requests 200]
+        [--output benchmarks/results/graph.json] [--compare previous.json]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.types import Command
+
+from backend.agent.checkpointer import PooledSqliteSaver, _connect
+from backend.agent.demo_graph import create_demo_graph
+from backend.agent.graph import create_approval_graph
+from benchmarks.stub_llm import stub_llm
+
+# One request per risk path; amounts are within every department budget
+# except where escalation is part of the path.
+RISK_PATHS = {
+    "low": {"amount": 2_500.0, "priority": "normal"},
+    "medium": {"amount": 25_000.0, "priority": "normal"},
+    "high": {"amount": 60_000.0, "priority": "normal"},
+    "critical": {"amount": 80_000.0, "priority": "urgent"},
+}
+APPROVE = {"approved": True, "comments": "Approved by benchmark."}
+GRAPHS = {"demo": create_demo_graph, "approval": create_approval_graph}
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "results", "graph.json")
+
+
+def percentiles(samples: list[float]) -> dict:
+    """p50/p95/p99 and count of a list of seconds, in milliseconds."""
+    if not samples:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {"count": len(ordered), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Collects wall time of every graph node run (interrupted runs included)."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, tags=None, **kwargs):
+        if any(tag.startswith("graph:step:") for tag in tags or []):
+            self._started[run_id] = (kwargs.get("name"), time.perf_counter())
+
+    def _finish(self, run_id):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            name, start = started
+            with self._lock:
+                self.samples[name].append(time.perf_counter() - start)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+
+class TimedSqliteSaver(PooledSqliteSaver):
+    """PooledSqliteSaver that records how long each checkpoint write takes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_seconds = []
+
+    def put(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().put(*args, **kwargs)
+        finally:
+            self.write_seconds.append(time.perf_counter() - start)
+
+    def put_writes(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().put_writes(*args, **kwargs)
+        finally:
+            self.write_seconds.append(time.perf_counter() - start)
+
+
+def _request(i: int, path: str) -> dict:
+    return {
+        "request_id": f"BENCH-{path}-{i:05d}",
+        "title": f"Benchmark {path} request",
+        "description": "Synthetic request for the graph benchmark.",
+        "amount": RISK_PATHS[path]["amount"],
+        "department": "engineering",
+        "requester": "Benchmark",
+        "justification": "Measuring graph cost.",
+        "priority": RISK_PATHS[path]["priority"],
+        "messages": [],
+    }
+
+
+def run_thread(graph, i: int, path: str, callbacks: list) -> int:
+    """Run one request to completion, approving every interrupt; returns resumes."""
+    config = {"configurable": {"thread_id": f"{path}-{i}"}, "callbacks": callbacks}
+    result = graph.invoke(_request(i, path), config)
+    resumes = 0
+    while result.get("__interrupt__"):
+        result = graph.invoke(Command(resume=APPROVE), config)
+        resumes += 1
+    return resumes
+
+
+def bench_graph(factory, threads: int, requests: int, tmp: str) -> dict:
+    """Benchmark one graph at one concurrency level."""
+    path = os.path.join(tmp, f"{factory.__name__}-{threads}.db")
+    saver = TimedSqliteSaver(_connect(path), [_connect(path) for _ in range(4)])
+    graph = factory(checkpointer=saver)
+    timer = NodeTimer()
+    paths = list(RISK_PATHS)
+    interrupts = defaultdict(int)
+
+    def one(i):
+        risk_path = paths[i % len(paths)]
+        interrupts[risk_path] = run_thread(graph, i, risk_path, [timer])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    saver.close()
+    return {
+        "threads": threads,
+        "requests": requests,
+        "seconds": elapsed,
+        "requests_per_sec": requests / elapsed,
+        "interrupts_per_path": dict(interrupts),
+        "nodes": {name: percentiles(s) for name, s in sorted(timer.samples.items())},
+        "checkpoint_writes": percentiles(saver.write_seconds),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(threads: list[int] = (1, 8, 32), requests: int = 200, graphs: list[str] = tuple(GRAPHS)) -> dict:
+    """Run every graph at every concurrency level; returns the JSON-ready report."""
+    report = {"commit": _git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "graphs": {}}
+    with stub_llm(), tempfile.TemporaryDirectory() as tmp:
+        for name in graphs:
+            try:
+                report["graphs"][name] = [bench_graph(GRAPHS[name], n, requests, tmp) for n in threads]
+            except NotImplementedError as e:
+                report["graphs"][name] = {"skipped": str(e)}
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report["peak_rss_mb"] = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return report
+
+
+def compare(current: dict, previous: dict) -> list[str]:
+    """Lines describing throughput and p95 changes between two reports."""
+    lines = [f"Compared with {previous.get('commit', '?')} ({previous.get('timestamp', '?')}):"]
+    for name, runs in current["graphs"].items():
+        before = previous.get("graphs", {}).get(name)
+        if not isinstance(runs, list) or not isinstance(before, list):
+            continue
+        by_threads = {r["threads"]: r for r in before}
+        for run_ in runs:
+            old = by_threads.get(run_["threads"])
+            if old is None:
+                continue
+            change = (run_["requests_per_sec"] / old["requests_per_sec"] - 1) * 100
+            lines.append(f"  {name:8s} {run_['threads']:3d} threads  throughput {change:+6.1f}%")
+            for node, stats in run_["nodes"].items():
+                old_stats = old["nodes"].get(node)
+                if old_stats and old_stats["p95_ms"] > 0:
+                    delta = (stats["p95_ms"] / old_stats["p95_ms"] - 1) * 100
+                    lines.append(f"      {node:24s} p95 {delta:+6.1f}%")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per concurrency level")
+    parser.add_argument("--graphs", default=",".join(GRAPHS), help="comma-separated: demo,approval")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file")
+    parser.add_argument("--compare", help="earlier JSON results file to compare against")
+    args = parser.parse_args()
+
+    threads = [int(n) for n in args.threads.split(",")]
+    report = run(threads, args.requests, args.graphs.split(","))
+
+    print(f"Graph benchmark @ {report['commit']}: {args.requests} requests per level, 4 risk paths")
+    print("-" * 64)
+    for name, runs in report["graphs"].items():
+        if isinstance(runs, dict):
+            print(f"  {name}: skipped ({runs['skipped']})")
+            continue
+        for run_ in runs:
+            writes = run_["checkpoint_writes"]
+            print(
+                f"  {name:8s} {run_['threads']:3d} threads  {run_['requests_per_sec']:8.1f} req/s  "
+                f"checkpoint write p50 {writes['p50_ms']:.2f}ms p99 {writes['p99_ms']:.2f}ms"
+            )
+        for node, stats in runs[-1]["nodes"].items():
+            print(
+                f"      {node:24s} p50 {stats['p50_ms']:7.3f}ms  p95 {stats['p95_ms']:7.3f}ms  "
+                f"p99 {stats['p99_ms']:7.3f}ms"
+            )
+    print(f"  peak RSS {report['peak_rss_mb']:.1f} MiB")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare(report, json.load(f))))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Three-layer evaluation scoring benchmark.
+
+Scores N test cases with stand-ins for the ten registry evaluators:
+the six heuristic ones take ~0.1ms of Python work, the four LLM-backed
+ones sleep for a simulated round trip. Compares serial scoring with
+score_cases(parallel=True) at a few LLM concurrency limits and checks
+every run returns the same scores.
+
+Usage:
+    python -m benchmarks.bench_parallel_eval [--cases 48] [--latency-ms 50] [--concurrency 1,4,16]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.evaluation.parallel import LLM_EVALUATORS, score_cases
+from backend.evaluation.run_three_layer_eval import EVALUATOR_REGISTRY, _run_evaluator
+
+
+def _evaluators(latency: float) -> dict:
+    def heuristic(inputs, outputs, reference_outputs):
+        total = sum(ord(c) for c in inputs["title"] * 20)
+        return {"score": total % 100 / 100}
+
+    def llm(inputs, outputs, reference_outputs):
+        time.sleep(latency)
+        return {"score": inputs["amount"] % 10 / 10}
+
+    return {name: (llm if name in LLM_EVALUATORS else heuristic) for name in EVALUATOR_REGISTRY}
+
+
+def run(cases: int = 48, latency_ms: float = 50, concurrency: list[int] = (1, 4, 16)) -> dict:
+    """Return {mode: seconds}."""
+    evaluators = _evaluators(latency_ms / 1000)
+    data = [({"title": f"Request {i}", "amount": float(i)}, {}, {}) for i in range(cases)]
+    results = {}
+
+    start = time.perf_counter()
+    expected = score_cases(evaluators, data, _run_evaluator)
+    results["serial"] = time.perf_counter() - start
+
+    for limit in concurrency:
+        start = time.perf_counter()
+        scores = score_cases(evaluators, data, _run_evaluator, parallel=True, llm_concurrency=limit)
+        results[f"parallel/{limit}"] = time.perf_counter() - start
+        assert scores == expected
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=48, help="test cases to score")
+    parser.add_argument("--latency-ms", type=float, default=50, help="simulated LLM round trip")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated LLM concurrency limits")
+    args = parser.parse_args()
+
+    results = run(args.cases, args.latency_ms, [int(c) for c in args.concurrency.split(",")])
+    calls = args.cases * len(EVALUATOR_REGISTRY)
+    print(f"Evaluation scoring benchmark: {args.cases} cases, {calls} evaluator calls, "
+          f"{args.latency_ms:.0f}ms LLM latency")
+    print("-" * 64)
+    for mode, seconds in results.items():
+        speedup = results["serial"] / seconds
+        print(f"  {mode:12s} {seconds * 1000:8.1f}ms  ({speedup:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
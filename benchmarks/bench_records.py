@@ -0,0 +1,95 @@
+"""
+Request/decision record micro-benchmark.
+
+Compares the per-request cost of the Pydantic models in models.py with
+the slotted records in records.py for:
+
+  construct — build from keyword fields
+  hop       — dump to a state dict and rebuild (what every node hop does)
+  serialize — encode + decode (Pydantic JSON vs positional msgpack)
+
+Usage:
+    python -m benchmarks.bench_records [--iterations 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.models import ApprovalResult, FinancialRequest
+from backend.records import REQUEST_CODEC, RESULT_CODEC, RequestRecord, ResultRecord
+from backend.seed_data import SAMPLE_REQUESTS
+
+REQUEST = SAMPLE_REQUESTS[0].model_dump()
+STATE = {
+    "request_id": "REQ-001", "status": "approved", "risk_level": "critical", "final_comments": "",
+    "decisions": [
+        {"stage": "manager_review", "approved": True, "reviewer": "Manager", "comments": "ok"},
+        {"stage": "finance_review", "approved": True, "reviewer": "Finance", "comments": "ok"},
+        {"stage": "final_signoff", "approved": True, "reviewer": "Executive", "comments": ""},
+    ],
+}
+
+
+def _per_op_us(fn, iterations: int) -> float:
+    return min(timeit.repeat(fn, number=iterations, repeat=3)) / iterations * 1e6
+
+
+def run(iterations: int = 20_000) -> dict:
+    """Return {case: {"pydantic": us, "records": us}} plus payload sizes in bytes."""
+    model = FinancialRequest(**REQUEST)
+    record = RequestRecord(**REQUEST)
+    result_model = ApprovalResult(**STATE)
+    result_record = ResultRecord.from_state(STATE)
+    model_json = model.model_dump_json()
+    record_bytes = REQUEST_CODEC.encode(record)
+
+    cases = {
+        "construct request": (
+            lambda: FinancialRequest(**REQUEST),
+            lambda: RequestRecord(**REQUEST),
+        ),
+        "hop request": (
+            lambda: FinancialRequest(**model.model_dump()),
+            lambda: RequestRecord.from_dict(record.to_dict()),
+        ),
+        "serialize request": (
+            lambda: FinancialRequest.model_validate_json(model.model_dump_json()),
+            lambda: REQUEST_CODEC.decode(REQUEST_CODEC.encode(record)),
+        ),
+        "serialize result": (
+            lambda: ApprovalResult.model_validate_json(result_model.model_dump_json()),
+            lambda: RESULT_CODEC.decode(RESULT_CODEC.encode(result_record)),
+        ),
+    }
+    results = {
+        name: {"pydantic": _per_op_us(slow, iterations), "records": _per_op_us(fast, iterations)}
+        for name, (slow, fast) in cases.items()
+    }
+    results["payload bytes"] = {"pydantic": len(model_json), "records": len(record_bytes)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20_000, help="operations per timing run")
+    args = parser.parse_args()
+
+    print(f"Record micro-benchmark: {args.iterations} iterations, best of 3")
+    print("-" * 64)
+    for name, stats in run(args.iterations).items():
+        if name == "payload bytes":
+            print(f"  {name:18s} pydantic {stats['pydantic']:6d} B   records {stats['records']:6d} B")
+        else:
+            speedup = stats["pydantic"] / stats["records"]
+            print(
+                f"  {name:18s} pydantic {stats['pydantic']:6.2f}us  records {stats['records']:6.2f}us  "
+                f"({speedup:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+PII redaction micro-benchmark.
+
+Compares the sequential approach from the output_filter docstrings (one
+re.sub per PII pattern, then two for mask_financial_details) with the
+fused single-scan OUTPUT_REDACTOR from backend/guardrails/redaction.py,
+on approval summaries of several sizes with PII sprinkled through them.
+Both must produce identical output.
+
+The streamed case feeds the same summary to StreamingRedactor in
+4-character chunks (roughly one LLM token each) and reports the cost
+per chunk and how many characters were held back on average.
+
+Usage:
+    python -m benchmarks.bench_redaction [--sizes 1000,4000,16000] [--iterations 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.guardrails.output_filter import PII_PATTERNS
+from backend.guardrails.redaction import FINANCIAL_PATTERNS, OUTPUT_REDACTOR, PII_MASKS, mask_account, mask_dollar
+from backend.guardrails.streaming import StreamingRedactor
+
+CHUNK_CHARS = 4
+
+SENTENCES = [
+    "Manager review approved the request with no comments.",
+    "Finance confirmed the engineering budget has headroom this quarter.",
+    "Executive sign-off is required for critical risk requests.",
+    "Vendor quote attached; delivery expected within 30 days.",
+]
+PII = [
+    "Reach the requester at alice.smith@example.com.",
+    "Call back on 555-123-4567 before Friday.",
+    "Corporate card 4111-1111-1111-1111 was used for the deposit.",
+    "Employee SSN 123-45-6789 is on file with HR.",
+    "Approved amount $45,000.00 from account 12345678901234.",
+]
+
+
+def summary(chars: int, rng: random.Random) -> str:
+    """A synthetic approval summary; roughly one sentence in five has PII."""
+    parts, size = [], 0
+    while size < chars:
+        sentence = rng.choice(PII) if rng.random() < 0.2 else rng.choice(SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def sequential(text: str) -> str:
+    """sanitize_output then mask_financial_details, one pass per pattern."""
+    for name in ("ssn", "credit_card", "email", "phone"):
+        text = PII_PATTERNS[name].sub(PII_MASKS[name], text)
+    text = FINANCIAL_PATTERNS["dollar"].sub(lambda m: mask_dollar(m.group()), text)
+    return FINANCIAL_PATTERNS["account"].sub(lambda m: mask_account(m.group()), text)
+
+
+def fused(text: str) -> str:
+    return OUTPUT_REDACTOR.redact(text)
+
+
+def streamed(text: str) -> str:
+    redactor = StreamingRedactor(OUTPUT_REDACTOR)
+    out = [redactor.feed(text[i:i + CHUNK_CHARS]) for i in range(0, len(text), CHUNK_CHARS)]
+    out.append(redactor.flush())
+    return "".join(out)
+
+
+def _held_back(text: str) -> float:
+    redactor, held = StreamingRedactor(OUTPUT_REDACTOR), []
+    for i in range(0, len(text), CHUNK_CHARS):
+        redactor.feed(text[i:i + CHUNK_CHARS])
+        held.append(redactor.held)
+    return sum(held) / len(held)
+
+
+def _per_op_us(fn, text: str, iterations: int) -> float:
+    return min(timeit.repeat(lambda: fn(text), number=iterations, repeat=3)) / iterations * 1e6
+
+
+def run(sizes: list[int] = (1000, 4000, 16000), iterations: int = 500) -> dict:
+    """Return {size: {"sequential": us, "fused": us, "streamed": us, "chunks": n, "held_chars": mean}}."""
+    rng = random.Random(0)
+    results = {}
+    for size in sizes:
+        text = summary(size, rng)
+        assert sequential(text) == fused(text) == streamed(text)
+        results[size] = {fn.__name__: _per_op_us(fn, text, iterations) for fn in (sequential, fused, streamed)}
+        results[size]["chunks"] = -(-len(text) // CHUNK_CHARS)
+        results[size]["held_chars"] = _held_back(text)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,4000,16000", help="comma-separated summary sizes (chars)")
+    parser.add_argument("--iterations", type=int, default=500, help="summaries per timing run")
+    args = parser.parse_args()
+
+    print(f"Redaction micro-benchmark: {args.iterations} iterations, best of 3")
+    print("-" * 64)
+    for size, stats in run([int(s) for s in args.sizes.split(",")], args.iterations).items():
+        speedup = stats["sequential"] / stats["fused"]
+        print(
+            f"  {size:6d} chars  sequential {stats['sequential']:8.1f}us  "
+            f"fused {stats['fused']:8.1f}us  ({speedup:4.1f}x)"
+        )
+        print(
+            f"  {'':6s}        streamed {stats['streamed'] / stats['chunks']:6.2f}us per {CHUNK_CHARS}-char chunk, "
+            f"{stats['held_chars']:.1f} chars held back on average"
+        )
+
+
+if __name__ == "__main__":
+    main()
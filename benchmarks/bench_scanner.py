@@ -0,0 +1,91 @@
+"""
+Blocked-pattern scanner micro-benchmark.
+
+Compares three ways of screening a request's title, description and
+justification (2,000 chars each by default) against BLOCKED_PATTERNS:
+
+  naive   — per field: lowercase, then `pattern in text` for each pattern
+  regex   — one compiled alternation regex over the joined fields
+  scanner — BLOCKED_SCANNER.check() from backend/guardrails/scanner.py
+
+Each is timed on clean text (the common case: every pattern is searched)
+and on text with a pattern near the end of the last field.
+
+Usage:
+    python -m benchmarks.bench_scanner [--chars 2000] [--iterations 2000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.guardrails.input_validator import BLOCKED_PATTERNS
+from backend.guardrails.scanner import BLOCKED_SCANNER
+
+WORDS = (
+    "budget server upgrade team quarterly license cloud migration operations "
+    "selection tablet evaluation scripted systems update the and for Q3 vendor"
+).split()
+_ALTERNATION = re.compile("|".join(re.escape(p) for p in sorted(BLOCKED_PATTERNS, key=len, reverse=True)))
+
+
+def _field(chars: int, rng: random.Random) -> str:
+    words = []
+    while sum(len(w) + 1 for w in words) < chars:
+        words.append(rng.choice(WORDS))
+    return " ".join(words)[:chars]
+
+
+def naive(fields: dict) -> bool:
+    for text in fields.values():
+        lowered = text.lower()
+        for pattern in BLOCKED_PATTERNS:
+            if pattern in lowered:
+                return False
+    return True
+
+
+def regex(fields: dict) -> bool:
+    return _ALTERNATION.search("\x00".join(fields.values()).lower()) is None
+
+
+def scanner(fields: dict) -> bool:
+    return BLOCKED_SCANNER.check(fields)[0]
+
+
+def _per_op_us(fn, fields: dict, iterations: int) -> float:
+    return min(timeit.repeat(lambda: fn(fields), number=iterations, repeat=3)) / iterations * 1e6
+
+
+def run(chars: int = 2000, iterations: int = 2000) -> dict:
+    """Return {case: {method: us per request}}."""
+    rng = random.Random(0)
+    clean = {name: _field(chars, rng) for name in ("title", "description", "justification")}
+    dirty = dict(clean, justification=clean["justification"][:-20] + " '; -- DROP TABLE x")
+    results = {}
+    for case, fields in (("clean", clean), ("blocked", dirty)):
+        assert naive(fields) == regex(fields) == scanner(fields) == (case == "clean")
+        results[case] = {fn.__name__: _per_op_us(fn, fields, iterations) for fn in (naive, regex, scanner)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chars", type=int, default=2000, help="characters per text field")
+    parser.add_argument("--iterations", type=int, default=2000, help="requests per timing run")
+    args = parser.parse_args()
+
+    print(f"Scanner micro-benchmark: 3 fields x {args.chars} chars, best of 3")
+    print("-" * 64)
+    for case, stats in run(args.chars, args.iterations).items():
+        for method, us in stats.items():
+            print(f"  {case:8s} {method:8s} {us:8.2f}us/request  {1e6 / us:10,.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
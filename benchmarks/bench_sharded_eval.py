@@ -0,0 +1,120 @@
+"""
+Sharded evaluation benchmark.
+
+Scores N synthetic cases with four CPU-bound heuristic evaluators
+(stand-ins for the Layer 1 and Layer 3 factories) three ways:
+
+  serial   — score_cases(), one call at a time, then accumulators
+  threads  — score_cases(parallel=True) on a thread pool
+  sharded  — score_sharded() on a process pool, merged accumulators
+
+and checks all three agree on every evaluator's mean.
+
+Usage:
+    python -m benchmarks.bench_sharded_eval [--cases 20000] [--workers 2,4] [--shard-size 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backend.config import BUDGET_CEILING
+from backend.evaluation.dataset import EVAL_DATASET
+from backend.evaluation.parallel import score_cases
+from backend.evaluation.run_three_layer_eval import _build_outputs, _run_evaluator
+from backend.evaluation.sharding import ScoreAccumulator, score_sharded
+
+REVIEW_STAGES = ("manager_review", "finance_review", "final_signoff")
+
+
+def _approval_path(inputs, outputs, reference_outputs):
+    expected, actual = reference_outputs["approval_path"], outputs["approval_path"]
+    common = sum(1 for a, b in zip(expected, actual) if a == b)
+    return {"score": common / max(len(expected), len(actual), 1)}
+
+
+def _human_reviews(inputs, outputs, reference_outputs):
+    reviews = sum(1 for stage in outputs["approval_path"] if stage in REVIEW_STAGES)
+    return {"score": max(0.0, 1 - abs(reviews - reference_outputs["human_reviews"]) / 3)}
+
+
+def _policy(inputs, outputs, reference_outputs):
+    words = " ".join(inputs[f] for f in ("title", "description", "justification")).lower().split()
+    over = inputs["amount"] > BUDGET_CEILING and outputs["status"] == "approved"
+    return {"score": 0.0 if over else min(1.0, len(set(words)) / 8)}
+
+
+def _audit_trail(inputs, outputs, reference_outputs):
+    decisions = outputs["decisions"]
+    complete = sum(1 for d in decisions if d.get("stage") and d.get("decision") and d.get("reasoning"))
+    return {"score": complete / max(len(decisions), 1)}
+
+
+def evaluators() -> dict:
+    """Picklable factory for the worker processes."""
+    return {
+        "approval_path": _approval_path,
+        "human_review_efficiency": _human_reviews,
+        "policy_adherence": _policy,
+        "audit_trail": _audit_trail,
+    }
+
+
+def dataset(cases: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "input": {**EVAL_DATASET[i % len(EVAL_DATASET)]["input"], "amount": rng.uniform(1, 120_000)},
+            "expected": EVAL_DATASET[i % len(EVAL_DATASET)]["expected"],
+        }
+        for i in range(cases)
+    ]
+
+
+def _means(per_case: dict) -> dict:
+    return {name: ScoreAccumulator.from_scores(scores).mean for name, scores in per_case.items()}
+
+
+def run(cases: int = 20_000, workers: list[int] = (2, 4), shard_size: int = 500) -> dict:
+    """Return {mode: seconds}."""
+    data = dataset(cases)
+    triples = [(tc["input"], _build_outputs(tc["expected"]), tc["expected"]) for tc in data]
+    results = {}
+
+    start = time.perf_counter()
+    expected = _means(score_cases(evaluators(), triples, _run_evaluator))
+    results["serial"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    threaded = _means(score_cases(evaluators(), triples, _run_evaluator, parallel=True))
+    results["threads"] = time.perf_counter() - start
+    assert all(abs(threaded[k] - expected[k]) < 1e-9 for k in expected)
+
+    for n in workers:
+        start = time.perf_counter()
+        totals, _ = score_sharded(data, workers=n, shard_size=shard_size, factory=evaluators)
+        results[f"sharded/{n}"] = time.perf_counter() - start
+        assert all(abs(totals[k].mean - expected[k]) < 1e-9 for k in expected)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=20_000, help="synthetic cases to score")
+    parser.add_argument("--workers", default="2,4", help="comma-separated worker process counts")
+    parser.add_argument("--shard-size", type=int, default=500, help="cases per shard")
+    args = parser.parse_args()
+
+    results = run(args.cases, [int(w) for w in args.workers.split(",")], args.shard_size)
+    print(f"Sharded evaluation benchmark: {args.cases:,} cases x 4 evaluators, {os.cpu_count()} CPUs")
+    print("-" * 64)
+    for mode, seconds in results.items():
+        print(f"  {mode:10s} {seconds * 1000:8.1f}ms  ({results['serial'] / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Deterministic stand-in for the chat model, for benchmarks.
+
+StubLLM answers risk prompts in the RISK_LEVEL:/REASONING: format by
+applying the rule tier to the amount (and "urgent" priority) found in
+the prompt, so every run takes the same risk path with no network
+calls. Replies carry usage_metadata like a real chat model.
+"""
+
+import re
+import sys
+from contextlib import contextmanager
+
+from langchain_core.messages import AIMessage
+from backend import config
+from backend.agent.risk_engine import rule_risk_level
+
+_AMOUNT_RE = re.compile(r"amount[^$\d\n]*\$?\s?([\d,]+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def _prompt_text(messages) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(getattr(m, "content", m)) for m in messages)
+
+
+class StubLLM:
+    """Chat-model stub supporting invoke/ainvoke/batch/abatch."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages, config=None, **kwargs) -> AIMessage:
+        self.calls += 1
+        prompt = _prompt_text(messages)
+        match = _AMOUNT_RE.search(prompt)
+        amount = float(match.group(1).replace(",", "")) if match else 0.0
+        priority = "urgent" if re.search(r"priority:\s*urgent", prompt, re.IGNORECASE) else "normal"
+        level = rule_risk_level(amount, priority)
+        content = f"RISK_LEVEL: {level}\nREASONING: Stub assessment for ${amount:,.2f} ({priority} priority)."
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+            },
+        )
+
+    async def ainvoke(self, messages, config=None, **kwargs) -> AIMessage:
+        return self.invoke(messages, config, **kwargs)
+
+    def batch(self, inputs, config=None, return_exceptions=False, **kwargs) -> list:
+        return [self.invoke(m) for m in inputs]
+
+    async def abatch(self, inputs, config=None, return_exceptions=False, **kwargs) -> list:
+        return self.batch(inputs, config, return_exceptions)
+
+
+@contextmanager
+def stub_llm():
+    """Route every get_llm() in the backend to one StubLLM while active."""
+    stub = StubLLM()
+    original = config.get_llm
+    patched = [
+        module for name, module in list(sys.modules.items())
+        if name.startswith("backend") and getattr(module, "get_llm", None) is original
+    ]
+    for module in patched:
+        module.get_llm = lambda *args, **kwargs: stub
+    try:
+        yield stub
+    finally:
+        for module in patched:
+            module.get_llm = original
@@ -0,0 +1,157 @@
+"""
+Test harness for the async-native graph build.
+
+Verifies async node variants, the async demo graph with interrupt/resume,
+and the AsyncSqliteSaver checkpointer factory without requiring API keys.
+"""
+
+import sys
+import os
+import asyncio
+import inspect
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def check_async_variant_wraps_functions():
+    """async_variant should return coroutine functions that preserve behaviour."""
+    try:
+        from backend.agent.async_nodes import async_variant
+        from backend.agent.demo_graph import demo_route_after_risk, demo_assess
+        router = async_variant(demo_route_after_risk)
+        node = async_variant(demo_assess)
+        ok = (
+            inspect.iscoroutinefunction(router)
+            and inspect.iscoroutinefunction(node)
+            and asyncio.run(router({"risk_level": "low"})) == "demo_validate_budget"
+            and asyncio.run(node({"amount": 500}))["risk_level"] == "low"
+        )
+        print("[PASS] async_variant wraps nodes and routers" if ok else "[FAIL] async_variant")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_async_variant_offloads_blocking_nodes():
+    """Nodes in BLOCKING_NODES should run off the event loop thread."""
+    try:
+        import threading
+        from backend.agent.async_nodes import async_variant
+
+        def assess_risk(state):
+            return {"thread": threading.get_ident()}
+
+        async def main():
+            result = await async_variant(assess_risk)({})
+            return result["thread"] != threading.get_ident()
+
+        ok = asyncio.run(main())
+        print("[PASS] blocking nodes are offloaded" if ok else "[FAIL] blocking node ran on loop thread")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_async_demo_graph_critical_path():
+    """Async demo graph should pause three times and approve a critical request."""
+    try:
+        from langgraph.types import Command
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        import aiosqlite
+        from backend.agent.demo_graph import create_demo_graph
+
+        async def main(db_path):
+            async with aiosqlite.connect(db_path) as conn:
+                graph = create_demo_graph(checkpointer=AsyncSqliteSaver(conn), async_mode=True)
+                config = {"configurable": {"thread_id": "async-critical"}}
+                result = await graph.ainvoke(
+                    {"title": "GPU cluster", "amount": 95000.0, "department": "research", "messages": []},
+                    config,
+                )
+                interrupts = 1 if result.get("__interrupt__") else 0
+                while result.get("__interrupt__"):
+                    result = await graph.ainvoke(Command(resume={"approved": True, "comments": ""}), config)
+                    interrupts += 1 if result.get("__interrupt__") else 0
+                return interrupts, result["status"]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            interrupts, status = asyncio.run(main(os.path.join(tmp, "ckpt.db")))
+        ok = interrupts == 3 and status == "approved"
+        print("[PASS] async demo graph critical path" if ok else f"[FAIL] interrupts={interrupts}, status={status}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_create_async_checkpointer():
+    """create_async_checkpointer should return an AsyncSqliteSaver bound to the loop."""
+    try:
+        from backend.agent.checkpointer import create_async_checkpointer
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        async def main():
+            saver = await create_async_checkpointer()
+            try:
+                return isinstance(saver, AsyncSqliteSaver)
+            finally:
+                await saver.conn.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            import backend.agent.checkpointer as ckpt
+            saved = ckpt.CHECKPOINT_DB
+            ckpt.CHECKPOINT_DB = os.path.join(tmp, "ckpt.db")
+            try:
+                ok = asyncio.run(main())
+            finally:
+                ckpt.CHECKPOINT_DB = saved
+        print("[PASS] create_async_checkpointer" if ok else "[FAIL] create_async_checkpointer")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all async graph checks."""
+    print("=" * 60)
+    print("Async Graph Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_async_variant_wraps_functions(),
+        check_async_variant_offloads_blocking_nodes(),
+        check_async_demo_graph_critical_path(),
+        check_create_async_checkpointer(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_async_variant_wraps_functions():
+    assert check_async_variant_wraps_functions()
+
+def test_async_variant_offloads_blocking_nodes():
+    assert check_async_variant_offloads_blocking_nodes()
+
+def test_async_demo_graph_critical_path():
+    assert check_async_demo_graph_critical_path()
+
+def test_create_async_checkpointer():
+    assert check_create_async_checkpointer()
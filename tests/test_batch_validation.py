@@ -0,0 +1,118 @@
+"""
+Test harness for columnar batch request validation.
+
+Verifies rule order and messages, that list, NumPy and Arrow columns
+give the same answer, and that the column scan agrees with the
+per-text scanner. No API keys required.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+ROWS = {
+    "amounts": [5_000.0, -1.0, 250_000.0, 1_000.0, 1_000.0, 1_000.0, 1_000.0, float("nan")],
+    "departments": ["engineering", "engineering", "engineering", "legal", "hr", "hr", "marketing", "hr"],
+    "titles": ["Laptops", "Refund", "Datacenter", "Contract review", "T" * 250, "Training",
+               "Campaign", "Offsite"],
+    "descriptions": ["New hires", "", "Build-out", "Outside counsel", "x", "Course fees",
+                     "Q3 DROP TABLE ads", "Venue"],
+    "justifications": ["Onboarding", "", "Capacity", "Required", "x", "<script>alert(1)</script>",
+                       "eval(", "Team building"],
+}
+EXPECTED = [
+    "Request validated successfully",
+    "Amount must be positive",
+    "Amount exceeds budget ceiling of $100,000.00",
+    "Invalid department: legal",
+    "Title too long",
+    "Blocked content detected in justification: suspicious pattern",
+    "Blocked content detected in description: suspicious pattern",
+    "Amount must be positive",
+]
+
+
+def check_rule_order_and_messages():
+    """Each row gets validate_request's message for its first failing rule."""
+    try:
+        from backend.guardrails.batch_validation import validate_requests_batch
+        valid, messages = validate_requests_batch(**ROWS)
+        ok = messages == EXPECTED and valid.tolist() == [True] + [False] * 7
+        print("[PASS] rule order and messages" if ok else f"[FAIL] messages={messages}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_numpy_and_arrow_columns():
+    """NumPy and (chunked) Arrow columns give the same result as lists."""
+    try:
+        import numpy as np
+        from backend.guardrails.batch_validation import validate_requests_batch
+        inputs = [{k: np.array(v, dtype=object if k != "amounts" else float) for k, v in ROWS.items()}]
+        try:
+            import pyarrow as pa
+            inputs.append({k: v if k == "amounts" else pa.chunked_array([v[:3], v[3:]]) for k, v in ROWS.items()})
+        except ImportError:
+            pass  # Arrow input is optional
+        ok = all(validate_requests_batch(**cols)[1] == EXPECTED for cols in inputs)
+        print("[PASS] NumPy and Arrow columns" if ok else "[FAIL] column types disagree")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_column_scan_matches_per_text():
+    """matching_rows agrees with check() per text and ignores hits across rows."""
+    try:
+        from backend.guardrails.scanner import BLOCKED_SCANNER
+        texts = ["ok", "please drop", "table now", "", "x; DROP TABLE y", "İstanbul eval(", None, "os.system"]
+        expected = [i for i, t in enumerate(texts) if not BLOCKED_SCANNER.check(t or "")[0]]
+        ok = BLOCKED_SCANNER.matching_rows(texts) == expected == [4, 5, 7]
+        ok = ok and BLOCKED_SCANNER.rows_in_buffer(b"dropeval(x", [0, 4, 10]) == [1]
+        print("[PASS] column scan matches per text" if ok else f"[FAIL] rows={BLOCKED_SCANNER.matching_rows(texts)}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all batch validation checks."""
+    print("=" * 60)
+    print("Batch Validation Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_rule_order_and_messages(),
+        check_numpy_and_arrow_columns(),
+        check_column_scan_matches_per_text(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_rule_order_and_messages():
+    assert check_rule_order_and_messages()
+
+def test_numpy_and_arrow_columns():
+    assert check_numpy_and_arrow_columns()
+
+def test_column_scan_matches_per_text():
+    assert check_column_scan_matches_per_text()
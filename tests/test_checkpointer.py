@@ -0,0 +1,308 @@
+"""
+Test harness for the tuned SQLite checkpointer factories.
+
+Verifies pragmas, the reader pool (including that list() stays off the
+writer connection), and concurrent graph runs against a temporary
+database without requiring API keys.
+"""
+
+import sys
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def check_pragmas_applied():
+    """create_checkpointer should enable WAL and synchronous=NORMAL."""
+    try:
+        from backend.agent.checkpointer import create_checkpointer
+        with tempfile.TemporaryDirectory() as tmp:
+            saver = create_checkpointer(os.path.join(tmp, "ckpt.db"), readers=2)
+            journal = saver.conn.execute("PRAGMA journal_mode").fetchone()[0]
+            sync = saver.conn.execute("PRAGMA synchronous").fetchone()[0]
+            saver.close()
+        ok = journal == "wal" and sync == 1
+        print("[PASS] WAL pragmas applied" if ok else f"[FAIL] journal={journal}, synchronous={sync}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_concurrent_threads_with_reader_pool():
+    """Many graph threads should checkpoint and read back through the pool."""
+    try:
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.demo_graph import create_demo_graph
+        with tempfile.TemporaryDirectory() as tmp:
+            saver = create_checkpointer(os.path.join(tmp, "ckpt.db"), readers=3)
+            graph = create_demo_graph(checkpointer=saver)
+
+            def run(i):
+                config = {"configurable": {"thread_id": f"pool-{i}"}}
+                graph.invoke({"title": "t", "amount": 500.0, "department": "hr", "messages": []}, config)
+                return graph.get_state(config).values["status"]
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                statuses = list(pool.map(run, range(24)))
+            idle_readers = saver._readers.qsize()
+            saver.close()
+        ok = statuses == ["approved"] * 24 and idle_readers == 3
+        print("[PASS] concurrent threads with reader pool" if ok else f"[FAIL] statuses={set(statuses)}, idle={idle_readers}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_memory_database_disables_pool():
+    """An in-memory checkpointer cannot share its database with readers."""
+    try:
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.demo_graph import create_demo_graph
+        saver = create_checkpointer(":memory:")
+        graph = create_demo_graph(checkpointer=saver)
+        config = {"configurable": {"thread_id": "mem"}}
+        graph.invoke({"title": "t", "amount": 500.0, "department": "hr", "messages": []}, config)
+        ok = graph.get_state(config).values["status"] == "approved" and saver._readers.qsize() == 0
+        saver.close()
+        print("[PASS] in-memory checkpointer works without pool" if ok else "[FAIL] in-memory checkpointer")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+def check_pooled_list_skips_writer():
+    """Pooled list() should read pending writes from its reader, never the writer connection."""
+    try:
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.demo_graph import create_demo_graph
+
+        class NoWriter:
+            def cursor(self):
+                raise AssertionError("list() used the writer connection")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            saver = create_checkpointer(path, readers=1)
+            config = {"configurable": {"thread_id": "paused"}}
+            # A critical request stops at the first review, leaving pending writes.
+            create_demo_graph(checkpointer=saver).invoke(
+                {"title": "t", "amount": 90_000.0, "department": "engineering", "messages": []}, config,
+            )
+            listings = {}
+            for readers in (0, 1):
+                reader_saver = create_checkpointer(path, readers=readers)
+                reader_saver.setup()
+                writer, reader_saver.conn = reader_saver.conn, (NoWriter() if readers else reader_saver.conn)
+                listings[readers] = [(t.config, t.pending_writes) for t in reader_saver.list(config)]
+                reader_saver.conn = writer
+                reader_saver.close()
+            saver.close()
+        ok = listings[0] == listings[1] and any(writes for _, writes in listings[1])
+        print("[PASS] pooled list() stays off the writer" if ok else "[FAIL] pooled list() differs from unpooled")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+def check_list_reentrant_with_one_reader():
+    """Reading while iterating list() must not deadlock on a one-reader pool."""
+    try:
+        import threading
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.demo_graph import create_demo_graph
+        with tempfile.TemporaryDirectory() as tmp:
+            saver = create_checkpointer(os.path.join(tmp, "ckpt.db"), readers=1, delta=False)
+            graph = create_demo_graph(checkpointer=saver)
+            config = {"configurable": {"thread_id": "nested"}}
+            graph.invoke({"title": "t", "amount": 500.0, "department": "hr", "messages": []}, config)
+            found = []
+
+            def nested_reads():
+                for t in saver.list(config):
+                    found.append(saver.get_tuple(t.config) is not None and len(list(saver.list(t.config))) == 1)
+
+            worker = threading.Thread(target=nested_reads, daemon=True)
+            worker.start()
+            worker.join(timeout=10)
+            if worker.is_alive():
+                print("[FAIL] list() deadlocked on its own reader")
+                return False
+
+            # With the only reader held elsewhere, a read gives up instead of hanging.
+            saver.reader_timeout = 0.05
+            timed_out = False
+            with saver._reader():
+                try:
+                    saver.get_tuple(config)
+                except TimeoutError:
+                    timed_out = True
+            saver.close()
+        ok = found and all(found) and timed_out
+        print("[PASS] list() is re-entrant with one reader" if ok else f"[FAIL] reads={found}, timed_out={timed_out}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def _run_critical(graph, thread_id):
+    from langgraph.types import Command
+    config = {"configurable": {"thread_id": thread_id}}
+    result = graph.invoke({"title": "t", "amount": 90_000.0, "department": "engineering", "messages": []}, config)
+    while result.get("__interrupt__"):
+        result = graph.invoke(Command(resume={"approved": True, "comments": "ok"}), config)
+    return config
+
+
+def _history(graph, config):
+    return [
+        {k: ([m.content for m in v] if k == "messages" else v) for k, v in snap.values.items()}
+        for snap in graph.get_state_history(config)
+    ]
+
+
+def check_delta_checkpoints_round_trip():
+    """Delta-encoded history should match full checkpoints and take fewer bytes."""
+    try:
+        import sqlite3
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.demo_graph import create_demo_graph
+        with tempfile.TemporaryDirectory() as tmp:
+            histories, sizes = {}, {}
+            for delta in (False, True):
+                path = os.path.join(tmp, f"{delta}.db")
+                saver = create_checkpointer(path, readers=1, delta=delta)
+                config = _run_critical(create_demo_graph(checkpointer=saver), "critical")
+                saver.close()
+                # Re-open so the delta chain is replayed from disk, not the cache.
+                saver = create_checkpointer(path, readers=1, delta=delta)
+                histories[delta] = _history(create_demo_graph(checkpointer=saver), config)
+                saver.close()
+                with sqlite3.connect(path) as conn:
+                    sizes[delta] = conn.execute("SELECT SUM(LENGTH(checkpoint)) FROM checkpoints").fetchone()[0]
+        ok = histories[True] == histories[False] and histories[True][0]["status"] == "approved" and sizes[True] < sizes[False]
+        print("[PASS] delta checkpoints round trip" if ok else f"[FAIL] sizes={sizes}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_delta_snapshot_cadence():
+    """Every snapshot_every-th checkpoint in a chain should be stored in full."""
+    try:
+        import sqlite3
+        from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+        from backend.agent.checkpointer import DeltaSqliteSaver, _connect
+        from backend.agent.delta_checkpoint import is_delta
+        from backend.agent.demo_graph import create_demo_graph
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            saver = DeltaSqliteSaver(_connect(path), [], snapshot_every=3)
+            _run_critical(create_demo_graph(checkpointer=saver), "critical")
+            saver.close()
+            serde = JsonPlusSerializer()
+            with sqlite3.connect(path) as conn:
+                rows = conn.execute("SELECT type, checkpoint FROM checkpoints ORDER BY checkpoint_id").fetchall()
+            pattern = [is_delta(serde.loads_typed(row)) for row in rows]
+        expected = [i % 3 != 0 for i in range(len(pattern))]
+        ok = pattern == expected
+        print("[PASS] delta snapshot cadence" if ok else f"[FAIL] pattern={pattern}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_async_delta_checkpoints():
+    """The async delta saver should resume and read back across a reopen."""
+    try:
+        import asyncio
+        from langgraph.types import Command
+        from backend.agent.checkpointer import create_async_checkpointer
+        from backend.agent.demo_graph import create_demo_graph
+
+        async def scenario(path):
+            config = {"configurable": {"thread_id": "async-critical"}}
+            saver = await create_async_checkpointer(path, delta=True)
+            graph = create_demo_graph(checkpointer=saver, async_mode=True)
+            result = await graph.ainvoke({"title": "t", "amount": 90_000.0, "department": "hr", "messages": []}, config)
+            while result.get("__interrupt__"):
+                result = await graph.ainvoke(Command(resume={"approved": True, "comments": ""}), config)
+            await saver.conn.close()
+            saver = await create_async_checkpointer(path, delta=True)
+            graph = create_demo_graph(checkpointer=saver, async_mode=True)
+            state = await graph.aget_state(config)
+            await saver.conn.close()
+            return state.values
+
+        with tempfile.TemporaryDirectory() as tmp:
+            values = asyncio.run(scenario(os.path.join(tmp, "ckpt.db")))
+        ok = values["status"] == "approved" and values["final_approved"] is True and len(values["messages"]) == 6
+        print("[PASS] async delta checkpoints" if ok else f"[FAIL] values={values}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all checkpointer checks."""
+    print("=" * 60)
+    print("Checkpointer Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_pragmas_applied(),
+        check_concurrent_threads_with_reader_pool(),
+        check_memory_database_disables_pool(),
+        check_pooled_list_skips_writer(),
+        check_list_reentrant_with_one_reader(),
+        check_delta_checkpoints_round_trip(),
+        check_delta_snapshot_cadence(),
+        check_async_delta_checkpoints(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_pragmas_applied():
+    assert check_pragmas_applied()
+
+def test_concurrent_threads_with_reader_pool():
+    assert check_concurrent_threads_with_reader_pool()
+
+def test_memory_database_disables_pool():
+    assert check_memory_database_disables_pool()
+
+def test_pooled_list_skips_writer():
+    assert check_pooled_list_skips_writer()
+
+def test_list_reentrant_with_one_reader():
+    assert check_list_reentrant_with_one_reader()
+
+def test_delta_checkpoints_round_trip():
+    assert check_delta_checkpoints_round_trip()
+
+def test_delta_snapshot_cadence():
+    assert check_delta_snapshot_cadence()
+
+def test_async_delta_checkpoints():
+    assert check_async_delta_checkpoints()
@@ -0,0 +1,270 @@
+"""
+Test harness for checkpoint compaction and retention.
+
+Runs the demo graph against a temporary database, compacts completed
+threads, and verifies the retained tail, the cold-storage archive and
+that unfinished threads are left alone. No API keys required.
+"""
+
+import sys
+import os
+import glob
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+LOW = {"title": "t", "amount": 500.0, "department": "hr", "messages": []}
+MEDIUM = {"title": "t", "amount": 25_000.0, "department": "hr", "messages": []}
+
+
+def _populate(path, delta=False):
+    """Three completed low-risk threads and one medium thread paused at review."""
+    from backend.agent.checkpointer import create_checkpointer
+    from backend.agent.demo_graph import create_demo_graph
+    saver = create_checkpointer(path, readers=0, delta=delta)
+    graph = create_demo_graph(checkpointer=saver)
+    for i in range(3):
+        graph.invoke(LOW, {"configurable": {"thread_id": f"done-{i}"}})
+    graph.invoke(MEDIUM, {"configurable": {"thread_id": "waiting"}})
+    saver.close()
+
+
+def _counts(path):
+    import sqlite3
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT thread_id, COUNT(*) FROM checkpoints GROUP BY thread_id"))
+
+
+def check_completed_threads_keep_tail():
+    """Completed threads keep keep_last checkpoints; paused threads are untouched."""
+    try:
+        from backend.agent.compaction import compact_checkpoints
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            _populate(path)
+            before = _counts(path)
+            report = compact_checkpoints(path, keep_last=1, archive_dir=os.path.join(tmp, "archive"))
+            after = _counts(path)
+            archives = glob.glob(os.path.join(tmp, "archive", "*.jsonl.gz"))
+        ok = (
+            report["threads_compacted"] == 3
+            and all(after[f"done-{i}"] == 1 for i in range(3))
+            and after["waiting"] == before["waiting"]
+            and report["checkpoints_archived"] == sum(before[f"done-{i}"] - 1 for i in range(3))
+            and len(archives) == 3
+            and "db_bytes_after" in report and "lookup_seconds_after" in report
+        )
+        print("[PASS] completed threads compacted to tail" if ok else f"[FAIL] before={before} after={after} report={report}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_compacted_thread_still_readable():
+    """The graph can still read the final state of a compacted thread."""
+    try:
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.compaction import compact_checkpoints
+        from backend.agent.demo_graph import create_demo_graph
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            _populate(path)
+            compact_checkpoints(path, archive_dir=os.path.join(tmp, "archive"))
+            saver = create_checkpointer(path, readers=0)
+            state = create_demo_graph(checkpointer=saver).get_state({"configurable": {"thread_id": "done-0"}})
+            saver.close()
+        ok = state.values.get("status") == "approved" and state.values.get("current_stage") == "complete"
+        print("[PASS] compacted thread readable" if ok else f"[FAIL] values={state.values}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_incremental_batches_and_restore():
+    """batch_size limits each pass; archives can be restored into the database."""
+    try:
+        from backend.agent.compaction import compact_checkpoints, restore_archive
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            archive_dir = os.path.join(tmp, "archive")
+            _populate(path)
+            before = _counts(path)
+            first = compact_checkpoints(path, archive_dir=archive_dir, batch_size=2)
+            second = compact_checkpoints(path, archive_dir=archive_dir, batch_size=2)
+            third = compact_checkpoints(path, archive_dir=archive_dir, batch_size=2)
+            for archive in glob.glob(os.path.join(archive_dir, "*.jsonl.gz")):
+                restore_archive(archive, path)
+            restored = _counts(path)
+        ok = (
+            (first["threads_compacted"], first["threads_remaining"]) == (2, 2)
+            and (second["threads_compacted"], second["threads_remaining"]) == (1, 0)
+            and third["threads_compacted"] == 0
+            and restored == before
+        )
+        print("[PASS] incremental passes and restore" if ok else f"[FAIL] {first} {second} {third} {restored}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_unchanged_threads_skipped():
+    """Inspected threads are not deserialized again until a new checkpoint arrives."""
+    try:
+        from langgraph.types import Command
+        from backend.agent import compaction
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.demo_graph import create_demo_graph
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            archive_dir = os.path.join(tmp, "archive")
+            _populate(path)
+            inspected = []
+            latest_stage = compaction._latest_stage
+
+            def counting(conn, thread_id):
+                inspected.append(thread_id)
+                return latest_stage(conn, thread_id)
+
+            compaction._latest_stage = counting
+            try:
+                compaction.compact_checkpoints(path, archive_dir=archive_dir)
+                first = sorted(inspected)
+                inspected.clear()
+                idle = compaction.compact_checkpoints(path, archive_dir=archive_dir)
+                idle_inspected = list(inspected)
+                # The paused thread moves on; only it is inspected, then compacted.
+                saver = create_checkpointer(path, readers=0)
+                create_demo_graph(checkpointer=saver).invoke(
+                    Command(resume={"approved": True, "comments": "ok"}), {"configurable": {"thread_id": "waiting"}},
+                )
+                saver.close()
+                inspected.clear()
+                resumed = compaction.compact_checkpoints(path, archive_dir=archive_dir)
+            finally:
+                compaction._latest_stage = latest_stage
+        ok = (
+            first == ["done-0", "done-1", "done-2", "waiting"]
+            and idle_inspected == [] and idle["threads_remaining"] == 0
+            and inspected == ["waiting"] and resumed["threads_compacted"] == 1
+        )
+        print("[PASS] unchanged threads skipped" if ok else f"[FAIL] first={first} idle={idle_inspected} resumed={inspected}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_worker_survives_failures():
+    """A failing pass is counted and the worker keeps running; full VACUUM is off by default."""
+    try:
+        import time
+        from backend.agent import compaction
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            _populate(path)
+            calls = []
+            compact = compaction.compact_checkpoints
+
+            def flaky(*args, **kwargs):
+                calls.append(kwargs["full_vacuum"])
+                if len(calls) == 1:
+                    raise OSError("archive disk full")
+                return compact(*args, **kwargs)
+
+            compaction.compact_checkpoints = flaky
+            try:
+                worker = compaction.CompactionWorker(path, interval=0.01, archive_dir=os.path.join(tmp, "archive"))
+                worker.start()
+                deadline = time.time() + 10
+                while worker.last_report is None and time.time() < deadline:
+                    time.sleep(0.01)
+                worker.stop(timeout=5)
+            finally:
+                compaction.compact_checkpoints = compact
+            metrics = worker.render_metrics()
+        ok = (
+            worker.failures == 1
+            and worker.last_error == "OSError: archive disk full"
+            and worker.last_report is not None and worker.last_report["threads_compacted"] == 3
+            and not any(calls)
+            and "approval_compaction_failures_total 1" in metrics
+        )
+        print("[PASS] worker survives failed passes" if ok else f"[FAIL] failures={worker.failures} error={worker.last_error}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_delta_checkpoints_compacted():
+    """A kept delta checkpoint is materialized before its base is archived."""
+    try:
+        from backend.agent.checkpointer import create_checkpointer
+        from backend.agent.compaction import compact_checkpoints
+        from backend.agent.demo_graph import create_demo_graph
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt.db")
+            _populate(path, delta=True)
+            report = compact_checkpoints(path, archive_dir=os.path.join(tmp, "archive"))
+            saver = create_checkpointer(path, readers=0, delta=True)
+            state = create_demo_graph(checkpointer=saver).get_state({"configurable": {"thread_id": "done-1"}})
+            saver.close()
+        ok = report["threads_compacted"] == 3 and state.values.get("status") == "approved" and len(state.values["messages"]) == 4
+        print("[PASS] delta checkpoints compacted" if ok else f"[FAIL] report={report} values={state.values}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all compaction checks."""
+    print("=" * 60)
+    print("Checkpoint Compaction Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_completed_threads_keep_tail(),
+        check_compacted_thread_still_readable(),
+        check_incremental_batches_and_restore(),
+        check_unchanged_threads_skipped(),
+        check_worker_survives_failures(),
+        check_delta_checkpoints_compacted(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_completed_threads_keep_tail():
+    assert check_completed_threads_keep_tail()
+
+def test_compacted_thread_still_readable():
+    assert check_compacted_thread_still_readable()
+
+def test_incremental_batches_and_restore():
+    assert check_incremental_batches_and_restore()
+
+def test_unchanged_threads_skipped():
+    assert check_unchanged_threads_skipped()
+
+def test_worker_survives_failures():
+    assert check_worker_survives_failures()
+
+def test_delta_checkpoints_compacted():
+    assert check_delta_checkpoints_compacted()
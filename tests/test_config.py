@@ -0,0 +1,159 @@
+"""
+Test harness for backend configuration: the pooled LLM factory.
+
+Verifies client reuse, LRU eviction, and pool statistics without
+making any network calls (clients are constructed but never invoked).
+"""
+
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _with_test_pool(size, fn):
+    """Run fn() against a fresh pool of the given size, restoring config afterwards."""
+    from backend import config
+    saved = (config.LLM_PROVIDER, config.OPENAI_API_KEY, config.LLM_POOL_SIZE)
+    config.LLM_PROVIDER = "openai"
+    config.OPENAI_API_KEY = "sk-test-not-a-real-key"
+    config.LLM_POOL_SIZE = size
+    config.clear_llm_pool()
+    try:
+        return fn(config)
+    finally:
+        config.LLM_PROVIDER, config.OPENAI_API_KEY, config.LLM_POOL_SIZE = saved
+        config.clear_llm_pool()
+
+
+def check_get_llm_reuses_client():
+    """get_llm() should return the same instance for the same key."""
+    def body(config):
+        first = config.get_llm(temperature=0.0)
+        second = config.get_llm(temperature=0.0)
+        stats = config.get_llm_pool_stats()
+        if first is second and stats["hits"] == 1 and stats["misses"] == 1:
+            print("[PASS] get_llm reuses pooled client")
+            return True
+        print(f"[FAIL] get_llm did not reuse client (stats={stats})")
+        return False
+    try:
+        return _with_test_pool(4, body)
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_get_llm_keys_on_temperature_and_model():
+    """Different temperature or model should produce distinct clients."""
+    def body(config):
+        a = config.get_llm(temperature=0.0)
+        b = config.get_llm(temperature=0.7)
+        c = config.get_llm(temperature=0.0, model="gpt-4o")
+        if len({id(a), id(b), id(c)}) == 3:
+            print("[PASS] get_llm keys pool on (provider, model, temperature)")
+            return True
+        print("[FAIL] get_llm shared clients across different keys")
+        return False
+    try:
+        return _with_test_pool(4, body)
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_get_llm_lru_eviction():
+    """The pool should evict the least recently used client when full."""
+    def body(config):
+        cold = config.get_llm(temperature=0.1)
+        warm = config.get_llm(temperature=0.2)
+        config.get_llm(temperature=0.1)        # touch → 0.2 is now LRU
+        config.get_llm(temperature=0.3)        # evicts 0.2
+        stats = config.get_llm_pool_stats()
+        ok = (
+            stats["size"] == 2
+            and stats["evictions"] == 1
+            and config.get_llm(temperature=0.1) is cold
+            and config.get_llm(temperature=0.2) is not warm
+        )
+        if ok:
+            print("[PASS] get_llm evicts least recently used client")
+            return True
+        print(f"[FAIL] Unexpected LRU behaviour (stats={stats})")
+        return False
+    try:
+        return _with_test_pool(2, body)
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_get_llm_thread_safe():
+    """Concurrent callers should all receive the single pooled client."""
+    def body(config):
+        seen = []
+        barrier = threading.Barrier(16)
+
+        def worker():
+            barrier.wait()
+            seen.append(id(config.get_llm(temperature=0.0)))
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = config.get_llm_pool_stats()
+        if len(set(seen)) == 1 and stats["misses"] == 1 and stats["hits"] == 15:
+            print("[PASS] get_llm is thread-safe under concurrent access")
+            return True
+        print(f"[FAIL] Concurrent get_llm built multiple clients (stats={stats})")
+        return False
+    try:
+        return _with_test_pool(4, body)
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all configuration checks."""
+    print("=" * 60)
+    print("Configuration: LLM Client Pool Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_get_llm_reuses_client(),
+        check_get_llm_keys_on_temperature_and_model(),
+        check_get_llm_lru_eviction(),
+        check_get_llm_thread_safe(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_get_llm_reuses_client():
+    assert check_get_llm_reuses_client()
+
+def test_get_llm_keys_on_temperature_and_model():
+    assert check_get_llm_keys_on_temperature_and_model()
+
+def test_get_llm_lru_eviction():
+    assert check_get_llm_lru_eviction()
+
+def test_get_llm_thread_safe():
+    assert check_get_llm_thread_safe()
@@ -0,0 +1,156 @@
+"""
+Test harness for lazily loaded evaluation datasets.
+
+Round-trips cases through JSONL, gzip-JSONL and Parquet files, checks
+that filters and seeded sampling are applied in one pass and are
+repeatable, and that the three-layer runner scores a streamed dataset
+in chunks with the same results as the equivalent list.
+No API keys required.
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def check_file_round_trip():
+    """JSONL, gzip-JSONL and Parquet files load back the written cases."""
+    try:
+        from backend.evaluation.dataset import EVAL_DATASET
+        from backend.evaluation import dataset_loader
+        from backend.evaluation.dataset_loader import load_dataset, write_jsonl
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("cases.jsonl", "cases.jsonl.gz"):
+                path = os.path.join(tmp, name)
+                if write_jsonl(iter(EVAL_DATASET), path) != len(EVAL_DATASET):
+                    print(f"[FAIL] write_jsonl should return the case count for {name}")
+                    return False
+                if list(load_dataset(path)) != EVAL_DATASET:
+                    print(f"[FAIL] {name} did not round-trip")
+                    return False
+            if dataset_loader.pq is not None:
+                import json
+                import pyarrow as pa
+                path = os.path.join(tmp, "cases.parquet")
+                table = pa.table({
+                    "input": [json.dumps(tc["input"]) for tc in EVAL_DATASET],
+                    "expected": [json.dumps(tc["expected"]) for tc in EVAL_DATASET],
+                })
+                dataset_loader.pq.write_table(table, path)
+                if list(load_dataset(path)) != EVAL_DATASET:
+                    print("[FAIL] Parquet dataset did not round-trip")
+                    return False
+        print("[PASS] Dataset files round-trip")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Round-trip error: {e}")
+        return False
+
+
+def check_filters_and_sampling():
+    """Filters, fraction, k and limit compose and are seeded."""
+    try:
+        from backend.evaluation.dataset import EVAL_DATASET
+        from backend.evaluation.dataset_loader import load_dataset
+        high = [tc for tc in EVAL_DATASET if tc["expected"]["risk_level"] in ("high", "critical")]
+        stream = load_dataset(EVAL_DATASET, risk_levels=["high", "critical"])
+        if list(stream) != high or list(stream) != high:
+            print("[FAIL] Risk filter should be applied on every iteration")
+            return False
+        sample = load_dataset(EVAL_DATASET * 50, k=20, seed=3)
+        first = list(sample)
+        if len(first) != 20 or first != list(sample):
+            print("[FAIL] Reservoir sample should be k cases and repeatable")
+            return False
+        if first == list(load_dataset(EVAL_DATASET * 50, k=20, seed=4)):
+            print("[FAIL] A different seed should draw a different sample")
+            return False
+        kept = len(list(load_dataset(EVAL_DATASET * 500, fraction=0.1)))
+        if not 400 < kept < 800:
+            print(f"[FAIL] fraction=0.1 of {len(EVAL_DATASET) * 500} kept {kept}")
+            return False
+        if len(list(load_dataset(EVAL_DATASET, limit=3))) != 3:
+            print("[FAIL] limit should stop the stream")
+            return False
+        print("[PASS] Filters and sampling compose and are seeded")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Filter/sampling error: {e}")
+        return False
+
+
+def check_runner_streams_dataset():
+    """The runner scores a streamed dataset in chunks, matching the list run."""
+    try:
+        import contextlib
+        import io
+        from backend.evaluation import run_three_layer_eval as runner
+        from backend.evaluation.dataset import EVAL_DATASET
+        from backend.evaluation.dataset_loader import load_dataset
+
+        def path_match(inputs, outputs, reference_outputs):
+            return {"score": (inputs["amount"] % 7) / 7}
+
+        evaluators = {name: None for name in runner.EVALUATOR_REGISTRY}
+        evaluators["approval_path"] = path_match
+        cases = EVAL_DATASET * 10
+        original, chunk = runner._instantiate_evaluators, runner.EVAL_STREAM_CHUNK
+        runner._instantiate_evaluators = lambda: evaluators
+        runner.EVAL_STREAM_CHUNK = 7
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                listed = runner.run_three_layer_evaluation(cases, use_cache=False)
+                streamed = runner.run_three_layer_evaluation(load_dataset(cases), use_cache=False)
+        finally:
+            runner._instantiate_evaluators, runner.EVAL_STREAM_CHUNK = original, chunk
+
+        if streamed["n_cases"] != len(cases) or listed["n_cases"] != len(cases):
+            print(f"[FAIL] Unexpected case counts: {listed['n_cases']}, {streamed['n_cases']}")
+            return False
+        for key in ("scores", "stddev"):
+            a, b = listed[key]["approval_path"], streamed[key]["approval_path"]
+            if abs(a - b) > 1e-9:
+                print(f"[FAIL] {key} differs: list {a} vs streamed {b}")
+                return False
+        print("[PASS] Runner streams a dataset with the same results")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Runner streaming error: {e}")
+        return False
+
+
+def run_all_checks():
+    print("=" * 60)
+    print("Dataset Loader Test Harness")
+    print("=" * 60)
+
+    results = [
+        check_file_round_trip(),
+        check_filters_and_sampling(),
+        check_runner_streams_dataset(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in results if r)
+    print(f"Results: {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_file_round_trip():
+    assert check_file_round_trip()
+
+def test_filters_and_sampling():
+    assert check_filters_and_sampling()
+
+def test_runner_streams_dataset():
+    assert check_runner_streams_dataset()
@@ -0,0 +1,197 @@
+"""
+Test harness for the parallel dataset generation pipeline.
+
+Feeds JSON arrays to the incremental parser in arbitrary pieces, checks
+that stratified seeds cover every stratum and that near-identical cases
+share a fingerprint, and runs generate_dataset() against a streaming
+fake chat model that returns duplicates and invalid cases.
+No API keys required.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import random
+import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class FakeGeneratorLLM:
+    """Streams a JSON array of cases for the prompt's stratum, a few characters at a time."""
+
+    def __init__(self, latency=0.001):
+        self.latency = latency
+        self.calls = 0
+
+    def _cases(self, prompt):
+        num = int(re.search(r"Generate (\d+)", prompt).group(1))
+        department = re.search(r'department "(\w+)"', prompt).group(1)
+        priority = re.search(r'priority\s+"(\w+)"', prompt).group(1)
+        rng = random.Random(self.calls)
+        cases = [
+            {
+                "input": {
+                    "request_id": f"GEN-{i + 1:03d}", "title": f"{department} purchase {rng.random():.6f}",
+                    "description": "Generated request", "amount": round(rng.uniform(1, 10_000), 2),
+                    "department": department, "requester": "Sam", "justification": "Needed",
+                    "priority": priority,
+                },
+                "expected": {"risk_level": "low", "status": "approved", "approval_path": [], "human_reviews": 0},
+            }
+            for i in range(num)
+        ]
+        duplicate = json.loads(json.dumps(cases[0]))
+        duplicate["input"].update(request_id="GEN-999", requester="Alex", title=duplicate["input"]["title"].upper())
+        invalid = json.loads(json.dumps(cases[-1]))
+        invalid["input"]["department"] = "legal"
+        return cases[:-2] + [duplicate, invalid]
+
+    async def astream(self, prompt):
+        self.calls += 1
+        text = "```json\n" + json.dumps(self._cases(prompt), indent=1) + "\n```"
+        for i in range(0, len(text), 64):
+            await asyncio.sleep(self.latency if i == 0 else 0)
+            yield text[i:i + 64]
+
+
+def _department_check(dataset):
+    from backend.evaluation.dataset_generator import VALID_DEPARTMENTS
+    errors = [f"Case {i + 1}: bad department" for i, case in enumerate(dataset)
+              if case["input"]["department"] not in VALID_DEPARTMENTS]
+    return not errors, errors
+
+
+def check_incremental_parser():
+    """Objects are returned as soon as they close, whatever the split points."""
+    try:
+        from backend.evaluation.generation_pipeline import JsonArrayStream
+        items = [{"n": i, "s": "a}b]c,{"} for i in range(5)]
+        text = "Here you go:\n```json\n" + json.dumps(items) + "\n```"
+        for step in (1, 3, 17, len(text)):
+            parser, parsed = JsonArrayStream(), []
+            for i in range(0, len(text), step):
+                parsed.extend(parser.feed(text[i:i + step]))
+            parser.close()
+            if parsed != items:
+                print(f"[FAIL] Split every {step} chars parsed {parsed}")
+                return False
+        parser = JsonArrayStream()
+        truncated = parser.feed(json.dumps(items)[:-20])
+        if truncated != items[:4]:
+            print(f"[FAIL] A truncated array should still yield complete objects, got {truncated}")
+            return False
+        try:
+            parser.close()
+        except ValueError:
+            pass
+        else:
+            print("[FAIL] close() should reject an unterminated array")
+            return False
+        print("[PASS] Incremental parser handles arbitrary chunks and truncation")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Incremental parser error: {e}")
+        return False
+
+
+def check_seeds_and_fingerprints():
+    """Seeds cover every stratum; fingerprints ignore IDs, requester and word order."""
+    try:
+        from backend.evaluation.generation_pipeline import (
+            PRIORITIES, RISK_BANDS, case_fingerprint, stratified_seeds,
+        )
+        from backend.evaluation.dataset_generator import VALID_DEPARTMENTS
+        strata = len(VALID_DEPARTMENTS) * len(RISK_BANDS) * len(PRIORITIES)
+        seeds = stratified_seeds(strata * 10 - 3, 10)
+        if sum(s.num_cases for s in seeds) != strata * 10 - 3:
+            print("[FAIL] Seeds should ask for exactly the requested total")
+            return False
+        if len({(s.department, s.band, s.priority) for s in seeds}) != strata:
+            print("[FAIL] Seeds should cover every department x band x priority stratum")
+            return False
+        base = {"input": {"request_id": "A", "requester": "Sam", "title": "New laptops!", "description": "For QA",
+                          "amount": 1200.0, "department": "engineering", "priority": "normal"}}
+        same = {"input": {**base["input"], "request_id": "B", "requester": "Alex", "title": "laptops new"}}
+        other = {"input": {**base["input"], "amount": 1200.5}}
+        if case_fingerprint(base) != case_fingerprint(same) or case_fingerprint(base) == case_fingerprint(other):
+            print("[FAIL] Fingerprints should match near-duplicates only")
+            return False
+        print("[PASS] Stratified seeds and near-duplicate fingerprints")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Seeds/fingerprint error: {e}")
+        return False
+
+
+def check_generate_dataset():
+    """Concurrent generation reaches the target with unique, validated cases."""
+    try:
+        import contextlib
+        import io
+        from backend.evaluation.generation_pipeline import case_fingerprint, generate_dataset
+        llm = FakeGeneratorLLM()
+        report = generate_dataset(1000, llm=llm, cases_per_prompt=10, concurrency=16, validate=_department_check)
+        cases = report.cases
+        if len(cases) != 1000:
+            print(f"[FAIL] Expected 1000 cases, got {len(cases)}")
+            return False
+        if len({c["input"]["request_id"] for c in cases}) != 1000 or len({case_fingerprint(c) for c in cases}) != 1000:
+            print("[FAIL] Request IDs and fingerprints should be unique")
+            return False
+        if report.duplicates == 0 or report.invalid == 0 or report.failed_prompts:
+            print(f"[FAIL] Drops not counted: {report.duplicates} duplicates, {report.invalid} invalid, "
+                  f"{report.failed_prompts} failed prompts")
+            return False
+        if any(c["input"]["department"] == "legal" for c in cases):
+            print("[FAIL] Invalid cases should be dropped")
+            return False
+
+        def not_implemented(dataset):
+            raise NotImplementedError
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            fallback = generate_dataset(50, llm=FakeGeneratorLLM(), validate=not_implemented)
+        if len(fallback.cases) != 50 or "not implemented" not in out.getvalue():
+            print("[FAIL] An unimplemented validator should be skipped with a warning")
+            return False
+        print(f"[PASS] Generated 1000 unique cases from {report.prompts} concurrent prompts")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Generation error: {e}")
+        return False
+
+
+def run_all_checks():
+    print("=" * 60)
+    print("Generation Pipeline Test Harness")
+    print("=" * 60)
+
+    results = [
+        check_incremental_parser(),
+        check_seeds_and_fingerprints(),
+        check_generate_dataset(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in results if r)
+    print(f"Results: {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_incremental_parser():
+    assert check_incremental_parser()
+
+def test_seeds_and_fingerprints():
+    assert check_seeds_and_fingerprints()
+
+def test_generate_dataset():
+    assert check_generate_dataset()
@@ -0,0 +1,140 @@
+"""
+Test harness for evaluating cases through the real approval graph.
+
+Runs dataset cases through the demo graph (the fallback while
+create_approval_graph is a TODO) with the scripted review policy, and
+checks the derived outputs, scripted rejections, and the runner's
+per-case latency report from a process pool.
+No API keys required.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def check_outputs_derived_from_run():
+    """A critical case walks all three reviews and is approved."""
+    try:
+        from backend.evaluation.dataset import EVAL_DATASET
+        from backend.evaluation.graph_runner import build_graph, run_case
+        graph, _ = build_graph("demo")
+        case = next(tc for tc in EVAL_DATASET if tc["expected"]["risk_level"] == "critical")
+        result = run_case(case, graph=graph)
+        outputs = result["outputs"]
+        if outputs["approval_path"] != case["expected"]["approval_path"]:
+            print(f"[FAIL] Unexpected approval path: {outputs['approval_path']}")
+            return False
+        if outputs["human_reviews"] != 3 or outputs["status"] != "approved":
+            print(f"[FAIL] Unexpected outputs: {outputs}")
+            return False
+        if not outputs["decisions"] or outputs["decisions"][-1].get("decision") != "approved":
+            print(f"[FAIL] Decisions should carry a decision key: {outputs['decisions']}")
+            return False
+        if result["latency_ms"] <= 0:
+            print("[FAIL] Latency should be recorded")
+            return False
+        print("[PASS] Outputs are derived from the graph run")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Graph run error: {e}")
+        return False
+
+
+def check_scripted_rejection():
+    """A scripted manager rejection ends the run in handle_rejection."""
+    try:
+        from backend.evaluation.dataset import EVAL_DATASET
+        from backend.evaluation.graph_runner import build_graph, run_case
+        graph, _ = build_graph("demo")
+        case = next(tc for tc in EVAL_DATASET if tc["expected"]["risk_level"] == "high")
+        case = {**case, "reviews": {"manager_review": {"approved": False, "comments": "No."}}}
+        outputs = run_case(case, graph=graph)["outputs"]
+        if outputs["approval_path"][-2:] != ["manager_review", "handle_rejection"]:
+            print(f"[FAIL] Unexpected approval path: {outputs['approval_path']}")
+            return False
+        if outputs["status"] != "rejected" or outputs["human_reviews"] != 1:
+            print(f"[FAIL] Unexpected outputs: {outputs}")
+            return False
+        print("[PASS] Scripted rejection is applied at the interrupt")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Scripted rejection error: {e}")
+        return False
+
+
+def check_runner_reports_case_latency():
+    """The runner scores graph outputs and reports latency per case."""
+    try:
+        import contextlib
+        import io
+        from backend.evaluation import run_three_layer_eval as runner
+        from backend.evaluation.dataset import EVAL_DATASET
+
+        def review_count(inputs, outputs, reference_outputs):
+            return {"score": float(outputs["human_reviews"] == reference_outputs["human_reviews"])}
+
+        evaluators = {name: None for name in runner.EVALUATOR_REGISTRY}
+        evaluators["human_review_efficiency"] = review_count
+        original = runner._instantiate_evaluators
+        runner._instantiate_evaluators = lambda: evaluators
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                report = runner.run_three_layer_evaluation(
+                    EVAL_DATASET, use_cache=False, graph="demo", graph_workers=2
+                )
+        finally:
+            runner._instantiate_evaluators = original
+
+        cases = report["cases"]
+        if [c["id"] for c in cases] != [tc["input"]["request_id"] for tc in EVAL_DATASET]:
+            print("[FAIL] Per-case rows should follow dataset order")
+            return False
+        if any(c["latency_ms"] <= 0 or c["score"] is None for c in cases):
+            print(f"[FAIL] Missing latency or score: {cases}")
+            return False
+        # The demo graph never rejects at validation, so not every case matches.
+        if not 0 < report["scores"]["human_review_efficiency"] < 1:
+            print(f"[FAIL] Scores should reflect the real run: {report['scores']}")
+            return False
+        print("[PASS] Runner reports per-case graph latency next to scores")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Runner graph mode error: {e}")
+        return False
+
+
+def run_all_checks():
+    print("=" * 60)
+    print("Graph Evaluation Test Harness")
+    print("=" * 60)
+
+    results = [
+        check_outputs_derived_from_run(),
+        check_scripted_rejection(),
+        check_runner_reports_case_latency(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in results if r)
+    print(f"Results: {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_outputs_derived_from_run():
+    assert check_outputs_derived_from_run()
+
+def test_scripted_rejection():
+    assert check_scripted_rejection()
+
+def test_runner_reports_case_latency():
+    assert check_runner_reports_case_latency()
@@ -0,0 +1,170 @@
+"""
+Test harness for incremental three-layer evaluation.
+
+Verifies that the manifest plans only new, edited and re-versioned
+(case, evaluator) pairs, that case ids are stable and unique, and that
+an incremental runner re-run scores only the delta while reporting the
+same averages as a full run.
+No API keys required.
+"""
+
+import sys
+import os
+import copy
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def check_plan_covers_only_changes():
+    """New, edited and re-versioned pairs are pending; removed cases are dropped."""
+    try:
+        from backend.evaluation.dataset import EVAL_DATASET
+        from backend.evaluation.incremental import EvalManifest, case_hash, case_ids
+
+        def ids_and_hashes(dataset):
+            hashes = [case_hash(tc) for tc in dataset]
+            return case_ids(dataset, hashes), hashes
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "manifest.json")
+            versions = {"approval_path": "v1", "audit_trail": "v1"}
+            dataset = copy.deepcopy(EVAL_DATASET[:5])
+            ids, hashes = ids_and_hashes(dataset)
+
+            manifest = EvalManifest(path)
+            _, pending = manifest.plan(ids, hashes, versions)
+            if pending != {name: list(range(5)) for name in versions}:
+                print(f"[FAIL] First run should score everything: {pending}")
+                return False
+            manifest.update(ids, hashes, versions, {name: [1.0] * 5 for name in versions})
+            manifest.save()
+
+            dataset[1]["expected"]["human_reviews"] = 3    # edited
+            dataset = dataset[:4] + copy.deepcopy(EVAL_DATASET[5:6])  # EVAL-005 removed, EVAL-006 added
+            ids, hashes = ids_and_hashes(dataset)
+            manifest = EvalManifest(path)
+            prior, pending = manifest.plan(ids, hashes, {"approval_path": "v1", "audit_trail": "v2"})
+            if pending != {"approval_path": [1, 4], "audit_trail": [0, 1, 2, 3, 4]}:
+                print(f"[FAIL] Unexpected delta: {pending}")
+                return False
+            if prior["approval_path"] != [1.0, None, 1.0, 1.0, None]:
+                print(f"[FAIL] Unexpected reused scores: {prior['approval_path']}")
+                return False
+            if manifest.stats != {"changed": 7, "reused": 3, "removed": 1}:
+                print(f"[FAIL] Unexpected stats: {manifest.stats}")
+                return False
+        print("[PASS] Manifest plans only changed (case, evaluator) pairs")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Manifest plan error: {e}")
+        return False
+
+
+def check_case_ids_stable_and_unique():
+    """Ids come from id / request_id / hash; duplicates get a suffix."""
+    try:
+        from backend.evaluation.incremental import case_ids
+        dataset = [
+            {"id": "custom", "input": {"request_id": "EVAL-001"}},
+            {"input": {"request_id": "EVAL-001"}},
+            {"input": {"request_id": "EVAL-001"}},
+            {"input": {"title": "no id"}},
+        ]
+        ids = case_ids(dataset)
+        if ids[:3] != ["custom", "EVAL-001", "EVAL-001#2"] or len(ids[3]) != 32:
+            print(f"[FAIL] Unexpected ids: {ids}")
+            return False
+        if case_ids(dataset) != ids:
+            print("[FAIL] Ids should be stable")
+            return False
+        print("[PASS] Case ids are stable and unique")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Case id error: {e}")
+        return False
+
+
+def check_runner_scores_only_delta():
+    """An incremental re-run scores only new cases and matches a full run."""
+    try:
+        import contextlib
+        import io
+        from backend.evaluation import run_three_layer_eval as runner
+        from backend.evaluation.dataset import EVAL_DATASET
+
+        calls = []
+
+        def path_score(inputs, outputs, reference_outputs):
+            calls.append(inputs["request_id"])
+            return {"score": reference_outputs["human_reviews"] / 3}
+
+        evaluators = {name: None for name in runner.EVALUATOR_REGISTRY}
+        evaluators["approval_path"] = path_score
+        original = runner._instantiate_evaluators
+        runner._instantiate_evaluators = lambda: evaluators
+        try:
+            with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+                path = os.path.join(tmp, "manifest.json")
+                runner.run_three_layer_evaluation(EVAL_DATASET[:8], use_cache=False, incremental=True, manifest_path=path)
+                first = len(calls)
+                calls.clear()
+                report = runner.run_three_layer_evaluation(
+                    EVAL_DATASET, use_cache=False, incremental=True, manifest_path=path
+                )
+                delta = sorted(calls)
+                calls.clear()
+                full = runner.run_three_layer_evaluation(EVAL_DATASET, use_cache=False)
+        finally:
+            runner._instantiate_evaluators = original
+
+        added = sorted(tc["input"]["request_id"] for tc in EVAL_DATASET[8:])
+        if first != 8 or delta != added:
+            print(f"[FAIL] Expected only {added} to be scored, got {delta}")
+            return False
+        if report["scores"] != full["scores"] or report["overall"] != full["overall"]:
+            print("[FAIL] Incremental averages differ from a full run")
+            return False
+        if report["incremental"]["reused"] != 8:
+            print(f"[FAIL] Unexpected incremental stats: {report['incremental']}")
+            return False
+        print("[PASS] Incremental runner scores only the delta")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Incremental runner error: {e}")
+        return False
+
+
+def run_all_checks():
+    print("=" * 60)
+    print("Incremental Evaluation Test Harness")
+    print("=" * 60)
+
+    results = [
+        check_plan_covers_only_changes(),
+        check_case_ids_stable_and_unique(),
+        check_runner_scores_only_delta(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in results if r)
+    print(f"Results: {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_plan_covers_only_changes():
+    assert check_plan_covers_only_changes()
+
+def test_case_ids_stable_and_unique():
+    assert check_case_ids_stable_and_unique()
+
+def test_runner_scores_only_delta():
+    assert check_runner_scores_only_delta()
@@ -0,0 +1,282 @@
+"""
+Test harness for the bulk LangSmith uploader.
+
+Runs a real langsmith.Client against a local fake LangSmith server that
+can inject rate limits, lost responses and hard failures, and checks
+that uploads are chunked, retried without duplicates, resumed from the
+manifest log after a crash, and skipped by content hash when the
+examples are already on the server, even when only a conflict says so.
+No API keys required.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+class FakeLangSmith:
+    """In-memory /datasets and /examples endpoints on a local HTTP server."""
+
+    def __init__(self):
+        self.datasets, self.examples = {}, {}
+        self.bulk_requests = 0
+        self.rate_limit_next = 0      # answer the next N bulk requests with 429
+        self.lose_response_next = 0   # store the next N bulk requests, then answer 500
+        self.fail_from = None         # answer 400 from this bulk request on
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path == "/datasets":
+                    found = [d for d in fake.datasets.values() if d["name"] == query.get("name")]
+                    return self._send(200, found[: int(query.get("limit", 100))])
+                if url.path == "/examples":
+                    rows = [e for e in fake.examples.values() if e["dataset_id"] == query.get("dataset")]
+                    offset, limit = int(query.get("offset", 0)), int(query.get("limit", 100))
+                    return self._send(200, rows[offset:offset + limit])
+                self._send(200, [])
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"null")
+                url = urlparse(self.path)
+                if url.path == "/datasets":
+                    dataset = {"id": str(uuid.uuid4()), "name": body["name"],
+                               "created_at": datetime.now(timezone.utc).isoformat()}
+                    fake.datasets[dataset["id"]] = dataset
+                    return self._send(200, dataset)
+                if url.path == "/examples/bulk":
+                    with fake.lock:
+                        fake.bulk_requests += 1
+                        if fake.fail_from is not None and fake.bulk_requests >= fake.fail_from:
+                            return self._send(400, {"detail": "rejected"})
+                        if fake.rate_limit_next:
+                            fake.rate_limit_next -= 1
+                            return self._send(429, {"detail": "slow down"})
+                        if any(e["id"] in fake.examples for e in body):
+                            return self._send(409, {"detail": "exists"})
+                        for e in body:
+                            fake.examples[e["id"]] = e
+                        if fake.lose_response_next:
+                            fake.lose_response_next -= 1
+                            return self._send(500, {"detail": "lost"})
+                    return self._send(200, [{"id": e["id"]} for e in body])
+                self._send(200, {})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def client(self):
+        from langsmith import Client
+        from urllib3.util import Retry
+        # Adapter-level retries off, so injected errors reach the uploader.
+        return Client(
+            api_url=self.url, api_key="test", retry_config=Retry(total=0), info={}, auto_batch_tracing=False
+        )
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _cases(n):
+    from backend.evaluation.dataset import EVAL_DATASET
+    return [
+        {"input": {**EVAL_DATASET[i % len(EVAL_DATASET)]["input"], "request_id": f"UP-{i:04d}"},
+         "expected": EVAL_DATASET[i % len(EVAL_DATASET)]["expected"]}
+        for i in range(n)
+    ]
+
+
+def check_chunked_upload_with_retries():
+    """Rate limits and a lost response are retried without duplicate examples."""
+    fake = FakeLangSmith()
+    try:
+        from backend.evaluation.langsmith_upload import upload_dataset
+        fake.rate_limit_next, fake.lose_response_next = 3, 1
+        with tempfile.TemporaryDirectory() as tmp:
+            report = upload_dataset(
+                iter(_cases(500)), "bulk", client=fake.client(), chunk_size=50, concurrency=4,
+                backoff=0.001, manifest_path=os.path.join(tmp, "manifest.json"),
+            )
+        if report.uploaded != 500 or report.chunks != 10 or len(fake.examples) != 500:
+            print(f"[FAIL] Expected 500 examples in 10 chunks: {report}, server has {len(fake.examples)}")
+            return False
+        if report.retries != 4:
+            print(f"[FAIL] Expected 4 retries (3 rate limits, 1 lost response), got {report.retries}")
+            return False
+        print(f"[PASS] 500 examples in 10 bulk requests, {report.retries} retries, no duplicates")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Chunked upload error: {e}")
+        return False
+    finally:
+        fake.close()
+
+
+def check_resume_after_crash():
+    """A failed upload resumes from the manifest, uploading only the rest."""
+    fake = FakeLangSmith()
+    try:
+        from backend.evaluation.langsmith_upload import upload_dataset
+        cases = _cases(500)
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = os.path.join(tmp, "manifest.json")
+            fake.fail_from = 4
+            try:
+                upload_dataset(cases, "resume", client=fake.client(), chunk_size=50, concurrency=1,
+                               manifest_path=manifest, check_remote=False)
+            except Exception:
+                pass
+            else:
+                print("[FAIL] The first upload should fail at the fourth request")
+                return False
+            fake.fail_from = None
+            report = upload_dataset(cases, "resume", client=fake.client(), chunk_size=50,
+                                    manifest_path=manifest, check_remote=False)
+        if (report.skipped, report.uploaded, len(fake.examples)) != (150, 350, 500):
+            print(f"[FAIL] Resume should skip 150 and upload 350: {report}, server has {len(fake.examples)}")
+            return False
+        print("[PASS] Upload resumes from the manifest after a crash")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Resume error: {e}")
+        return False
+    finally:
+        fake.close()
+
+
+def check_manifest_log():
+    """Progress is appended to a log per chunk and compacted into the manifest once."""
+    try:
+        from backend.evaluation.langsmith_upload import UploadManifest
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "manifest.json")
+            manifest = UploadManifest(path)
+            for i in range(20):
+                manifest.record("log", "d1", [f"h{i}a", f"h{i}b"])
+            with open(manifest.log_path, encoding="utf-8") as f:
+                lines = f.readlines()
+            if len(lines) != 20 or os.path.exists(path):
+                print(f"[FAIL] Expected 20 log lines and no manifest rewrite, got {len(lines)}")
+                return False
+            with open(manifest.log_path, "a", encoding="utf-8") as f:
+                f.write('{"dataset": "log", "data')  # torn write from a crash
+            replayed = UploadManifest(path)
+            if len(replayed.hashes("log", "d1")) != 40 or replayed.hashes("log", "d2"):
+                print("[FAIL] Reloading should replay the log up to the torn line")
+                return False
+            replayed.compact()
+            compacted = UploadManifest(path)
+            if os.path.exists(manifest.log_path) or len(compacted.hashes("log", "d1")) != 40:
+                print("[FAIL] compact() should fold the log into the manifest")
+                return False
+        print("[PASS] Manifest progress is appended to a log and compacted once")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Manifest log error: {e}")
+        return False
+
+
+def check_skips_remote_examples():
+    """Without a manifest, examples already on the server are skipped by hash."""
+    fake = FakeLangSmith()
+    try:
+        from backend.evaluation.langsmith_upload import upload_dataset
+        cases = _cases(120)
+        first = upload_dataset(cases[:80], "remote", client=fake.client(), chunk_size=25, manifest_path=None)
+        second = upload_dataset(cases, "remote", client=fake.client(), chunk_size=25, manifest_path=None)
+        if first.dataset_id != second.dataset_id or len(fake.datasets) != 1:
+            print("[FAIL] The second upload should reuse the existing dataset")
+            return False
+        if (second.skipped, second.uploaded, len(fake.examples)) != (80, 40, 120):
+            print(f"[FAIL] Expected 80 skipped and 40 uploaded: {second}")
+            return False
+        # No manifest and no listing: chunks mixing old and new examples
+        # conflict on the first attempt and are split until the new ones land.
+        blind = upload_dataset(cases[::-1], "remote", client=fake.client(), chunk_size=25, manifest_path=None,
+                               check_remote=False)
+        cases = _cases(200)
+        mixed = upload_dataset(cases[::-1], "remote", client=fake.client(), chunk_size=25, manifest_path=None,
+                               check_remote=False)
+        if (blind.skipped, blind.uploaded) != (120, 0) or (mixed.skipped, mixed.uploaded) != (120, 80):
+            print(f"[FAIL] Conflicts should count as skipped: {blind}, {mixed}")
+            return False
+        if len(fake.examples) != 200:
+            print(f"[FAIL] Expected 200 examples on the server, got {len(fake.examples)}")
+            return False
+        try:
+            upload_dataset([], "remote", client=fake.client(), manifest_path=None)
+        except ValueError:
+            pass
+        else:
+            print("[FAIL] An empty dataset should raise ValueError")
+            return False
+        print("[PASS] Examples already on the server are skipped by content hash")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Remote skip error: {e}")
+        return False
+    finally:
+        fake.close()
+
+
+def run_all_checks():
+    print("=" * 60)
+    print("LangSmith Bulk Upload Test Harness")
+    print("=" * 60)
+
+    results = [
+        check_chunked_upload_with_retries(),
+        check_resume_after_crash(),
+        check_manifest_log(),
+        check_skips_remote_examples(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in results if r)
+    print(f"Results: {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_chunked_upload_with_retries():
+    assert check_chunked_upload_with_retries()
+
+def test_resume_after_crash():
+    assert check_resume_after_crash()
+
+def test_manifest_log():
+    assert check_manifest_log()
+
+def test_skips_remote_examples():
+    assert check_skips_remote_examples()
@@ -0,0 +1,123 @@
+"""
+Test harness for the compact internal record layer.
+
+Verifies msgpack round trips, Pydantic interop at the boundary, and
+summarizing a finished ApprovalState. No API keys required.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+STATE = {
+    "request_id": "REQ-007",
+    "status": "rejected",
+    "risk_level": "high",
+    "final_comments": "",
+    "decisions": [
+        {"stage": "risk_assessment", "decision": "cache_miss", "reasoning": "", "reviewer": "Risk cache"},
+        {"stage": "manager_review", "approved": True, "reviewer": "Manager", "comments": "ok"},
+        {"stage": "finance_review", "approved": False, "reviewer": "Finance", "comments": "over budget"},
+    ],
+}
+
+
+def check_request_msgpack_round_trip():
+    """A request record should survive encode/decode and be smaller than JSON."""
+    try:
+        from backend.records import REQUEST_CODEC, RequestRecord
+        from backend.seed_data import SAMPLE_REQUESTS
+        model = SAMPLE_REQUESTS[0]
+        record = RequestRecord.from_model(model)
+        payload = REQUEST_CODEC.encode(record)
+        many = REQUEST_CODEC.decode_many(REQUEST_CODEC.encode_many([record, record]))
+        ok = (
+            REQUEST_CODEC.decode(payload) == record
+            and many == [record, record]
+            and len(payload) < len(model.model_dump_json())
+            and record.to_model() == model
+        )
+        print("[PASS] request msgpack round trip" if ok else f"[FAIL] record={record}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_validation_only_at_boundary():
+    """validate() rejects bad input; from_dict() trusts internal state."""
+    try:
+        from pydantic import ValidationError
+        from backend.records import RequestRecord
+        try:
+            RequestRecord.validate({"request_id": "X", "title": "t", "amount": "lots"})
+            rejected = False
+        except ValidationError:
+            rejected = True
+        record = RequestRecord.from_dict({"request_id": "X", "title": "t", "amount": 10.0, "department": "hr"})
+        ok = rejected and record.priority == "normal" and record.to_dict()["amount"] == 10.0
+        print("[PASS] validation only at boundary" if ok else "[FAIL] boundary validation")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_result_from_state():
+    """ResultRecord.from_state counts review decisions and converts to ApprovalResult."""
+    try:
+        from backend.records import RESULT_CODEC, ResultRecord
+        result = ResultRecord.from_state(STATE)
+        decoded = RESULT_CODEC.decode(RESULT_CODEC.encode(result))
+        model = result.to_model()
+        ok = (
+            (result.total_approvals, result.total_rejections) == (1, 1)
+            and [d.stage for d in result.decisions] == ["manager_review", "finance_review"]
+            and decoded == result
+            and model.status.value == "rejected"
+            and ResultRecord.from_model(model) == result
+        )
+        print("[PASS] result from state" if ok else f"[FAIL] result={result}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all record checks."""
+    print("=" * 60)
+    print("Record Layer Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_request_msgpack_round_trip(),
+        check_validation_only_at_boundary(),
+        check_result_from_state(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_request_msgpack_round_trip():
+    assert check_request_msgpack_round_trip()
+
+def test_validation_only_at_boundary():
+    assert check_validation_only_at_boundary()
+
+def test_result_from_state():
+    assert check_result_from_state()
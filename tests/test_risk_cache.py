@@ -0,0 +1,196 @@
+"""
+Test harness for the persistent risk assessment cache.
+
+Verifies exact and near-duplicate hits, TTL expiry, size-bounded
+eviction, and audit entries using an in-memory SQLite database.
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+SUPPLIES = {
+    "title": "Monthly office supplies",
+    "description": "Paper, pens and toner cartridges for the third floor office",
+    "justification": "Regular monthly restock of consumable supplies",
+    "department": "operations",
+    "amount": 2500.00,
+    "priority": "low",
+}
+
+
+def _stub_assess(calls):
+    def assess(state):
+        calls.append(state["title"])
+        return {"risk_level": "low", "risk_reasoning": "Stubbed LLM", "risk_tier": "llm"}
+    return assess
+
+
+def check_exact_hit_skips_assessment():
+    """A resubmitted identical request should be served from cache."""
+    try:
+        from backend.agent.risk_cache import RiskCache, assess_risk_cached
+        cache = RiskCache(":memory:")
+        calls = []
+        first = assess_risk_cached(SUPPLIES, _stub_assess(calls), cache)
+        resubmitted = dict(SUPPLIES, title="  MONTHLY office supplies! ")
+        second = assess_risk_cached(resubmitted, _stub_assess(calls), cache)
+        ok = (
+            len(calls) == 1
+            and first["decisions"][0]["decision"] == "cache_miss"
+            and second["risk_tier"] == "cache_exact"
+            and second["decisions"][0]["decision"] == "cache_hit"
+        )
+        print("[PASS] exact cache hit" if ok else f"[FAIL] exact cache hit: {second}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_near_duplicate_hit():
+    """A lightly reworded request in the same block should be a near hit."""
+    try:
+        from backend.agent.risk_cache import RiskCache, assess_risk_cached
+        cache = RiskCache(":memory:", near_threshold=0.6)
+        calls = []
+        assess_risk_cached(SUPPLIES, _stub_assess(calls), cache)
+        reworded = dict(SUPPLIES, description=SUPPLIES["description"] + " and kitchen")
+        other_dept = dict(reworded, department="marketing")
+        near = assess_risk_cached(reworded, _stub_assess(calls), cache)
+        miss = assess_risk_cached(other_dept, _stub_assess(calls), cache)
+        ok = near["risk_tier"] == "cache_near" and miss["risk_tier"] == "llm" and len(calls) == 2
+        print("[PASS] near-duplicate cache hit" if ok else f"[FAIL] near-duplicate: {near}, {miss}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_amount_bucket_respects_thresholds():
+    """Amounts on either side of a risk threshold must not share a cache key."""
+    try:
+        from backend.agent.risk_cache import fingerprint
+        below = fingerprint(dict(SUPPLIES, amount=9_999), model="m")
+        above = fingerprint(dict(SUPPLIES, amount=10_001), model="m")
+        same = fingerprint(dict(SUPPLIES, amount=2_510), model="m")
+        ok = below != above and same == fingerprint(SUPPLIES, model="m")
+        print("[PASS] amount buckets respect thresholds" if ok else "[FAIL] amount buckets")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+def check_priority_not_shared():
+    """Requests differing only in priority must not be served each other's assessment."""
+    try:
+        from backend.agent.risk_cache import RiskCache, assess_risk_cached, fingerprint
+        cache = RiskCache(":memory:")
+        calls = []
+        levels = {"normal": "high", "urgent": "critical"}
+
+        def assess(state):
+            calls.append(state["priority"])
+            return {"risk_level": levels[state["priority"]], "risk_reasoning": "Stubbed LLM", "risk_tier": "llm"}
+
+        normal = dict(SUPPLIES, amount=60_000, priority="normal")
+        urgent = dict(normal, priority="urgent")
+        first = assess_risk_cached(normal, assess, cache)
+        second = assess_risk_cached(urgent, assess, cache)
+        ok = (
+            calls == ["normal", "urgent"]
+            and (first["risk_level"], second["risk_level"]) == ("high", "critical")
+            and second["decisions"][0]["decision"] == "cache_miss"
+            and fingerprint(dict(normal, priority=" Urgent "), model="m") == fingerprint(urgent, model="m")
+            and fingerprint(dict(normal, priority=None), model="m") == fingerprint(normal, model="m")
+        )
+        print("[PASS] priority is part of the cache key" if ok else f"[FAIL] priority shared a cache entry: {calls}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_ttl_and_size_eviction():
+    """Expired entries should miss and the table should stay within max_entries."""
+    try:
+        from backend.agent.risk_cache import RiskCache
+        cache = RiskCache(":memory:", ttl=0.05, max_entries=3, near_duplicates=False)
+        cache.put(SUPPLIES, "low", "old")
+        time.sleep(0.1)
+        expired = cache.get(SUPPLIES) is None
+        for i in range(5):
+            cache.put(dict(SUPPLIES, title=f"Supplies batch {i}"), "low", "r")
+        ok = expired and len(cache) == 3
+        print("[PASS] TTL expiry and size bound" if ok else f"[FAIL] TTL/size: expired={expired}, size={len(cache)}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_rule_tier_not_cached():
+    """Rule-tier results should bypass the cache."""
+    try:
+        from backend.agent.risk_cache import RiskCache, assess_risk_cached
+        cache = RiskCache(":memory:")
+        rules = lambda state: {"risk_level": "low", "risk_reasoning": "r", "risk_tier": "rules"}
+        result = assess_risk_cached(SUPPLIES, rules, cache)
+        ok = len(cache) == 0 and "rule tier" in result["decisions"][0]["reasoning"]
+        print("[PASS] rule tier bypasses cache" if ok else "[FAIL] rule tier was cached")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all risk cache checks."""
+    print("=" * 60)
+    print("Risk Assessment Cache Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_exact_hit_skips_assessment(),
+        check_near_duplicate_hit(),
+        check_amount_bucket_respects_thresholds(),
+        check_priority_not_shared(),
+        check_ttl_and_size_eviction(),
+        check_rule_tier_not_cached(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_exact_hit_skips_assessment():
+    assert check_exact_hit_skips_assessment()
+
+def test_near_duplicate_hit():
+    assert check_near_duplicate_hit()
+
+def test_amount_bucket_respects_thresholds():
+    assert check_amount_bucket_respects_thresholds()
+
+def test_priority_not_shared():
+    assert check_priority_not_shared()
+
+def test_ttl_and_size_eviction():
+    assert check_ttl_and_size_eviction()
+
+def test_rule_tier_not_cached():
+    assert check_rule_tier_not_cached()
@@ -0,0 +1,155 @@
+"""
+Test harness for the tiered risk engine.
+
+Verifies the rule tier, ambiguity band, LLM fallback, and per-tier
+counters using a stubbed LLM callable (no API keys required).
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _state(amount, priority="normal", text="Routine purchase"):
+    return {
+        "title": text, "description": text, "justification": text,
+        "amount": amount, "department": "engineering", "priority": priority,
+    }
+
+
+def check_rule_levels_match_dataset():
+    """Unambiguous EVAL_DATASET cases should be classified by rules to the expected level."""
+    try:
+        from backend.agent.risk_engine import pre_classify
+        from backend.evaluation.dataset import EVAL_DATASET
+        results = []
+        for case in EVAL_DATASET:
+            inputs, expected = case["input"], case["expected"]
+            if inputs["amount"] <= 0 or inputs["amount"] > 100_000:
+                continue  # rejected at submission, never assessed
+            result = pre_classify(inputs)
+            if result is None:
+                continue  # ambiguous → LLM tier
+            ok = result["risk_level"] == expected["risk_level"]
+            label = "PASS" if ok else "FAIL"
+            print(f"[{label}] {inputs['request_id']}: rules → {result['risk_level']}")
+            results.append(ok)
+        return results or [True]
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return [False]
+
+
+def check_ambiguous_cases_defer_to_llm():
+    """Amounts near thresholds and unusual text should not be decided by rules."""
+    try:
+        from backend.agent.risk_engine import pre_classify
+        cases = [
+            (_state(10_500), "near medium threshold"),
+            (_state(48_000), "near high threshold"),
+            (_state(2_000, text="Gift card purchase for team"), "unusual text"),
+        ]
+        results = []
+        for state, label in cases:
+            if pre_classify(state, band=0.1) is None:
+                print(f"[PASS] ambiguous: {label}")
+                results.append(True)
+            else:
+                print(f"[FAIL] rules decided ambiguous case: {label}")
+                results.append(False)
+        return results
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return [False]
+
+
+def check_tiered_counters():
+    """assess_risk_tiered should only call the LLM for ambiguous cases and count tiers."""
+    try:
+        from backend.agent.risk_engine import (
+            assess_risk_tiered, get_risk_tier_stats, reset_risk_tier_stats,
+        )
+        calls = []
+
+        def fake_llm(state):
+            calls.append(state["amount"])
+            return "high", "stubbed"
+
+        reset_risk_tier_stats()
+        a = assess_risk_tiered(_state(500), llm_assess=fake_llm, band=0.1)
+        b = assess_risk_tiered(_state(70_000, priority="urgent"), llm_assess=fake_llm, band=0.1)
+        c = assess_risk_tiered(_state(49_500), llm_assess=fake_llm, band=0.1)
+        stats = get_risk_tier_stats()
+        reset_risk_tier_stats()
+        ok = (
+            a["risk_level"] == "low" and a["risk_tier"] == "rules"
+            and b["risk_level"] == "critical" and b["risk_tier"] == "rules"
+            and c["risk_tier"] == "llm" and calls == [49_500]
+            and stats["rules"] == 2 and stats["llm"] == 1
+            and stats["est_cost_saved"] > 0
+        )
+        if ok:
+            print("[PASS] assess_risk_tiered routes tiers and counts them")
+            return True
+        print(f"[FAIL] Unexpected tier behaviour: {a}, {b}, {c}, stats={stats}")
+        return False
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_parse_risk_response():
+    """parse_risk_response should read the structured format and default to medium."""
+    try:
+        from backend.agent.risk_engine import parse_risk_response
+        ok = (
+            parse_risk_response("RISK_LEVEL: High\nREASONING: Large spend.") == ("high", "Large spend.")
+            and parse_risk_response("")[0] == "medium"
+        )
+        print("[PASS] parse_risk_response" if ok else "[FAIL] parse_risk_response")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all risk engine checks."""
+    print("=" * 60)
+    print("Tiered Risk Engine Tests")
+    print("=" * 60)
+
+    all_results = []
+    all_results.extend(check_rule_levels_match_dataset())
+    all_results.extend(check_ambiguous_cases_defer_to_llm())
+    all_results.append(check_tiered_counters())
+    all_results.append(check_parse_risk_response())
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_rule_levels_match_dataset():
+    assert all(check_rule_levels_match_dataset())
+
+def test_ambiguous_cases_defer_to_llm():
+    assert all(check_ambiguous_cases_defer_to_llm())
+
+def test_tiered_counters():
+    assert check_tiered_counters()
+
+def test_parse_risk_response():
+    assert check_parse_risk_response()
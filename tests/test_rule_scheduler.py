@@ -0,0 +1,132 @@
+"""
+Test harness for the cost-aware validation rule scheduler.
+
+Verifies validate_request's messages, short-circuiting on the first
+failure, adaptive reordering of expensive rules, and per-rule stats.
+No API keys required.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+GOOD = {
+    "amount": 1_200.0,
+    "department": "engineering",
+    "title": "Laptops",
+    "description": "Two laptops for new hires",
+    "justification": "Onboarding",
+}
+
+
+def check_messages_follow_validate_request():
+    """Each rule reports validate_request's message; a clean request passes."""
+    try:
+        from backend.guardrails.scheduler import RuleScheduler, default_validation_rules
+        scheduler = RuleScheduler(default_validation_rules(), adaptive=False)
+        cases = [
+            ({}, "Request validated successfully"),
+            ({"amount": 0}, "Amount must be positive"),
+            ({"amount": 500_000}, "Amount exceeds budget ceiling of $100,000.00"),
+            ({"department": "legal"}, "Invalid department: legal"),
+            ({"title": "T" * 201}, "Title too long"),
+            ({"description": "x; DROP TABLE y"}, "Blocked content detected in description: suspicious pattern"),
+        ]
+        results = [scheduler.run({**GOOD, **change}) for change, _ in cases]
+        ok = all(message == expected for (_, message), (_, expected) in zip(results, cases))
+        ok = ok and results[0][0] is True and not any(valid for valid, _ in results[1:])
+        print("[PASS] messages follow validate_request" if ok else f"[FAIL] results={results}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_short_circuit_on_first_failure():
+    """Rules after the first failure are not evaluated."""
+    try:
+        from backend.guardrails.scheduler import Rule, RuleScheduler
+        called = []
+
+        def rule(name, message=None, cheap=True):
+            return Rule(name, lambda request: called.append(name) or message, cheap)
+
+        scheduler = RuleScheduler(
+            [rule("slow", cheap=False), rule("fast"), rule("fails", "no"), rule("never")],
+            adaptive=False,
+        )
+        result = scheduler.run({})
+        report = {row["rule"]: row for row in scheduler.report()}
+        ok = (
+            result == (False, "no")
+            and called == ["fast", "fails"]
+            and report["fails"]["rejections"] == 1
+            and report["slow"]["calls"] == report["never"]["calls"] == 0
+        )
+        print("[PASS] short circuit on first failure" if ok else f"[FAIL] called={called}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_adaptive_reordering():
+    """An expensive rule that often rejects moves ahead of ones that never do."""
+    try:
+        from backend.guardrails.scheduler import RuleScheduler, default_validation_rules
+        scheduler = RuleScheduler(default_validation_rules(), reorder_every=20)
+        for i in range(100):
+            bad = {"justification": "<script>alert(1)</script>"} if i % 2 else {}
+            scheduler.run({**GOOD, "description": "budget " * 250, **bad})
+        order = [row["rule"] for row in scheduler.report()]
+        shares = sum(row["time_share"] for row in scheduler.report())
+        ok = (
+            order[:4] == ["amount_positive", "amount_ceiling", "department", "title_length"]
+            and order[4] == "blocked_justification"
+            and abs(shares - 1.0) < 1e-9
+            and 'guardrail_rule_calls_total{rule="blocked_justification"} 100' in scheduler.render_metrics()
+        )
+        print("[PASS] adaptive reordering" if ok else f"[FAIL] order={order}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all rule scheduler checks."""
+    print("=" * 60)
+    print("Validation Rule Scheduler Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_messages_follow_validate_request(),
+        check_short_circuit_on_first_failure(),
+        check_adaptive_reordering(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_messages_follow_validate_request():
+    assert check_messages_follow_validate_request()
+
+def test_short_circuit_on_first_failure():
+    assert check_short_circuit_on_first_failure()
+
+def test_adaptive_reordering():
+    assert check_adaptive_reordering()
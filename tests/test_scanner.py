@@ -0,0 +1,109 @@
+"""
+Test harness for the compiled blocked-pattern scanner.
+
+Verifies that the scanner agrees with the plain lowercase-and-substring
+check, reports field and position for every match, and never matches
+across field boundaries. No API keys required.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def check_agrees_with_substring_check():
+    """For each blocked pattern (and clean text) check() matches `pattern in text.lower()`."""
+    try:
+        from backend.guardrails.input_validator import BLOCKED_PATTERNS
+        from backend.guardrails.scanner import BLOCKED_SCANNER
+        texts = ["Quarterly server upgrade for the data team"] + [
+            f"Please {pattern.upper()} now" for pattern in BLOCKED_PATTERNS
+        ]
+        ok = all(
+            BLOCKED_SCANNER.check(text)[0] == (not any(p in text.lower() for p in BLOCKED_PATTERNS))
+            for text in texts
+        )
+        print("[PASS] scanner agrees with substring check" if ok else "[FAIL] scanner disagrees")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_reports_field_and_position():
+    """scan() reports every match with its field and offsets; first() the earliest."""
+    try:
+        from backend.guardrails.scanner import BLOCKED_SCANNER, PatternMatch
+        fields = {
+            "title": "Laptop refresh",
+            "description": "x; DROP TABLE users; eval(1)",
+            "justification": "<Script>alert(1)</script>",
+        }
+        matches = BLOCKED_SCANNER.scan(fields)
+        expected = [
+            PatternMatch("description", "drop table", 3, 13),
+            PatternMatch("description", "eval(", 21, 26),
+            PatternMatch("justification", "<script>", 0, 8),
+        ]
+        ok = (
+            matches == expected
+            and BLOCKED_SCANNER.first(fields) == expected[0]
+            and BLOCKED_SCANNER.check(fields) == (False, expected[0])
+        )
+        print("[PASS] field and position reported" if ok else f"[FAIL] matches={matches}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_no_match_across_fields():
+    """A pattern split between two fields is not a match."""
+    try:
+        from backend.guardrails.scanner import BLOCKED_SCANNER
+        ok, match = BLOCKED_SCANNER.check({"title": "please drop", "description": "table tennis"})
+        ok = ok and match is None and BLOCKED_SCANNER.scan({"a": "", "b": None}) == []
+        print("[PASS] no match across fields" if ok else f"[FAIL] match={match}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all scanner checks."""
+    print("=" * 60)
+    print("Blocked-Pattern Scanner Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_agrees_with_substring_check(),
+        check_reports_field_and_position(),
+        check_no_match_across_fields(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_agrees_with_substring_check():
+    assert check_agrees_with_substring_check()
+
+def test_reports_field_and_position():
+    assert check_reports_field_and_position()
+
+def test_no_match_across_fields():
+    assert check_no_match_across_fields()
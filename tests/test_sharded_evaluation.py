@@ -0,0 +1,162 @@
+"""
+Test harness for process-pool sharded evaluation.
+
+Verifies that merged streaming accumulators match the exact mean and
+variance, that sharded scoring over worker processes agrees with a
+serial run (including on a generator dataset), and that the runner
+rejects sharding combined with per-case features.
+No API keys required.
+"""
+
+import sys
+import os
+import random
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _path_match(inputs, outputs, reference_outputs):
+    return {"score": float(outputs["approval_path"] == reference_outputs["approval_path"])}
+
+
+def _amount_band(inputs, outputs, reference_outputs):
+    return {"score": (inputs["amount"] % 1000) / 1000}
+
+
+def fake_evaluators():
+    """Picklable evaluator factory for worker processes."""
+    return {"approval_path": _path_match, "policy_adherence": _amount_band, "hallucination": None}
+
+
+def _synthetic(n):
+    from backend.evaluation.dataset import EVAL_DATASET
+    rng = random.Random(7)
+    for i in range(n):
+        base = EVAL_DATASET[i % len(EVAL_DATASET)]
+        yield {"input": {**base["input"], "amount": rng.uniform(1, 100_000)}, "expected": base["expected"]}
+
+
+def check_accumulator_merge_exact():
+    """Merged shard accumulators equal statistics.mean / variance."""
+    try:
+        from backend.evaluation.sharding import ScoreAccumulator
+        rng = random.Random(0)
+        scores = [rng.random() for _ in range(1001)]
+        merged = ScoreAccumulator()
+        for start in range(0, len(scores), 97):
+            merged.merge(ScoreAccumulator.from_scores(scores[start:start + 97]))
+        if merged.count != len(scores):
+            print(f"[FAIL] Expected count {len(scores)}, got {merged.count}")
+            return False
+        if abs(merged.mean - statistics.mean(scores)) > 1e-12 or abs(merged.variance - statistics.variance(scores)) > 1e-12:
+            print("[FAIL] Merged mean/variance differ from the exact values")
+            return False
+        if ScoreAccumulator.from_scores([None, 1.0]).count != 1 or ScoreAccumulator().variance != 0.0:
+            print("[FAIL] None scores and empty accumulators are mishandled")
+            return False
+        print("[PASS] Merged accumulators match exact mean and variance")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Accumulator error: {e}")
+        return False
+
+
+def check_sharded_matches_serial():
+    """Sharded scoring of a generator dataset agrees with serial scoring."""
+    try:
+        from backend.evaluation.parallel import score_cases
+        from backend.evaluation.run_three_layer_eval import _build_outputs, _run_evaluator
+        from backend.evaluation.sharding import ScoreAccumulator, score_sharded
+
+        totals, n = score_sharded(_synthetic(2_000), workers=2, shard_size=150, factory=fake_evaluators)
+        cases = [(tc["input"], _build_outputs(tc["expected"]), tc["expected"]) for tc in _synthetic(2_000)]
+        serial = score_cases(fake_evaluators(), cases, _run_evaluator)
+        if n != 2_000 or set(totals) != {"approval_path", "policy_adherence"}:
+            print(f"[FAIL] Unexpected result: {n} cases, evaluators {sorted(totals)}")
+            return False
+        for name, acc in totals.items():
+            expected = ScoreAccumulator.from_scores(serial[name])
+            if acc.count != expected.count or abs(acc.mean - expected.mean) > 1e-9 or abs(acc.m2 - expected.m2) > 1e-6:
+                print(f"[FAIL] {name}: sharded {acc} vs serial {expected}")
+                return False
+        print("[PASS] Sharded scoring matches serial scoring")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Sharded scoring error: {e}")
+        return False
+
+
+def check_runner_rejects_sharded_graph():
+    """Sharding rejects per-case modes and warns about the options its workers ignore."""
+    try:
+        import contextlib
+        import io
+        from backend.evaluation import run_three_layer_eval as runner
+        from backend.evaluation.result_cache import EvalResultCache
+        from backend.evaluation.run_three_layer_eval import run_three_layer_evaluation
+        for extra in ({"graph": "demo"}, {"incremental": True}, {"parallel": True},
+                      {"cache": EvalResultCache(":memory:")}):
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run_three_layer_evaluation(sharded=True, use_cache=False, **extra)
+            except ValueError:
+                continue
+            print(f"[FAIL] sharded with {extra} should raise ValueError")
+            return False
+
+        def no_scoring(*args, **kwargs):
+            return {}, 0
+
+        score_sharded = runner.score_sharded
+        runner.score_sharded = no_scoring
+        try:
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                run_three_layer_evaluation(sharded=True, use_cache=True, llm_rate_limit=5.0)
+        finally:
+            runner.score_sharded = score_sharded
+        if "do not read or update the result cache" not in out.getvalue() or (
+            "rate limit is not applied" not in out.getvalue()
+        ):
+            print("[FAIL] Sharded runs should warn that the cache and rate limit are not used")
+            return False
+        print("[PASS] Runner rejects or warns about options sharding cannot honor")
+        return True
+    except Exception as e:
+        print(f"[FAIL] Runner sharded error: {e}")
+        return False
+
+
+def run_all_checks():
+    print("=" * 60)
+    print("Sharded Evaluation Test Harness")
+    print("=" * 60)
+
+    results = [
+        check_accumulator_merge_exact(),
+        check_sharded_matches_serial(),
+        check_runner_rejects_sharded_graph(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in results if r)
+    print(f"Results: {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_accumulator_merge_exact():
+    assert check_accumulator_merge_exact()
+
+def test_sharded_matches_serial():
+    assert check_sharded_matches_serial()
+
+def test_runner_rejects_sharded_graph():
+    assert check_runner_rejects_sharded_graph()
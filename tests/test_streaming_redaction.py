@@ -0,0 +1,260 @@
+"""
+Test harness for incremental PII redaction of streamed output.
+
+Verifies that any chunking of a stream redacts exactly like the whole
+string, that only the open tail is held back (and never more than
+MAX_HELD_CHARS of it), that AG-UI content and chunk events are redacted
+per message, and that message snapshots and state snapshots and deltas
+are redacted. No API keys required.
+"""
+
+import sys
+import os
+import asyncio
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+TEXT = (
+    "Reach alice.smith@example.com or 555-123-4567. Card 4111 1111 1111 1111, "
+    "SSN 123-45-6789! Paid $45,000.00 (acct 12345678901234). Thanks, bob@corp.io\n"
+) * 3
+
+
+def check_any_chunking_matches_whole_string():
+    """Random chunk boundaries give the same output as redacting the full text."""
+    try:
+        from backend.guardrails.redaction import OUTPUT_REDACTOR
+        from backend.guardrails.streaming import StreamingRedactor
+        expected = OUTPUT_REDACTOR.redact(TEXT)
+        ok = True
+        for seed in range(100):
+            rng = random.Random(seed)
+            redactor, out, i = StreamingRedactor(OUTPUT_REDACTOR), [], 0
+            while i < len(TEXT):
+                step = rng.randint(1, 12)
+                out.append(redactor.feed(TEXT[i:i + step]))
+                i += step
+            out.append(redactor.flush())
+            ok = ok and "".join(out) == expected
+        print("[PASS] any chunking matches whole string" if ok else "[FAIL] chunked output differs")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_holds_back_only_open_tail():
+    """Finished text is released at once; a possible match in progress is held."""
+    try:
+        from backend.guardrails.streaming import StreamingRedactor
+        redactor = StreamingRedactor()
+        first = redactor.feed("Call 555-12")
+        held = redactor.held
+        second = redactor.feed("3-4567 now")
+        ok = (
+            first == "Call "
+            and held == len("555-12")
+            and second == "***-***-XXXX "
+            and redactor.flush() == "now"
+            # A trailing digit and space may still be a card separator.
+            and StreamingRedactor().feed("card 4111 ") == "card "
+        )
+        print("[PASS] holds back only open tail" if ok else f"[FAIL] first={first!r} second={second!r}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_caps_held_tail():
+    """A long run without whitespace is released once it passes MAX_HELD_CHARS."""
+    try:
+        from backend.guardrails.redaction import PII_REDACTOR
+        from backend.guardrails.streaming import MAX_HELD_CHARS, StreamingRedactor
+        redactor, out = StreamingRedactor(), []
+        blob = "a1b2c3d4" * 100
+        for i in range(0, len(blob), 16):
+            out.append(redactor.feed(blob[i:i + 16]))
+            if redactor.held > MAX_HELD_CHARS:
+                print(f"[FAIL] {redactor.held} chars held back")
+                return False
+        released = "".join(out)
+        # A match straddling the cut point is held whole, never split.
+        text = "x" * (MAX_HELD_CHARS - 5) + "|555-123-4567|" + "y" * 300
+        straddle, masked = StreamingRedactor(), []
+        for i in range(0, len(text), 7):
+            masked.append(straddle.feed(text[i:i + 7]))
+        masked.append(straddle.flush())
+        ok = (
+            len(released) >= len(blob) - MAX_HELD_CHARS
+            and released + redactor.flush() == blob
+            and "".join(masked) == PII_REDACTOR.redact(text)
+            and "|***-***-XXXX|" in "".join(masked)
+        )
+        print("[PASS] held tail is capped" if ok else f"[FAIL] released {len(released)} of {len(blob)} chars")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_redacts_ag_ui_text_events():
+    """redact_text_events rewrites content deltas and flushes before TEXT_MESSAGE_END."""
+    try:
+        from ag_ui.core import EventType, RunStartedEvent, TextMessageContentEvent, TextMessageEndEvent
+        from backend.guardrails.streaming import redact_text_events
+
+        async def source():
+            yield RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+            for delta in ["Email me: ali", "ce@example.", "com"]:
+                yield TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta=delta)
+            yield TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m")
+
+        async def collect():
+            return [event async for event in redact_text_events(source())]
+
+        events = asyncio.run(collect())
+        text = "".join(e.delta for e in events if e.type == EventType.TEXT_MESSAGE_CONTENT)
+        ok = (
+            text == "Email me: [EMAIL REDACTED]"
+            and events[0].type == EventType.RUN_STARTED
+            and events[-1].type == EventType.TEXT_MESSAGE_END
+            and "alice" not in "".join(e.model_dump_json() for e in events)
+        )
+        print("[PASS] AG-UI text events redacted" if ok else f"[FAIL] text={text!r}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_redacts_ag_ui_chunk_events():
+    """Chunk deltas are redacted per message; held text is flushed when the message changes."""
+    try:
+        from ag_ui.core import EventType, RunFinishedEvent, TextMessageChunkEvent
+        from backend.guardrails.streaming import redact_text_events
+
+        async def source():
+            for message_id, deltas in (("a", ["SSN 123-", "45-67", "89"]), ("b", ["call 555-", "123-4567"])):
+                for i, delta in enumerate(deltas):
+                    yield TextMessageChunkEvent(
+                        type=EventType.TEXT_MESSAGE_CHUNK, message_id=message_id if i == 0 else None, delta=delta,
+                    )
+            yield RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r")
+
+        async def collect():
+            return [event async for event in redact_text_events(source())]
+
+        events = asyncio.run(collect())
+        chunks = [e for e in events if e.type == EventType.TEXT_MESSAGE_CHUNK]
+        text = {
+            message_id: "".join(e.delta or "" for e in chunks if e.message_id == message_id)
+            for message_id in ("a", "b")
+        }
+        ok = (
+            text == {"a": "SSN ***-**-XXXX", "b": "call ***-***-XXXX"}
+            and [e.message_id for e in chunks][:1] == ["a"]
+            and events[-1].type == EventType.RUN_FINISHED
+            and "6789" not in "".join(e.model_dump_json() for e in events)
+        )
+        print("[PASS] AG-UI chunk events redacted" if ok else f"[FAIL] text={text!r}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_redacts_ag_ui_snapshots():
+    """Message snapshots, state snapshots and state deltas are redacted whole."""
+    try:
+        from ag_ui.core import (
+            AssistantMessage, EventType, MessagesSnapshotEvent, StateDeltaEvent, StateSnapshotEvent,
+            TextInputContent, UserMessage,
+        )
+        from backend.guardrails.streaming import redact_text_events
+
+        async def source():
+            yield MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=[
+                UserMessage(id="u", role="user", content=[TextInputContent(type="text", text="I am bob@corp.io")]),
+                AssistantMessage(id="a", role="assistant", content="Card 4111 1111 1111 1111 noted"),
+                AssistantMessage(id="c", role="assistant"),
+            ])
+            yield StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={
+                "amount": 5000, "requester": {"email": "alice@example.com"}, "notes": ["SSN 123-45-6789"],
+            })
+            yield StateDeltaEvent(type=EventType.STATE_DELTA, delta=[
+                {"op": "add", "path": "/phone", "value": "555-123-4567"},
+                {"op": "remove", "path": "/notes/0"},
+            ])
+
+        async def collect():
+            return [event async for event in redact_text_events(source())]
+
+        messages, snapshot, delta = asyncio.run(collect())
+        ok = (
+            messages.messages[0].content[0].text == "I am [EMAIL REDACTED]"
+            and messages.messages[1].content == "Card ****-****-****-XXXX noted"
+            and messages.messages[2].content is None
+            and snapshot.snapshot == {
+                "amount": 5000, "requester": {"email": "[EMAIL REDACTED]"}, "notes": ["SSN ***-**-XXXX"],
+            }
+            and delta.delta[0].value == "***-***-XXXX"
+            and delta.delta[1].path == "/notes/0"
+        )
+        print("[PASS] AG-UI snapshots and state deltas redacted" if ok else "[FAIL] snapshot PII not redacted")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all streaming redaction checks."""
+    print("=" * 60)
+    print("Streaming PII Redaction Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_any_chunking_matches_whole_string(),
+        check_holds_back_only_open_tail(),
+        check_caps_held_tail(),
+        check_redacts_ag_ui_text_events(),
+        check_redacts_ag_ui_chunk_events(),
+        check_redacts_ag_ui_snapshots(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_any_chunking_matches_whole_string():
+    assert check_any_chunking_matches_whole_string()
+
+def test_holds_back_only_open_tail():
+    assert check_holds_back_only_open_tail()
+
+def test_caps_held_tail():
+    assert check_caps_held_tail()
+
+def test_redacts_ag_ui_text_events():
+    assert check_redacts_ag_ui_text_events()
+
+def test_redacts_ag_ui_chunk_events():
+    assert check_redacts_ag_ui_chunk_events()
+
+def test_redacts_ag_ui_snapshots():
+    assert check_redacts_ag_ui_snapshots()
+
@@ -0,0 +1,141 @@
+"""
+Test harness for the guardrail verdict cache.
+
+Verifies hits and misses, automatic invalidation when the pattern set
+changes, LRU eviction and stats, and that the student guardrail
+functions are wrapped. No API keys required.
+"""
+
+import sys
+import os
+import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _counting_scanner(patterns):
+    from backend.guardrails.verdict_cache import VerdictCache
+    calls = []
+
+    def check(text, field_name="text"):
+        calls.append(text)
+        lowered = text.lower()
+        return (False, field_name) if any(p in lowered for p in patterns) else (True, text)
+
+    return VerdictCache(check, patterns, max_entries=2), calls
+
+
+def check_repeat_inputs_hit_cache():
+    """The second call with the same text and arguments is served from the cache."""
+    try:
+        cache, calls = _counting_scanner(["drop table"])
+        first = cache("DROP TABLE x", "title")
+        again = cache("DROP TABLE x", "title")
+        other_field = cache("DROP TABLE x", "description")
+        info = cache.info()
+        ok = (
+            first == again == (False, "title")
+            and other_field == (False, "description")
+            and len(calls) == 2
+            and (info["hits"], info["misses"]) == (1, 2)
+            and abs(info["hit_rate"] - 1 / 3) < 1e-9
+        )
+        print("[PASS] repeat inputs hit cache" if ok else f"[FAIL] info={info}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_invalidates_when_patterns_change():
+    """Editing the pattern list or dict in place drops stale verdicts."""
+    try:
+        from backend.guardrails.verdict_cache import VerdictCache
+        patterns = ["drop table"]
+        cache, calls = _counting_scanner(patterns)
+        before = cache("eval(1)")
+        version = cache.version
+        patterns.append("eval(")
+        after = cache("eval(1)")
+
+        regexes = {"ssn": re.compile(r"\d{3}-\d{2}-\d{4}")}
+        masked = VerdictCache(lambda t: regexes["ssn"].sub("X", t), regexes)
+        masked("123-45-6789")
+        regexes["ssn"] = re.compile(r"\d{3}")
+        ok = (
+            before == (True, "eval(1)")
+            and after == (False, "text")
+            and cache.version != version
+            and cache.info()["invalidations"] == 1
+            and masked("123-45-6789") == "X-45-X9"
+        )
+        print("[PASS] invalidates when patterns change" if ok else "[FAIL] stale verdict served")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def check_eviction_and_guardrails_wrapped():
+    """The LRU is bounded; sanitize_text/sanitize_output are wrapped and report stats."""
+    try:
+        from backend.guardrails.input_validator import sanitize_text
+        from backend.guardrails.output_filter import sanitize_output
+        from backend.guardrails.verdict_cache import cache_stats, render_cache_metrics
+        cache, calls = _counting_scanner(["drop table"])
+        for text in ["a", "b", "c", "a"]:
+            cache(text)
+        info = cache.info()
+        stats = cache_stats()
+        ok = (
+            info["size"] == 2
+            and info["evictions"] == 2
+            and len(calls) == 4
+            and hasattr(sanitize_text, "cache")
+            and hasattr(sanitize_output, "cache")
+            and {"sanitize_text", "sanitize_output"} <= set(stats)
+            and 'guardrail_cache_lookups_total{function="sanitize_text",result="hit"}' in render_cache_metrics()
+        )
+        print("[PASS] eviction and guardrails wrapped" if ok else f"[FAIL] info={info}")
+        return ok
+    except Exception as e:
+        print(f"[FAIL] Unexpected error: {e}")
+        return False
+
+
+def run_all_checks():
+    """Run all verdict cache checks."""
+    print("=" * 60)
+    print("Guardrail Verdict Cache Tests")
+    print("=" * 60)
+
+    all_results = [
+        check_repeat_inputs_hit_cache(),
+        check_invalidates_when_patterns_change(),
+        check_eviction_and_guardrails_wrapped(),
+    ]
+
+    print("\n" + "=" * 60)
+    passed = sum(1 for r in all_results if r)
+    total = len(all_results)
+    print(f"Results: {passed}/{total} checks passed")
+    print("=" * 60)
+
+    return all(all_results)
+
+
+if __name__ == "__main__":
+    success = run_all_checks()
+    sys.exit(0 if success else 1)
+
+
+# --- pytest-discoverable tests ---
+
+def test_repeat_inputs_hit_cache():
+    assert check_repeat_inputs_hit_cache()
+
+def test_invalidates_when_patterns_change():
+    assert check_invalidates_when_patterns_change()
+
+def test_eviction_and_guardrails_wrapped():
+    assert check_eviction_and_guardrails_wrapped()